@@ -0,0 +1,194 @@
+"""
+Compares the four architectures end to end on local stand-ins: each
+solution's lambda_handler is driven with POST requests at a given concurrency
+against fake AWS services that add `--latency` seconds per call. Writes that
+would reach a DynamoDB stream (the dynamo-streams table, or the outbox table
+in outbox mode) are replayed through the stream processor or outbox relay.
+
+Reports throughput, p50/p95/p99 handler latency, AWS calls per order and
+bytes sent per order as JSON.
+
+    python benchmarks/bench_architectures.py --orders 2000 --concurrency 16 --latency 0.005
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SOLUTIONS = os.path.join(ROOT, 'solutions')
+sys.path.insert(0, os.path.join(SOLUTIONS, 'common', 'python'))
+
+os.environ.update({
+    "DYNAMODB_TABLE": "WorkOrdersTable",
+    "OUTBOX_TABLE": "WorkOrdersOutboxTable",
+    "SQS_RECEIVED": "received-queue",
+    "SQS_IN_PROGRESS": "in-progress-queue",
+    "SQS_COMPLETED": "completed-queue",
+    "SQS_CANCELED": "canceled-queue",
+    "SNS_TOPIC_ARN": "arn:aws:sns:us-east-1:000000000000:work-orders-topic",
+    "EVENT_BUS_NAME": "WorkOrdersEventBus",
+})
+
+from fakes import CallRecorder, FakeClient, FakeDynamoResource, make_work_orders
+from work_orders import dispatch
+from work_orders.stream_image import serialize_item
+
+# Solution -> (API handler module, its client attributes, stream entry point)
+ARCHITECTURES = {
+    "direct-to-sqs": ("handler", {"sqs": "sqs"}, None),
+    "dynamo-streams": ("api_handler", {}, ("stream_handler", "lambda_handler")),
+    "eventbridge-sqs": ("api_handler", {"eventbridge": "events"}, None),
+    "sns-filtering": ("api_handler", {"sns": "sns"}, None),
+}
+
+# Records per stream invocation, as configured in serverless.yml
+STREAM_BATCH_SIZE = 100
+
+
+def load_module(solution, name):
+    path = os.path.join(SOLUTIONS, solution, 'src', f'{name}.py')
+    spec = importlib.util.spec_from_file_location(f"{solution.replace('-', '_')}_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def latency_summary(samples):
+    return {
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 3),
+    }
+
+
+def post_events(work_orders, batch_size):
+    bodies = [
+        {name: work_order[name] for name in ("description", "deliveryDate", "status", "cancellationReason")}
+        for work_order in work_orders
+    ]
+    if not batch_size:
+        return [{"httpMethod": "POST", "resource": "/work-orders", "body": json.dumps(body)} for body in bodies]
+    return [
+        {"httpMethod": "POST", "resource": "/work-orders/batch",
+         "body": json.dumps({"workOrders": bodies[i:i + batch_size]})}
+        for i in range(0, len(bodies), batch_size)
+    ]
+
+
+def stream_records(written):
+    records = []
+    for sequence, (item, serialized) in enumerate(written):
+        records.append({
+            "eventID": str(sequence),
+            "eventName": "INSERT",
+            "dynamodb": {
+                "SequenceNumber": str(sequence),
+                "NewImage": item if serialized else serialize_item(item),
+            },
+        })
+    return records
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def run(solution, work_orders, concurrency, latency, batch_size, publish_mode):
+    module_name, clients, stream_entry = ARCHITECTURES[solution]
+    recorder = CallRecorder()
+    api = load_module(solution, module_name)
+    api.dynamodb = FakeDynamoResource(recorder, latency)
+    for attribute, service in clients.items():
+        setattr(api, attribute, FakeClient(service, recorder, latency))
+
+    dispatch.PUBLISH_MODE = publish_mode
+    events = post_events(work_orders, batch_size)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        api_latencies = list(executor.map(lambda event: timed(api.lambda_handler, event, {}), events))
+
+    # Asynchronous stage: stream processor or outbox relay
+    downstream_latencies = []
+    if stream_entry:
+        stream = load_module(solution, stream_entry[0])
+        stream.sqs = FakeClient("sqs", recorder, latency)
+        downstream, table = getattr(stream, stream_entry[1]), "WorkOrdersTable"
+    elif publish_mode == dispatch.PUBLISH_MODE_OUTBOX:
+        downstream, table = api.relay_outbox, "WorkOrdersOutboxTable"
+    else:
+        downstream, table = None, None
+    if downstream:
+        records = stream_records(api.dynamodb.written.get(table, []))
+        for i in range(0, len(records), STREAM_BATCH_SIZE):
+            downstream_latencies.append(timed(downstream, {"Records": records[i:i + STREAM_BATCH_SIZE]}, {}))
+    elapsed = time.perf_counter() - start
+
+    orders = len(work_orders)
+    result = {
+        "architecture": solution,
+        "orders": orders,
+        "requests": len(events),
+        "seconds": round(elapsed, 4),
+        "throughput_orders_per_s": round(orders / elapsed, 1),
+        "handler_latency": latency_summary(api_latencies),
+        "aws_calls_per_order": round(recorder.total_calls() / orders, 3),
+        "bytes_sent_per_order": round(recorder.bytes_sent / orders, 1),
+        "calls": dict(sorted(recorder.calls.items())),
+    }
+    if downstream_latencies:
+        result["downstream_latency"] = latency_summary(downstream_latencies)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.005, help="Seconds per AWS call")
+    parser.add_argument("--batch-size", type=int, default=0,
+                        help="Work orders per POST /work-orders/batch request (0 posts them one by one)")
+    parser.add_argument("--publish-mode", default=dispatch.PUBLISH_MODE_SERIAL,
+                        choices=[dispatch.PUBLISH_MODE_SERIAL, dispatch.PUBLISH_MODE_CONCURRENT,
+                                 dispatch.PUBLISH_MODE_OUTBOX])
+    parser.add_argument("--architectures", nargs="+", default=list(ARCHITECTURES), choices=list(ARCHITECTURES))
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    work_orders = make_work_orders(args.orders)
+    report = {
+        "parameters": {
+            "orders": args.orders,
+            "concurrency": args.concurrency,
+            "latency": args.latency,
+            "batch_size": args.batch_size,
+            "publish_mode": args.publish_mode,
+        },
+        "results": [
+            run(solution, work_orders, args.concurrency, args.latency, args.batch_size, args.publish_mode)
+            for solution in args.architectures
+        ],
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
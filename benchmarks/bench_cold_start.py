@@ -0,0 +1,109 @@
+"""
+Measures cold-start cost of the API handler: module import time and time to
+serve the first GET, with eager boto3 clients (previous behaviour) versus the
+lazy client layer in work_orders.clients. It also compares a DynamoDB Table
+from the boto3 resource layer with the client-backed one of work_orders.dynamodb.
+Each sample runs in a fresh interpreter; the first DynamoDB call is answered
+by botocore's Stubber. Requires boto3.
+
+    python benchmarks/bench_cold_start.py --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+COMMON = """
+import os, sys, time, json
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ["DYNAMODB_TABLE"] = "WorkOrdersTable"
+sys.path.insert(0, {src!r})
+sys.path.insert(0, {common!r})
+
+def stub_scan(table):
+    from botocore.stub import Stubber
+    stubber = Stubber(table.meta.client)
+    stubber.add_response("scan", {{"Items": [], "Count": 0}})
+    stubber.activate()
+"""
+
+EAGER = COMMON + """
+start = time.perf_counter()
+import boto3
+dynamodb = boto3.resource("dynamodb")
+sqs = boto3.client("sqs")
+imported = time.perf_counter()
+
+table = dynamodb.Table("WorkOrdersTable")
+stub_scan(table)
+table.scan(Limit=50)
+done = time.perf_counter()
+print(json.dumps({{"import": imported - start, "first_request": done - imported}}))
+"""
+
+LAZY = COMMON + """
+start = time.perf_counter()
+import handler
+imported = time.perf_counter()
+
+stub_scan(handler.dynamodb.Table(handler.TABLE_NAME))
+handler.lambda_handler({{"httpMethod": "GET"}}, {{}})
+done = time.perf_counter()
+print(json.dumps({{"import": imported - start, "first_request": done - imported}}))
+"""
+
+# DynamoDB alone: boto3 resource layer versus the client-backed Table
+DYNAMODB_TABLE = COMMON + """
+start = time.perf_counter()
+import boto3
+{build}
+imported = time.perf_counter()
+
+stub_scan(table)
+table.scan(Limit=50)
+done = time.perf_counter()
+print(json.dumps({{"import": imported - start, "first_request": done - imported}}))
+"""
+
+RESOURCE_TABLE = DYNAMODB_TABLE.replace("{build}", """table = boto3.resource("dynamodb").Table("WorkOrdersTable")""")
+
+CLIENT_TABLE = DYNAMODB_TABLE.replace("{build}", """from work_orders.dynamodb import DynamoDB
+table = DynamoDB(boto3.client("dynamodb")).Table("WorkOrdersTable")""")
+
+
+def sample(script):
+    code = script.format(
+        src=os.path.join(ROOT, "solutions", "direct-to-sqs", "src"),
+        common=os.path.join(ROOT, "solutions", "common", "python"),
+    )
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    results = {}
+    for label, script in [("eager", EAGER), ("lazy", LAZY), ("resource", RESOURCE_TABLE), ("client", CLIENT_TABLE)]:
+        samples = [sample(script) for _ in range(args.runs)]
+        results[label] = {
+            phase: round(statistics.median(run[phase] for run in samples) * 1000, 2)
+            for phase in ("import", "first_request")
+        }
+        results[label]["total"] = round(results[label]["import"] + results[label]["first_request"], 2)
+
+    print(f"{'mode':<8} {'import ms':>10} {'first GET ms':>13} {'total ms':>10}")
+    for label, result in results.items():
+        print(f"{label:<8} {result['import']:>10.2f} {result['first_request']:>13.2f} {result['total']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
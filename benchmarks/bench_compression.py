@@ -0,0 +1,61 @@
+"""
+CPU cost versus bytes saved when compressing GET /work-orders pages, for
+representative page sizes and each codec setting (brotli only if installed).
+
+    python benchmarks/bench_compression.py --pages 10 50 100 1000 --rounds 20
+"""
+import argparse
+import base64
+import gzip
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'solutions', 'common', 'python'))
+
+from fakes import make_work_orders
+from work_orders.serialization import dumps
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def codecs():
+    yield "gzip-1", lambda data: gzip.compress(data, compresslevel=1, mtime=0)
+    yield "gzip-6", lambda data: gzip.compress(data, compresslevel=6, mtime=0)
+    yield "gzip-9", lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli:
+        yield "br-4", lambda data: brotli.compress(data, quality=4)
+        yield "br-11", lambda data: brotli.compress(data, quality=11)
+
+
+def page_body(size):
+    return dumps({"data": {"items": make_work_orders(size), "total": size, "nextToken": "x" * 40}}).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 50, 100, 1000], help="Items per page")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    if not brotli:
+        print("brotli not installed, skipping br")
+
+    print(f"{'items':>6} {'codec':<7} {'raw bytes':>10} {'sent bytes':>10} {'saved':>7} {'ms/page':>8}")
+    for size in args.pages:
+        data = page_body(size)
+        for name, compress in codecs():
+            best = None
+            for _ in range(args.rounds):
+                start = time.perf_counter()
+                sent = base64.b64encode(compress(data))
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            saved = 1 - len(sent) / len(data)
+            print(f"{size:>6} {name:<7} {len(data):>10} {len(sent):>10} {saved:>6.1%} {best * 1000:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Measures queue consumer throughput on a local SQS stand-in, for standard and
+FIFO queues and several worker pool sizes. Each handler call sleeps
+`--processing-time` seconds, like a handler waiting on I/O.
+
+    python benchmarks/bench_consumer.py --messages 2000 --workers 1 8 32
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'solutions', 'common', 'python'))
+
+from fakes import FakeSqsQueue, make_work_orders
+from work_orders.consumer import QueueConsumer
+
+
+def run(work_orders, fifo, workers, processing_time, latency, groups):
+    queue = FakeSqsQueue(fifo=fifo, latency=latency)
+    for index, work_order in enumerate(work_orders):
+        queue.send(json.dumps(work_order), group_id=f"group-{index % groups}" if fifo else None)
+
+    stop = threading.Event()
+    handled = [0]
+    lock = threading.Lock()
+
+    def handler(work_order):
+        time.sleep(processing_time)
+        with lock:
+            handled[0] += 1
+            if handled[0] == len(work_orders):
+                stop.set()
+
+    queue_url = "work-orders-received.fifo" if fifo else "work-orders-received"
+    consumer = QueueConsumer(queue, queue_url, handler, workers=workers, wait_time_seconds=0)
+    start = time.perf_counter()
+    consumer.run(stop)
+    elapsed = time.perf_counter() - start
+    consumer.close()
+    return consumer.handled, elapsed, queue.calls
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--processing-time", type=float, default=0.002, help="Seconds per message")
+    parser.add_argument("--latency", type=float, default=0.002, help="Seconds per SQS call")
+    parser.add_argument("--groups", type=int, default=16, help="MessageGroupIds on the FIFO queue")
+    args = parser.parse_args()
+
+    work_orders = make_work_orders(args.messages)
+
+    print(f"{'queue':<9} {'workers':>7} {'messages':>9} {'seconds':>9} {'msg/s':>10} {'receives':>9} {'deletes':>8}")
+    for fifo in (False, True):
+        for workers in args.workers:
+            count, elapsed, calls = run(work_orders, fifo, workers, args.processing_time, args.latency, args.groups)
+            print(f"{'fifo' if fifo else 'standard':<9} {workers:>7} {count:>9} {elapsed:>9.3f} "
+                  f"{count / elapsed:>10.0f} {calls.get('receive_message', 0):>9} "
+                  f"{calls.get('delete_message_batch', 0):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Measures FIFO consumer throughput for each MessageGroupId strategy on a local
+SQS FIFO stand-in that enforces one in-flight message per group.
+
+    python benchmarks/bench_message_groups.py --orders 2000 --consumers 16
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'solutions', 'common', 'python'))
+
+from fakes import FakeFifoQueue, make_work_orders
+from work_orders.core import build_work_order
+from work_orders.grouping import MESSAGE_GROUP_STRATEGIES, message_group_id
+
+
+def consume(queue, processing_time, processed, lock):
+    while True:
+        message = queue.receive()
+        if message is None:
+            if queue.empty():
+                return
+            time.sleep(0.0005)
+            continue
+        group_id, _ = message
+        time.sleep(processing_time)
+        queue.delete(group_id)
+        with lock:
+            processed[0] += 1
+
+
+def run(strategy, work_orders, consumers, processing_time, group_count):
+    queue = FakeFifoQueue()
+    for work_order in work_orders:
+        queue.send(message_group_id(work_order, strategy=strategy, group_count=group_count), work_order)
+
+    processed = [0]
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=consume, args=(queue, processing_time, processed, lock))
+        for _ in range(consumers)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return processed[0], elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--consumers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--processing-time", type=float, default=0.002, help="Seconds per message")
+    parser.add_argument("--customers", type=int, default=200)
+    parser.add_argument("--group-count", type=int, default=16)
+    args = parser.parse_args()
+
+    random.seed(7)
+    # Workload dominated by newly received orders, as in production. Orders are
+    # built from POST bodies, so 'hash' groups by the customerId the API stores
+    work_orders = []
+    for template in make_work_orders(args.orders):
+        work_orders.append(build_work_order({
+            "description": template["description"],
+            "deliveryDate": template["deliveryDate"],
+            "status": "received" if random.random() < 0.7 else template["status"],
+            "cancellationReason": template["cancellationReason"],
+            "customerId": f"customer-{random.randrange(args.customers)}",
+        }))
+
+    print(f"{'strategy':<10} {'consumers':>9} {'messages':>9} {'seconds':>9} {'msg/s':>10}")
+    for strategy in MESSAGE_GROUP_STRATEGIES:
+        for consumers in args.consumers:
+            count, elapsed = run(strategy, work_orders, consumers, args.processing_time, args.group_count)
+            print(f"{strategy:<10} {consumers:>9} {count:>9} {elapsed:>9.3f} {count / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
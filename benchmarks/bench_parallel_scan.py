@@ -0,0 +1,45 @@
+"""
+Compares the serial Scan path with the parallel segmented scan on a local
+DynamoDB stand-in with injected per-call latency.
+
+    python benchmarks/bench_parallel_scan.py --items 50000 --latency 0.02
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'solutions', 'common', 'python'))
+
+from fakes import FakeTable, make_work_orders
+from work_orders.parallel_scan import parallel_scan, serial_scan
+
+
+def run(label, scan):
+    start = time.perf_counter()
+    count = sum(1 for _ in scan())
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {count:>8} items {elapsed:>8.3f} s {count / elapsed:>12.0f} items/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=50000)
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds per Scan call")
+    parser.add_argument("--page-items", type=int, default=1000, help="Items per 1 MB page")
+    parser.add_argument("--segments", type=int, nargs="+", default=[2, 4, 8, 16])
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    table = FakeTable(make_work_orders(args.items), latency=args.latency, page_items=args.page_items)
+
+    serial = run("serial", lambda: serial_scan(table))
+    for segments in args.segments:
+        elapsed = run(f"parallel segments={segments}",
+                      lambda: parallel_scan(lambda: table, total_segments=segments, max_workers=args.workers))
+        print(f"{'':<28} speedup x{serial / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Microbenchmark of the DynamoDB stream image decoders over synthetic
+10k-record batches.
+
+    python benchmarks/bench_stream_decoder.py --records 10000 --rounds 5
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'solutions', 'common', 'python'))
+
+from work_orders.stream_image import LazyImage, deserialize_fields, deserialize_image
+
+
+def legacy_convert(item):
+    """
+    Decoder used by the stream handler before the dispatch table (reference only).
+    """
+    return {key: list(value.values())[0] for key, value in item.items()}
+
+
+def make_images(count):
+    statuses = ["received", "in_progress", "completed", "canceled"]
+    images = []
+    for i in range(count):
+        images.append({
+            "id": {"S": f"{i:08x}-0000-4000-8000-000000000000"},
+            "createdAt": {"S": "2025-02-14T12:00:00.000000"},
+            "description": {"S": f"Work order {i}"},
+            "deliveryDate": {"S": "2025-02-20T12:00:00Z"},
+            "status": {"S": statuses[i % 4]},
+            "statusShard": {"S": f"{statuses[i % 4]}#{i % 4}"},
+            "cancellationReason": {"S": "Customer request"} if i % 4 == 3 else {"NULL": True},
+            "priority": {"N": str(i % 5)},
+            "tags": {"SS": ["repair", "screen"]},
+            "attachments": {"L": [{"M": {"name": {"S": "photo.jpg"}, "size": {"N": "2048"}}}]},
+        })
+    return images
+
+
+def bench(label, decode, images, rounds):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for image in images:
+            decode(image)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<32} {best * 1000:>9.2f} ms {best / len(images) * 1e6:>8.2f} us/record")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    images = make_images(args.records)
+    bench("legacy convert_dynamodb_item", legacy_convert, images, args.rounds)
+    bench("deserialize_image", deserialize_image, images, args.rounds)
+    bench("deserialize_fields(id, status)", lambda image: deserialize_fields(image, ("id", "status")),
+          images, args.rounds)
+    bench("LazyImage['status']", lambda image: LazyImage(image)["status"], images, args.rounds)
+
+    try:
+        from boto3.dynamodb.types import TypeDeserializer
+    except ImportError:
+        print("boto3 not installed, skipping TypeDeserializer")
+        return
+    deserializer = TypeDeserializer()
+    bench("boto3 TypeDeserializer",
+          lambda image: {key: deserializer.deserialize(value) for key, value in image.items()},
+          images, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Microbenchmark of POST payload validation: the hand-rolled validator the
+handlers used before (strptime per request) against the shared
+WorkOrderValidator, for valid and invalid payloads.
+
+    python benchmarks/bench_validation.py --requests 100000
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'solutions', 'common', 'python'))
+
+from work_orders.validation import VALID_STATUSES, WorkOrderValidator
+
+
+def legacy_is_valid_iso8601(date_str):
+    try:
+        datetime.datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%SZ")
+        return True
+    except ValueError:
+        return False
+
+
+def legacy_validate(body):
+    """
+    Validator used by the handlers before work_orders.validation (reference only).
+    """
+    required_fields = ["description", "deliveryDate", "status"]
+    missing_fields = [field for field in required_fields if field not in body]
+    if missing_fields:
+        return {"message": "Missing required fields.", "missingFields": missing_fields}
+    if body["status"] not in VALID_STATUSES:
+        return {"message": f"Invalid status '{body['status']}'.", "validStatuses": list(VALID_STATUSES)}
+    if not legacy_is_valid_iso8601(body["deliveryDate"]):
+        return {"message": "Invalid date format."}
+    if body["status"] == "canceled" and "cancellationReason" not in body:
+        return {"message": "Cancellation reason is required when status is 'canceled'."}
+    return None
+
+
+PAYLOADS = {
+    "valid": {"description": "Replace screen", "deliveryDate": "2025-02-20T12:00:00Z", "status": "received"},
+    "invalid date": {"description": "Replace screen", "deliveryDate": "2025-02-30T12:00:00Z", "status": "received"},
+    "invalid status": {"description": "Replace screen", "deliveryDate": "2025-02-20T12:00:00Z", "status": "lost"},
+    "missing fields": {"status": "received"},
+}
+
+
+def bench(validate, body, requests, rounds):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(requests):
+            validate(body)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=100000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    validators = {"legacy": legacy_validate, "WorkOrderValidator": WorkOrderValidator()}
+    print(f"{'payload':<16} {'validator':<20} {'seconds':>9} {'ns/request':>11}")
+    for label, body in PAYLOADS.items():
+        for name, validate in validators.items():
+            elapsed = bench(validate, body, args.requests, args.rounds)
+            print(f"{label:<16} {name:<20} {elapsed:>9.3f} {elapsed / args.requests * 1e9:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+In-process stand-ins for the AWS services used by the benchmarks.
+Each fake sleeps `latency` seconds per call to emulate a network round trip.
+"""
+import json
+import threading
+import time
+import types
+import zlib
+
+
+class FakeTable:
+    """
+    Minimal DynamoDB Table supporting paginated and segmented Scan.
+    `page_items` emulates DynamoDB's 1 MB page limit.
+    """
+
+    def __init__(self, items, latency=0.0, page_items=1000):
+        self.items = sorted(items, key=lambda item: item["id"])
+        self.latency = latency
+        self.page_items = page_items
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._segments = {}
+
+    def _segment_items(self, total_segments):
+        if total_segments not in self._segments:
+            buckets = [[] for _ in range(total_segments)]
+            for item in self.items:
+                buckets[zlib.crc32(item["id"].encode("utf-8")) % total_segments].append(item)
+            self._segments[total_segments] = buckets
+        return self._segments[total_segments]
+
+    def scan(self, Limit=None, ExclusiveStartKey=None, Segment=None, TotalSegments=None, **kwargs):
+        with self._lock:
+            self.calls += 1
+            items = self._segment_items(TotalSegments)[Segment] if TotalSegments else self.items
+        if self.latency:
+            time.sleep(self.latency)
+
+        start = 0
+        if ExclusiveStartKey:
+            start = next(i for i, item in enumerate(items) if item["id"] == ExclusiveStartKey["id"]) + 1
+        size = min(Limit or self.page_items, self.page_items)
+        page = items[start:start + size]
+        result = {"Items": page, "Count": len(page)}
+        if start + size < len(items):
+            result["LastEvaluatedKey"] = {"id": page[-1]["id"]}
+        return result
+
+
+def make_work_orders(count):
+    """
+    Builds `count` synthetic work orders.
+    """
+    statuses = ["received", "in_progress", "completed", "canceled"]
+    return [
+        {
+            "id": f"{i:08x}-0000-4000-8000-000000000000",
+            "createdAt": f"2025-02-14T12:{(i // 60) % 60:02d}:{i % 60:02d}",
+            "description": f"Work order {i}",
+            "deliveryDate": "2025-02-20T12:00:00Z",
+            "status": statuses[i % 4],
+            "cancellationReason": "Customer request" if i % 4 == 3 else None,
+        }
+        for i in range(count)
+    ]
+
+
+class FakeFifoQueue:
+    """
+    SQS FIFO queue stand-in: a message is only delivered when no other message
+    of its MessageGroupId is in flight, like the real service.
+    """
+
+    def __init__(self):
+        self._messages = []
+        self._in_flight_groups = set()
+        self._lock = threading.Lock()
+
+    def send(self, group_id, body):
+        with self._lock:
+            self._messages.append((group_id, body))
+
+    def receive(self):
+        with self._lock:
+            for index, (group_id, body) in enumerate(self._messages):
+                if group_id not in self._in_flight_groups:
+                    self._in_flight_groups.add(group_id)
+                    del self._messages[index]
+                    return group_id, body
+            return None
+
+    def delete(self, group_id):
+        with self._lock:
+            self._in_flight_groups.discard(group_id)
+
+    def empty(self):
+        with self._lock:
+            return not self._messages and not self._in_flight_groups
+
+
+class FakeSqsQueue:
+    """
+    SQS client stand-in for one queue, speaking the boto3 API used by the
+    consumers: ReceiveMessage (at most 10 messages, visibility timeout),
+    DeleteMessageBatch and ChangeMessageVisibilityBatch. With `fifo`, a
+    MessageGroupId is not delivered again while it has messages in flight.
+    Each call sleeps `latency` seconds.
+    """
+
+    def __init__(self, fifo=False, latency=0.0):
+        self.fifo = fifo
+        self.latency = latency
+        self.calls = {}
+        self._messages = []
+        self._in_flight = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def _call(self, operation):
+        with self._lock:
+            self.calls[operation] = self.calls.get(operation, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def send(self, body, group_id=None):
+        with self._lock:
+            self._next_id += 1
+            self._messages.append({"MessageId": str(self._next_id), "Body": body, "GroupId": group_id})
+
+    def receive_message(self, MaxNumberOfMessages=1, VisibilityTimeout=30, **params):
+        self._call("receive_message")
+        now = time.monotonic()
+        with self._lock:
+            # Messages whose visibility timeout expired are delivered again
+            for receipt, (message, deadline) in list(self._in_flight.items()):
+                if deadline <= now:
+                    del self._in_flight[receipt]
+                    self._messages.insert(0, message)
+            busy = {message["GroupId"] for message, _ in self._in_flight.values()} if self.fifo else set()
+            received = []
+            for message in list(self._messages):
+                if len(received) == MaxNumberOfMessages:
+                    break
+                if message["GroupId"] in busy:
+                    continue
+                self._messages.remove(message)
+                receipt = f"{message['MessageId']}-{now}"
+                self._in_flight[receipt] = (message, now + VisibilityTimeout)
+                received.append({
+                    "MessageId": message["MessageId"],
+                    "ReceiptHandle": receipt,
+                    "Body": message["Body"],
+                    "Attributes": {"MessageGroupId": message["GroupId"]} if self.fifo else {},
+                })
+        return {"Messages": received} if received else {}
+
+    def delete_message_batch(self, QueueUrl, Entries):
+        self._call("delete_message_batch")
+        with self._lock:
+            for entry in Entries:
+                self._in_flight.pop(entry["ReceiptHandle"], None)
+        return {"Successful": [{"Id": entry["Id"]} for entry in Entries], "Failed": []}
+
+    def change_message_visibility_batch(self, QueueUrl, Entries):
+        self._call("change_message_visibility_batch")
+        now = time.monotonic()
+        with self._lock:
+            for entry in Entries:
+                if entry["ReceiptHandle"] in self._in_flight:
+                    message, _ = self._in_flight[entry["ReceiptHandle"]]
+                    self._in_flight[entry["ReceiptHandle"]] = (message, now + entry["VisibilityTimeout"])
+        return {"Successful": [{"Id": entry["Id"]} for entry in Entries], "Failed": []}
+
+    def empty(self):
+        with self._lock:
+            return not self._messages and not self._in_flight
+
+
+class CallRecorder:
+    """
+    Counts the AWS calls made by the code under test and the bytes they send
+    (the JSON size of the request parameters).
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+
+    def record(self, operation, params):
+        size = len(json.dumps(params, default=str))
+        with self._lock:
+            self.calls[operation] = self.calls.get(operation, 0) + 1
+            self.bytes_sent += size
+
+    def total_calls(self):
+        with self._lock:
+            return sum(self.calls.values())
+
+
+def _canned_response(operation, params):
+    if operation == "send_message_batch":
+        return {"Successful": [{"Id": entry["Id"]} for entry in params["Entries"]], "Failed": []}
+    if operation == "publish_batch":
+        entries = params["PublishBatchRequestEntries"]
+        return {"Successful": [{"Id": entry["Id"]} for entry in entries], "Failed": []}
+    if operation == "put_events":
+        return {"FailedEntryCount": 0, "Entries": [{"EventId": str(i)} for i in range(len(params["Entries"]))]}
+    return {"MessageId": "fake"}
+
+
+class FakeClient:
+    """
+    Stand-in for the SQS, SNS and EventBridge clients: every call is recorded,
+    sleeps `latency` seconds and succeeds.
+    """
+
+    def __init__(self, service, recorder, latency=0.0):
+        self.service = service
+        self.recorder = recorder
+        self.latency = latency
+
+    def __getattr__(self, operation):
+        if operation.startswith("_"):
+            raise AttributeError(operation)
+
+        def call(**params):
+            self.recorder.record(f"{self.service}.{operation}", params)
+            if self.latency:
+                time.sleep(self.latency)
+            return _canned_response(operation, params)
+
+        return call
+
+
+class FakeDynamoResource:
+    """
+    Stand-in for the DynamoDB resource used by the API handlers. Writes are
+    recorded per table (low-level items for transactions, plain items
+    otherwise) so the benchmarks can replay them as stream records.
+    """
+
+    def __init__(self, recorder, latency=0.0):
+        self.recorder = recorder
+        self.latency = latency
+        self.written = {}
+        self._lock = threading.Lock()
+        self.meta = types.SimpleNamespace(client=self)
+
+    def _call(self, operation, params):
+        self.recorder.record(f"dynamodb.{operation}", params)
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _store(self, table_name, item, serialized=False):
+        with self._lock:
+            self.written.setdefault(table_name, []).append((item, serialized))
+
+    def Table(self, name):
+        return _FakeApiTable(self, name)
+
+    def batch_write_item(self, RequestItems):
+        self._call("batch_write_item", RequestItems)
+        for table_name, requests in RequestItems.items():
+            for request in requests:
+                self._store(table_name, request["PutRequest"]["Item"])
+        return {"UnprocessedItems": {}}
+
+    def transact_write_items(self, TransactItems):
+        self._call("transact_write_items", TransactItems)
+        for action in TransactItems:
+            self._store(action["Put"]["TableName"], action["Put"]["Item"], serialized=True)
+        return {}
+
+
+class _FakeApiTable:
+
+    def __init__(self, resource, name):
+        self.resource = resource
+        self.name = name
+
+    def put_item(self, Item):
+        self.resource._call("put_item", Item)
+        self.resource._store(self.name, Item)
+        return {}
+
+    def update_item(self, **params):
+        self.resource._call("update_item", params)
+        return {}
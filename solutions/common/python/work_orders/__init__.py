@@ -0,0 +1,3 @@
+"""
+Shared work-order helpers packaged as a Lambda layer for every solution.
+"""
@@ -0,0 +1,243 @@
+import os
+import time
+
+# Service limits per batch request
+DYNAMODB_BATCH_SIZE = 25
+SQS_BATCH_SIZE = 10
+SNS_BATCH_SIZE = 10
+EVENTBRIDGE_BATCH_SIZE = 10
+
+# Maximum number of work orders accepted by POST /work-orders/batch
+MAX_WORK_ORDERS_PER_BATCH = int(os.getenv("MAX_BATCH_SIZE", "100"))
+
+# Retries for UnprocessedItems and retryable per-entry failures
+MAX_BATCH_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 0.05
+
+
+class BatchError(ValueError):
+    """
+    Raised when a batch request payload is invalid.
+    """
+
+
+def chunked(items, size):
+    """
+    Splits a list into consecutive chunks of at most `size` elements.
+    """
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def parse_batch(body, max_size=None):
+    """
+    Extracts the list of work orders from a batch request body.
+    """
+    max_size = max_size or MAX_WORK_ORDERS_PER_BATCH
+    work_orders = body.get("workOrders") if isinstance(body, dict) else None
+    if not isinstance(work_orders, list) or not work_orders:
+        raise BatchError("The 'workOrders' field must be a non-empty list.")
+    if len(work_orders) > max_size:
+        raise BatchError(f"A batch can contain at most {max_size} work orders.")
+    return work_orders
+
+
+def backoff(attempt, sleep=time.sleep):
+    """
+    Waits before the next retry using exponential backoff.
+    """
+    sleep(BACKOFF_BASE_SECONDS * (2 ** attempt))
+
+
+def batch_write_items(dynamodb, table_name, items, key="id", max_attempts=MAX_BATCH_ATTEMPTS, sleep=time.sleep):
+    """
+    Stores items with BatchWriteItem in chunks of 25, retrying UnprocessedItems.
+    Returns a dict mapping the key of every item that could not be written to an error message.
+    """
+    failed = {}
+    for chunk in chunked(items, DYNAMODB_BATCH_SIZE):
+        requests = [{"PutRequest": {"Item": item}} for item in chunk]
+        try:
+            for attempt in range(max_attempts):
+                result = dynamodb.batch_write_item(RequestItems={table_name: requests})
+                requests = result.get("UnprocessedItems", {}).get(table_name, [])
+                if not requests:
+                    break
+                if attempt + 1 < max_attempts:
+                    backoff(attempt, sleep)
+            for request in requests:
+                failed[request["PutRequest"]["Item"][key]] = "Write was not processed by DynamoDB."
+        except Exception as e:
+            for request in requests:
+                failed[request["PutRequest"]["Item"][key]] = str(e)
+    return failed
+
+
+def _send_entries(send, entries, size, max_attempts, sleep, ordered=False):
+    """
+    Sends entries in chunks through `send(chunk)`, which returns a list of
+    (entry_id, message, retryable) failures. Retryable failures are resent.
+    With `ordered`, the chunks after a failed one are not sent, so entries
+    never overtake an earlier entry that still has to be retried.
+    Returns a dict mapping failed entry ids to error messages.
+    """
+    failed = {}
+    chunks = chunked(entries, size)
+    for position, chunk in enumerate(chunks):
+        if ordered and failed:
+            for skipped in chunks[position:]:
+                for entry in skipped:
+                    failed[entry["Id"]] = "Not sent to preserve ordering after an earlier failure."
+            break
+        pending = chunk
+        for attempt in range(max_attempts):
+            try:
+                failures = send(pending)
+            except Exception as e:
+                failures = [(entry["Id"], str(e), False) for entry in pending]
+
+            retry_ids = set()
+            for entry_id, message, retryable in failures:
+                if retryable and attempt + 1 < max_attempts:
+                    retry_ids.add(entry_id)
+                else:
+                    failed[entry_id] = message
+            pending = [entry for entry in pending if entry["Id"] in retry_ids]
+            if not pending:
+                break
+            backoff(attempt, sleep)
+    return failed
+
+
+def send_message_batch(sqs, queue_url, entries, max_attempts=MAX_BATCH_ATTEMPTS, sleep=time.sleep, ordered=False):
+    """
+    Sends SendMessageBatch entries (each with an 'Id') in chunks of 10.
+    Use `ordered` for FIFO queues whose failed entries will be retried later.
+    Returns a dict mapping failed entry ids to error messages.
+    """
+    def send(chunk):
+        result = sqs.send_message_batch(QueueUrl=queue_url, Entries=chunk)
+        return [
+            (failure["Id"], failure.get("Message", failure.get("Code")), not failure.get("SenderFault", False))
+            for failure in result.get("Failed", [])
+        ]
+
+    return _send_entries(send, entries, SQS_BATCH_SIZE, max_attempts, sleep, ordered)
+
+
+def _sqs_failures(result):
+    return [
+        (failure["Id"], failure.get("Message", failure.get("Code")), not failure.get("SenderFault", False))
+        for failure in result.get("Failed", [])
+    ]
+
+
+def delete_message_batch(sqs, queue_url, entries, max_attempts=MAX_BATCH_ATTEMPTS, sleep=time.sleep):
+    """
+    Deletes DeleteMessageBatch entries ('Id' and 'ReceiptHandle') in chunks of 10.
+    Returns a dict mapping failed entry ids to error messages.
+    """
+    def send(chunk):
+        return _sqs_failures(sqs.delete_message_batch(QueueUrl=queue_url, Entries=chunk))
+
+    return _send_entries(send, entries, SQS_BATCH_SIZE, max_attempts, sleep)
+
+
+def change_message_visibility_batch(sqs, queue_url, entries, max_attempts=MAX_BATCH_ATTEMPTS, sleep=time.sleep):
+    """
+    Sends ChangeMessageVisibilityBatch entries ('Id', 'ReceiptHandle' and
+    'VisibilityTimeout') in chunks of 10.
+    Returns a dict mapping failed entry ids to error messages.
+    """
+    def send(chunk):
+        return _sqs_failures(sqs.change_message_visibility_batch(QueueUrl=queue_url, Entries=chunk))
+
+    return _send_entries(send, entries, SQS_BATCH_SIZE, max_attempts, sleep)
+
+
+def publish_batch(sns, topic_arn, entries, max_attempts=MAX_BATCH_ATTEMPTS, sleep=time.sleep):
+    """
+    Publishes PublishBatch entries (each with an 'Id') in chunks of 10.
+    Returns a dict mapping failed entry ids to error messages.
+    """
+    def send(chunk):
+        result = sns.publish_batch(TopicArn=topic_arn, PublishBatchRequestEntries=chunk)
+        return [
+            (failure["Id"], failure.get("Message", failure.get("Code")), not failure.get("SenderFault", False))
+            for failure in result.get("Failed", [])
+        ]
+
+    return _send_entries(send, entries, SNS_BATCH_SIZE, max_attempts, sleep)
+
+
+def put_events_batch(eventbridge, entries, max_attempts=MAX_BATCH_ATTEMPTS, sleep=time.sleep):
+    """
+    Sends PutEvents entries in chunks of 10. Each entry carries an 'Id' used only
+    to report failures; it is not sent to EventBridge.
+    Returns a dict mapping failed entry ids to error messages.
+    """
+    def send(chunk):
+        result = eventbridge.put_events(
+            Entries=[{name: value for name, value in entry.items() if name != "Id"} for entry in chunk]
+        )
+        if not result.get("FailedEntryCount"):
+            return []
+        return [
+            (entry["Id"], outcome.get("ErrorMessage", outcome["ErrorCode"]),
+             outcome["ErrorCode"] in ("InternalFailure", "ThrottlingException"))
+            for entry, outcome in zip(chunk, result.get("Entries", []))
+            if outcome.get("ErrorCode")
+        ]
+
+    return _send_entries(send, entries, EVENTBRIDGE_BATCH_SIZE, max_attempts, sleep)
+
+
+def create_batch(payloads, validate, build, store, publish=None):
+    """
+    Runs the batch creation flow shared by every handler:
+    validates each payload, stores the valid work orders in one batched write
+    and publishes the stored ones with the batched publish API.
+
+    `store(work_orders)` and `publish(work_orders)` return a dict of failed ids.
+    Returns (results, all_created) where results has one entry per payload.
+    """
+    results = [None] * len(payloads)
+    work_orders = []
+    positions = {}
+
+    for index, payload in enumerate(payloads):
+        if not isinstance(payload, dict):
+            results[index] = {"index": index, "statusCode": 400, "message": "Each work order must be a JSON object."}
+            continue
+        error = validate(payload)
+        if error:
+            results[index] = {"index": index, "statusCode": 400, **error}
+            continue
+        work_order = build(payload)
+        positions[work_order["id"]] = index
+        work_orders.append(work_order)
+
+    write_failures = store(work_orders) if work_orders else {}
+    stored = [work_order for work_order in work_orders if work_order["id"] not in write_failures]
+    publish_failures = publish(stored) if publish and stored else {}
+
+    for work_order in work_orders:
+        index = positions[work_order["id"]]
+        if work_order["id"] in write_failures:
+            results[index] = {
+                "index": index,
+                "id": work_order["id"],
+                "statusCode": 500,
+                "message": write_failures[work_order["id"]],
+            }
+        else:
+            results[index] = {
+                "index": index,
+                "id": work_order["id"],
+                "statusCode": 201,
+                "data": work_order,
+            }
+            if publish:
+                results[index]["published"] = work_order["id"] not in publish_failures
+
+    all_created = all(result["statusCode"] == 201 for result in results)
+    return results, all_created
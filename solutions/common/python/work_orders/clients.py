@@ -0,0 +1,143 @@
+"""
+Lazily created, cached AWS clients shared by every handler.
+
+Nothing is imported from boto3 until a client is first used, so a request
+only pays for the clients it needs. Clients, resources and Table objects are
+kept at module level and reused across warm invocations. With metrics
+enabled, every client counts its calls and retries for the invocation's EMF line.
+
+DynamoDB does not use the boto3 resource layer: it is slow to build on a
+cold start and not thread-safe, so its "resource" is work_orders.dynamodb,
+a thin layer over the low-level client.
+"""
+import os
+import threading
+
+from work_orders.dynamodb import DynamoDB
+from work_orders.metrics import METRICS_ENABLED, register_client_hooks
+
+_clients = {}
+_resources = {}
+_tables = {}
+# Reentrant: the DynamoDB resource is built from its client under the lock
+_lock = threading.RLock()
+
+
+def client_config():
+    """
+    Builds the botocore Config used by every client: connection pool size,
+    TCP keepalive, connect/read timeouts and adaptive retries.
+    """
+    from botocore.config import Config
+
+    return Config(
+        max_pool_connections=int(os.getenv("CLIENT_MAX_POOL_CONNECTIONS", "50")),
+        connect_timeout=float(os.getenv("CLIENT_CONNECT_TIMEOUT", "2")),
+        read_timeout=float(os.getenv("CLIENT_READ_TIMEOUT", "5")),
+        tcp_keepalive=os.getenv("CLIENT_TCP_KEEPALIVE", "true").lower() == "true",
+        retries={
+            "mode": os.getenv("CLIENT_RETRY_MODE", "adaptive"),
+            "max_attempts": int(os.getenv("CLIENT_MAX_ATTEMPTS", "5")),
+        },
+    )
+
+
+def get_client(service_name):
+    """
+    Returns the low-level client for a service, creating it on first use.
+    """
+    client = _clients.get(service_name)
+    if client is None:
+        with _lock:
+            client = _clients.get(service_name)
+            if client is None:
+                import boto3
+
+                client = boto3.client(service_name, config=client_config())
+                if METRICS_ENABLED:
+                    register_client_hooks(client)
+                _clients[service_name] = client
+    return client
+
+
+def get_resource(service_name):
+    """
+    Returns the boto3 resource for a service, creating it on first use.
+    For DynamoDB it is the client-backed work_orders.dynamodb.DynamoDB.
+    """
+    resource = _resources.get(service_name)
+    if resource is None:
+        with _lock:
+            resource = _resources.get(service_name)
+            if resource is None and service_name == "dynamodb":
+                resource = _resources[service_name] = DynamoDB(get_client(service_name))
+            elif resource is None:
+                import boto3
+
+                resource = boto3.resource(service_name, config=client_config())
+                if METRICS_ENABLED:
+                    register_client_hooks(resource.meta.client)
+                _resources[service_name] = resource
+    return resource
+
+
+def get_table(table_name):
+    """
+    Returns the cached DynamoDB Table object for a table name.
+    """
+    table = _tables.get(table_name)
+    if table is None:
+        table = _tables[table_name] = get_resource("dynamodb").Table(table_name)
+    return table
+
+
+def reset():
+    """
+    Drops every cached client, resource and table.
+    """
+    with _lock:
+        _clients.clear()
+        _resources.clear()
+        _tables.clear()
+
+
+class LazyClient:
+    """
+    Module-level stand-in for a client that is only built when first used.
+    """
+
+    def __init__(self, service_name):
+        self._service_name = service_name
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            # Introspection (copy, mock, inspect) must not create the client
+            raise AttributeError(name)
+        return getattr(get_client(self._service_name), name)
+
+
+class LazyResource:
+    """
+    Module-level stand-in for a boto3 resource that is only built when first used.
+    Table objects are cached per table name.
+    """
+
+    def __init__(self, service_name):
+        self._service_name = service_name
+
+    def Table(self, table_name):
+        return get_table(table_name)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            # Introspection (copy, mock, inspect) must not create the client
+            raise AttributeError(name)
+        return getattr(get_resource(self._service_name), name)
+
+
+def lazy_client(service_name):
+    return LazyClient(service_name)
+
+
+def lazy_resource(service_name):
+    return LazyResource(service_name)
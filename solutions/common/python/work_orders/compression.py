@@ -0,0 +1,108 @@
+import base64
+import gzip
+import os
+
+# Brotli is optional; without it only gzip is offered
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are not worth the CPU (and base64 overhead)
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+
+def _gzip(data):
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _brotli(data):
+    return brotli.compress(data, quality=BROTLI_QUALITY)
+
+
+# Supported encodings, most preferred first
+ENCODERS = {"br": _brotli, "gzip": _gzip} if brotli else {"gzip": _gzip}
+
+
+def header(headers, name):
+    """
+    Reads a request header ignoring its case; API Gateway keeps the client's spelling.
+    """
+    if not headers:
+        return None
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def negotiate(accept_encoding):
+    """
+    Picks the response encoding from an Accept-Encoding header, or None.
+    Honours q-values (q=0 refuses an encoding) and the '*' wildcard; on a tie
+    the server preference order of ENCODERS wins.
+    """
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        if coding:
+            weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in ENCODERS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress_response(response, request_headers, min_bytes=None):
+    """
+    Compresses an API Gateway response body when the client accepts it and the
+    body is large enough. The compressed body is base64 encoded and flagged
+    with isBase64Encoded, as API Gateway requires for binary payloads.
+    """
+    min_bytes = COMPRESSION_MIN_BYTES if min_bytes is None else min_bytes
+    encoding = negotiate(header(request_headers, "Accept-Encoding"))
+    body = response.get("body")
+    if encoding is None or not body:
+        return response
+
+    data = body.encode("utf-8")
+    if len(data) < min_bytes:
+        return response
+
+    headers = dict(response.get("headers") or {})
+    headers["Content-Encoding"] = encoding
+    headers["Vary"] = "Accept-Encoding"
+    return {
+        **response,
+        "headers": headers,
+        "body": base64.b64encode(ENCODERS[encoding](data)).decode("ascii"),
+        "isBase64Encoded": True,
+    }
+
+
+def request_body(event):
+    """
+    Returns the request body as text, decoding it when API Gateway delivered
+    it base64 encoded (any content type is binary once binaryMediaTypes is '*/*').
+    """
+    body = event.get("body")
+    if body is not None and event.get("isBase64Encoded"):
+        return base64.b64decode(body).decode("utf-8")
+    return body
@@ -0,0 +1,122 @@
+import hashlib
+import os
+import time
+
+from work_orders.compression import header
+
+# Table holding the "last modified" watermark of the work orders table.
+# Without it list pages are still tagged, but from their content.
+META_TABLE = os.getenv("META_TABLE")
+WATERMARK_KEY = "work-orders"
+
+# Clients may keep responses but must revalidate them with If-None-Match
+CACHE_CONTROL = os.getenv("CACHE_CONTROL", "private, no-cache")
+
+# Scans and index queries are eventually consistent: for this long after the
+# watermark moves a page may still miss the write, so it is tagged by content
+WATERMARK_SETTLE_SECONDS = float(os.getenv("WATERMARK_SETTLE_SECONDS", "5"))
+
+# Watermark ETags expire after this long even if the version did not move,
+# which bounds how long a write whose bump failed can hide behind a 304
+WATERMARK_MAX_AGE_SECONDS = int(os.getenv("WATERMARK_MAX_AGE_SECONDS", "300"))
+
+# Set when a bump failed in this process: until one succeeds again the
+# watermark may not reflect every write, so pages are tagged by content
+_bump_failed = False
+
+# Query parameters that select a list page; they are part of its ETag
+PAGE_PARAMS = ("limit", "nextToken", "status", "since", "until", "dueAfter", "dueBefore", "format")
+
+
+def _digest(data):
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def content_etag(body):
+    """
+    ETag of a serialized body: a hash of its content. Weak, like page_etag,
+    because the same body may be sent compressed or not.
+    """
+    return f'W/"{_digest(body)}"'
+
+
+def page_etag(version, params, now=time.time):
+    """
+    ETag of a list page at a watermark version, derived from the request
+    alone so it can be checked before the table is read. Weak, because the
+    same page may be sent compressed or not. It also changes every
+    WATERMARK_MAX_AGE_SECONDS, so clients revalidate against the table.
+    """
+    selected = "&".join(f"{name}={(params or {}).get(name) or ''}" for name in PAGE_PARAMS)
+    period = int(now()) // WATERMARK_MAX_AGE_SECONDS
+    return f'W/"{version}-{period}-{_digest(selected)}"'
+
+
+def if_none_match(headers, etag):
+    """
+    Whether the If-None-Match request header matches `etag` ('*' included).
+    Uses the weak comparison, as RFC 9110 requires for If-None-Match.
+    """
+    value = header(headers, "If-None-Match")
+    if not value:
+        return False
+    opaque = _opaque(etag)
+    return any(tag == "*" or _opaque(tag) == opaque for tag in (part.strip() for part in value.split(",")))
+
+
+def _opaque(etag):
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def with_etag(response, etag):
+    """
+    Adds the ETag and Cache-Control headers to a response.
+    """
+    response["headers"] = {**(response.get("headers") or {}), "ETag": etag, "Cache-Control": CACHE_CONTROL}
+    return response
+
+
+def not_modified(etag):
+    """
+    Returns a 304 response: no body, only the validators.
+    """
+    return {"statusCode": 304, "headers": {"ETag": etag, "Cache-Control": CACHE_CONTROL}, "body": ""}
+
+
+def read_watermark(dynamodb, meta_table=None, now=time.time, settle_seconds=None):
+    """
+    Reads the current watermark version of the work orders table, or 0 when
+    nothing was written yet. The read is strongly consistent, but the pages
+    are not: while the last bump is younger than `settle_seconds`, or after a
+    bump failed in this process, None is returned and pages are tagged by
+    content instead, so a page missing a write is never pinned by a 304.
+    """
+    if _bump_failed:
+        return None
+    settle_seconds = WATERMARK_SETTLE_SECONDS if settle_seconds is None else settle_seconds
+    table = dynamodb.Table(meta_table or META_TABLE)
+    item = table.get_item(Key={"id": WATERMARK_KEY}, ConsistentRead=True).get("Item", {})
+    if now() - int(item.get("updatedAt", 0)) < settle_seconds:
+        return None
+    return int(item.get("version", 0))
+
+
+def touch_watermark(dynamodb, meta_table=None, now=time.time):
+    """
+    Moves the watermark forward after the work orders table changed.
+    The atomic ADD keeps concurrent writers from losing increments.
+    A failure is re-raised after disabling watermark ETags in this process.
+    """
+    global _bump_failed
+    table = dynamodb.Table(meta_table or META_TABLE)
+    try:
+        table.update_item(
+            Key={"id": WATERMARK_KEY},
+            UpdateExpression="ADD version :one SET updatedAt = :now",
+            ExpressionAttributeValues={":one": 1, ":now": int(now())}
+        )
+    except Exception:
+        _bump_failed = True
+        raise
+    _bump_failed = False
+
@@ -0,0 +1,302 @@
+"""
+Consumers for the per-status work-order queues.
+
+QueueConsumer long-polls a queue and handles the messages on a bounded worker
+pool; sqs_batch_handler adapts the same handler to a Lambda SQS trigger.
+
+    python -m work_orders.consumer --queue-url <QUEUE_URL> --workers 16
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from work_orders.batch import change_message_visibility_batch, delete_message_batch
+from work_orders.serialization import loads
+
+# ReceiveMessage limits: 10 messages per call, 20 seconds of long polling
+RECEIVE_BATCH_SIZE = 10
+WAIT_TIME_SECONDS = 20
+
+DEFAULT_WORKERS = int(os.getenv("CONSUMER_WORKERS", "8"))
+DEFAULT_VISIBILITY_TIMEOUT = int(os.getenv("CONSUMER_VISIBILITY_TIMEOUT", "30"))
+
+
+def decode_work_order(body):
+    """
+    Extracts the work order from a message body, whatever delivered it: the
+    SQS publisher and the stream processor send it as is, SNS wraps it in a
+    notification and EventBridge in an event.
+    """
+    message = loads(body)
+    if isinstance(message, dict):
+        if message.get("Type") == "Notification" and "Message" in message:
+            return loads(message["Message"])
+        if "detail-type" in message and "detail" in message:
+            return message["detail"]
+    return message
+
+
+def ordered_groups(messages, key):
+    """
+    Splits messages into groups by `key`, keeping the received order inside each group.
+    """
+    groups = {}
+    for message in messages:
+        groups.setdefault(key(message), []).append(message)
+    return list(groups.values())
+
+
+class VisibilityHeartbeat:
+    """
+    Keeps tracked messages invisible while their handlers run, extending the
+    visibility timeout of all of them every half timeout with batched calls.
+    """
+
+    def __init__(self, sqs, queue_url, timeout, interval=None):
+        self.sqs = sqs
+        self.queue_url = queue_url
+        self.timeout = timeout
+        self.interval = interval or timeout / 2
+        self._receipts = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def track(self, messages):
+        with self._lock:
+            for message in messages:
+                self._receipts[message["MessageId"]] = message["ReceiptHandle"]
+
+    def release(self, messages):
+        with self._lock:
+            for message in messages:
+                self._receipts.pop(message["MessageId"], None)
+
+    def beat(self):
+        """
+        Extends the visibility timeout of every tracked message once.
+        """
+        with self._lock:
+            entries = [
+                {"Id": message_id, "ReceiptHandle": receipt, "VisibilityTimeout": self.timeout}
+                for message_id, receipt in self._receipts.items()
+            ]
+        if entries:
+            failed = change_message_visibility_batch(self.sqs, self.queue_url, entries)
+            for message_id, message in failed.items():
+                print(f"Error extending visibility of message {message_id}: {message}")
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="visibility-heartbeat", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.beat()
+            except Exception as e:
+                print(f"Error extending visibility: {e}")
+
+
+class QueueConsumer:
+    """
+    Consumes a work-order queue with `handler(work_order)`.
+
+    Messages are received 10 at a time with long polling and handled on a
+    pool of `workers` threads. On FIFO queues the messages of a
+    MessageGroupId are handled one after the other, and a failure stops its
+    group so later messages do not overtake it; different groups run in
+    parallel. Handled messages are deleted with DeleteMessageBatch; failed
+    ones become visible again when their timeout expires and are retried or
+    sent to the queue's dead-letter queue.
+    """
+
+    def __init__(self, sqs, queue_url, handler, workers=None, visibility_timeout=None,
+                 wait_time_seconds=WAIT_TIME_SECONDS, decode=decode_work_order, fifo=None):
+        self.sqs = sqs
+        self.queue_url = queue_url
+        self.handler = handler
+        self.workers = workers or DEFAULT_WORKERS
+        self.visibility_timeout = visibility_timeout or DEFAULT_VISIBILITY_TIMEOUT
+        self.wait_time_seconds = wait_time_seconds
+        self.decode = decode
+        self.fifo = queue_url.endswith(".fifo") if fifo is None else fifo
+        self.heartbeat = VisibilityHeartbeat(sqs, queue_url, self.visibility_timeout)
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="consumer")
+        self.handled = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def receive(self):
+        result = self.sqs.receive_message(
+            QueueUrl=self.queue_url,
+            MaxNumberOfMessages=RECEIVE_BATCH_SIZE,
+            WaitTimeSeconds=self.wait_time_seconds,
+            VisibilityTimeout=self.visibility_timeout,
+            AttributeNames=["MessageGroupId"]
+        )
+        return result.get("Messages", [])
+
+    def group_key(self, message):
+        if self.fifo:
+            return message.get("Attributes", {}).get("MessageGroupId", message["MessageId"])
+        return message["MessageId"]
+
+    def process(self, messages):
+        """
+        Handles a received batch on the worker pool and deletes the handled messages.
+        Returns the number of handled messages.
+        """
+        self.heartbeat.track(messages)
+        futures = [
+            self.executor.submit(self._handle_group, group)
+            for group in ordered_groups(messages, self.group_key)
+        ]
+        handled = []
+        for future in futures:
+            handled.extend(future.result())
+
+        self.acknowledge(handled)
+        self.heartbeat.release(messages)
+        with self._lock:
+            self.handled += len(handled)
+            self.failed += len(messages) - len(handled)
+        return len(handled)
+
+    def _handle_group(self, messages):
+        handled = []
+        for message in messages:
+            try:
+                self.handler(self.decode(message["Body"]))
+            except Exception as e:
+                print(f"Error handling message {message['MessageId']}: {e}")
+                break
+            handled.append(message)
+        return handled
+
+    def acknowledge(self, messages):
+        """
+        Deletes handled messages in batches of 10.
+        """
+        if not messages:
+            return
+        entries = [{"Id": message["MessageId"], "ReceiptHandle": message["ReceiptHandle"]} for message in messages]
+        failed = delete_message_batch(self.sqs, self.queue_url, entries)
+        for message_id, message in failed.items():
+            print(f"Error deleting message {message_id}: {message}")
+
+    def poll(self, stop):
+        """
+        Receives and processes batches until `stop` is set.
+        """
+        while not stop.is_set():
+            try:
+                messages = self.receive()
+            except Exception as e:
+                print(f"Error receiving from {self.queue_url}: {e}")
+                stop.wait(1)
+                continue
+            if messages:
+                self.process(messages)
+
+    def run(self, stop=None, pollers=None):
+        """
+        Consumes the queue until `stop` is set. Each poller keeps one batch in
+        flight; by default there are enough pollers to keep every worker busy.
+        """
+        stop = stop or threading.Event()
+        pollers = pollers or max(1, -(-self.workers // RECEIVE_BATCH_SIZE))
+        threads = [
+            threading.Thread(target=self.poll, args=(stop,), name=f"poller-{index}")
+            for index in range(pollers)
+        ]
+        self.heartbeat.start()
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            # On an interrupt the pollers finish their current batch first
+            stop.set()
+            for thread in threads:
+                if thread.is_alive():
+                    thread.join()
+            self.heartbeat.stop()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+def sqs_batch_handler(handler, decode=decode_work_order):
+    """
+    Adapts `handler(work_order)` to a Lambda SQS trigger configured with
+    ReportBatchItemFailures. Failed messages are reported in batchItemFailures;
+    on FIFO queues the later messages of a failed group are reported too, so
+    they are retried after it and keep their order.
+    """
+    def lambda_handler(event, context):
+        failures = []
+        failed_groups = set()
+        for record in event["Records"]:
+            group_id = record.get("attributes", {}).get("MessageGroupId")
+            if group_id is not None and group_id in failed_groups:
+                failures.append({"itemIdentifier": record["messageId"]})
+                continue
+            try:
+                handler(decode(record["body"]))
+            except Exception as e:
+                print(f"Error handling message {record['messageId']}: {e}")
+                failures.append({"itemIdentifier": record["messageId"]})
+                if group_id is not None:
+                    failed_groups.add(group_id)
+        return {"batchItemFailures": failures}
+
+    return lambda_handler
+
+
+def log_work_order(work_order):
+    print(f"{work_order['id']} {work_order['status']}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consume a work-orders queue.")
+    parser.add_argument("--queue-url", required=True, help="SQS queue URL")
+    parser.add_argument("--region", help="AWS region")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Messages handled concurrently")
+    parser.add_argument("--pollers", type=int, help="Concurrent ReceiveMessage loops")
+    parser.add_argument("--visibility-timeout", type=int, default=DEFAULT_VISIBILITY_TIMEOUT)
+    args = parser.parse_args(argv)
+
+    import boto3
+
+    from work_orders.clients import client_config
+
+    sqs = boto3.client("sqs", region_name=args.region, config=client_config())
+    consumer = QueueConsumer(sqs, args.queue_url, log_work_order, workers=args.workers,
+                             visibility_timeout=args.visibility_timeout)
+    started = time.monotonic()
+    try:
+        consumer.run(pollers=args.pollers)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        consumer.close()
+
+    elapsed = time.monotonic() - started
+    print(f"Handled {consumer.handled} messages ({consumer.failed} failed) in {elapsed:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,430 @@
+import datetime
+import uuid
+
+from work_orders.batch import BatchError, batch_write_items, create_batch, parse_batch
+from work_orders.compression import compress_response, request_body
+from work_orders.conditional import (
+    META_TABLE, content_etag, if_none_match, not_modified, page_etag, read_watermark, touch_watermark, with_etag
+)
+from work_orders.delivery_index import is_open_range, parse_due_filter, query_by_delivery_date, with_delivery_bucket
+from work_orders.dispatch import hand_off, mark_unpublished, store_and_publish, uses_outbox
+from work_orders.lookup import batch_get_work_orders, get_work_order, parse_ids, public_attributes
+from work_orders.metrics import count, phase, timed
+from work_orders.ndjson import NDJSON_CONTENT_TYPE, iter_pages, ndjson_chunk, parse_format
+from work_orders.outbox import outbox_entry, relay, store_batch_with_outbox, store_with_outbox
+from work_orders.pagination import MAX_PAGE_SIZE, PaginationError, encode_next_token, parse_page_params, scan_page
+from work_orders.serialization import dumps, dumps_with, loads
+from work_orders.stats import DAY_PATTERN, read_stats
+from work_orders.status_index import parse_status_filter, query_by_status, with_status_shard
+from work_orders.validation import VALID_STATUSES, WorkOrderValidator
+
+# API Gateway resources of the batch and stats endpoints
+BATCH_RESOURCE = "/work-orders/batch"
+STATS_RESOURCE = "/work-orders/stats"
+
+# Built once per process and shared by every request
+validate_work_order = WorkOrderValidator(VALID_STATUSES)
+
+
+class WorkOrderService:
+    """
+    Work-order API shared by every solution: validation, persistence, listing
+    and responses. Solutions only differ in the publisher they plug in.
+    """
+
+    def __init__(self, dynamodb, table_name, publisher, meta_table=None):
+        self.dynamodb = dynamodb
+        self.table_name = table_name
+        self.publisher = publisher
+        self.meta_table = meta_table or META_TABLE
+
+    def handle(self, event):
+        """
+        Routes an API Gateway request based on its HTTP method.
+        """
+        method = event["httpMethod"]
+
+        if method == "POST" and event.get("resource") == BATCH_RESOURCE:
+            return self.create_work_orders_batch(event)
+        elif method == "POST":
+            return self.create_work_order(event)
+        elif method == "GET" and event.get("resource") == STATS_RESOURCE:
+            return self.get_stats(event)
+        elif method == "GET" and (event.get("pathParameters") or {}).get("id"):
+            return self.get_work_order(event)
+        elif method == "GET":
+            return self.list_work_orders(event)
+        else:
+            return response(405, {"message": "Method Not Allowed"})
+
+    def create_work_order(self, event):
+        """
+        Handles POST requests to create a new work order.
+        Validates input, stores data in DynamoDB and publishes the work order event.
+        """
+        try:
+            with phase("parse"):
+                body = loads(request_body(event))
+
+            with phase("validate"):
+                error = validate_work_order(body)
+            if error:
+                return response(400, error)
+
+            work_order = build_work_order(body)
+            # Serialized once, for the event and for the response
+            with phase("serialize"):
+                payload = dumps(work_order)
+
+            table = self.dynamodb.Table(self.table_name)
+            if not self.publisher.enabled:
+                with phase("dynamodb"):
+                    table.put_item(Item=stored_item(work_order))
+            else:
+                publisher = self.publisher
+                store_and_publish(
+                    store=timed("dynamodb", lambda: table.put_item(Item=stored_item(work_order))),
+                    publish=timed("publish", lambda: publisher.publish(work_order, body=payload)),
+                    on_unpublished=lambda: mark_unpublished(self.dynamodb, self.table_name, work_order),
+                    compensate=lambda: publisher.publish_voided(work_order),
+                    outbox=timed("dynamodb", lambda: store_with_outbox(
+                        self.dynamodb, self.table_name, stored_item(work_order), outbox_entry(work_order)
+                    ))
+                )
+            invalidated = self.touch_watermark()
+
+            with phase("serialize"):
+                return cache_invalidation(
+                    response(201, dumps_with({"message": "Resource created successfully"}, "data", payload)),
+                    invalidated
+                )
+
+        except Exception as e:
+            return response(500, {"message": str(e)})
+
+    def create_work_orders_batch(self, event):
+        """
+        Handles POST /work-orders/batch requests to create many work orders at once.
+        Stores them with batched writes and publishes them with the batched publish API.
+        Reports one result per submitted work order.
+        """
+        try:
+            with phase("parse"):
+                payloads = parse_batch(loads(request_body(event)))
+            count("workOrders", len(payloads))
+
+            if not self.publisher.enabled:
+                store, publish = self.store_work_orders, None
+            elif uses_outbox():
+                store, publish = self.store_work_orders_with_outbox, None
+            else:
+                store, publish = self.store_work_orders, timed("publish", self.publish_work_orders)
+
+            results, all_created = create_batch(
+                payloads,
+                validate=timed("validate", validate_work_order),
+                build=build_work_order,
+                store=timed("dynamodb", store),
+                publish=publish
+            )
+            invalidated = True
+            if any(result["statusCode"] == 201 for result in results):
+                invalidated = self.touch_watermark()
+
+            with phase("serialize"):
+                return cache_invalidation(response(201 if all_created else 207, {
+                    "message": "Batch processed",
+                    "data": {"results": results}
+                }), invalidated)
+
+        except BatchError as e:
+            return response(400, {"message": str(e)})
+        except Exception as e:
+            return response(500, {"message": str(e)})
+
+    def store_work_orders(self, work_orders):
+        """
+        Stores work orders with chunked BatchWriteItem calls.
+        Returns a dict mapping the ids that could not be written to an error message.
+        """
+        return batch_write_items(
+            self.dynamodb, self.table_name, [stored_item(work_order) for work_order in work_orders]
+        )
+
+    def publish_work_orders(self, work_orders):
+        """
+        Publishes stored work orders with the batched publish API and hands the
+        events that failed to the outbox relay, as create_work_order does.
+        Returns a dict mapping the ids that could not be published to an error message.
+        """
+        failed = self.publisher.publish_batch(work_orders)
+        for work_order in work_orders:
+            if work_order["id"] in failed:
+                hand_off(lambda: mark_unpublished(self.dynamodb, self.table_name, work_order))
+        return failed
+
+    def store_work_orders_with_outbox(self, work_orders):
+        """
+        Stores work orders together with their pending events, in transactions of 50 orders.
+        Returns a dict mapping the ids that could not be written to an error message.
+        """
+        return store_batch_with_outbox(
+            self.dynamodb, self.table_name,
+            [stored_item(work_order) for work_order in work_orders],
+            [outbox_entry(work_order) for work_order in work_orders]
+        )
+
+    def list_work_orders(self, event):
+        """
+        Handles GET requests to list work orders, one page at a time.
+        Supports the 'limit' and 'nextToken' query parameters, a 'status'
+        filter (with optional 'since'/'until') served by the status index, and
+        'dueAfter'/'dueBefore' filters served by the delivery index (or, when
+        one bound is missing, by the status index).
+        Large pages are compressed when the client sends Accept-Encoding.
+        With 'format=ndjson' the work orders are exported as NDJSON instead,
+        and with 'ids=a,b,c' only those work orders are returned.
+
+        Pages carry an ETag. With a watermark table it is derived from the
+        watermark version, so an If-None-Match that still matches is answered
+        with a 304 without reading the work orders table.
+        """
+        try:
+            params = event.get("queryStringParameters")
+            if params and params.get("ids") is not None:
+                return self.get_work_orders(event, parse_ids(params["ids"]))
+            with phase("parse"):
+                limit, start_key = parse_page_params(params)
+                status_filter = parse_status_filter(params, VALID_STATUSES)
+                due_filter = parse_due_filter(params)
+                if due_filter and status_filter and (status_filter["since"] or status_filter["until"]):
+                    raise PaginationError("The 'since' and 'until' filters cannot be combined with due date filters.")
+                if due_filter and not status_filter and is_open_range(due_filter):
+                    raise PaginationError("A due date filter requires both 'dueAfter' and 'dueBefore', or 'status'.")
+                export = parse_format(params) == "ndjson"
+
+            version = self.watermark()
+            etag = page_etag(version, params) if version is not None else None
+            if etag and if_none_match(event.get("headers"), etag):
+                return not_modified(etag)
+
+            table = self.dynamodb.Table(self.table_name)
+            if export:
+                return self.export_work_orders(event, table, start_key, status_filter, etag, due_filter)
+            with phase("dynamodb"):
+                items, next_key = read_page(table, limit, start_key, status_filter, due_filter)
+            count("items", len(items))
+
+            with phase("serialize"):
+                result = response(200, {
+                    "data": {
+                        "items": items,
+                        "total": len(items),
+                        "nextToken": encode_next_token(next_key)
+                    }
+                })
+            return self.conditional_response(event, result, etag)
+
+        except PaginationError as e:
+            return response(400, {"message": str(e)})
+        except Exception as e:
+            return response(500, {"message": str(e)})
+
+    def get_work_order(self, event):
+        """
+        Handles GET /work-orders/{id} requests with a GetItem, served from the
+        warm-invocation cache when possible. X-Cache tells whether it was a hit.
+        """
+        try:
+            work_order_id = event["pathParameters"]["id"]
+            with phase("dynamodb"):
+                item, cache_hit = get_work_order(self.dynamodb.Table(self.table_name), work_order_id)
+            if item is None:
+                return response(404, {"message": f"Work order not found: {work_order_id}"})
+
+            result = self.conditional_response(event, response(200, {"data": item}))
+            result["headers"]["X-Cache"] = "Hit" if cache_hit else "Miss"
+            return result
+
+        except Exception as e:
+            return response(500, {"message": str(e)})
+
+    def get_work_orders(self, event, ids):
+        """
+        Returns the requested work orders, in the requested order, read with
+        chunked BatchGetItem calls. Ids that do not exist are listed in
+        'missingIds'; ids DynamoDB kept unprocessed after the retries are
+        listed in 'unprocessedIds' so the client can ask for them again.
+        """
+        with phase("dynamodb"):
+            found, unprocessed = batch_get_work_orders(self.dynamodb, self.table_name, ids)
+        pending = set(unprocessed)
+        items = [found[work_order_id] for work_order_id in ids if work_order_id in found]
+        missing = [work_order_id for work_order_id in ids if work_order_id not in found and work_order_id not in pending]
+
+        return self.conditional_response(event, response(200, {
+            "data": {
+                "items": items,
+                "total": len(items),
+                "missingIds": missing,
+                "unprocessedIds": unprocessed
+            }
+        }))
+
+    def get_stats(self, event):
+        """
+        Handles GET /work-orders/stats: work order counts per status, read with
+        a single GetItem from the counters the stream processor maintains.
+        'deliveryDate=YYYY-MM-DD' returns the counts of that delivery day.
+        """
+        try:
+            if not self.meta_table:
+                return response(404, {"message": "Statistics are not available."})
+            day = (event.get("queryStringParameters") or {}).get("deliveryDate")
+            if day is not None and not DAY_PATTERN.match(day):
+                return response(400, {"message": "'deliveryDate' must be a date in YYYY-MM-DD format."})
+
+            with phase("dynamodb"):
+                stats = read_stats(self.dynamodb.Table(self.meta_table), VALID_STATUSES, day)
+            return self.conditional_response(event, response(200, {"data": stats}))
+
+        except Exception as e:
+            return response(500, {"message": str(e)})
+
+    def export_work_orders(self, event, table, start_key, status_filter, etag=None, due_filter=None):
+        """
+        Exports work orders as newline-delimited JSON, reading full pages from
+        DynamoDB one at a time. Each response carries a bounded chunk; the
+        X-Next-Token header continues the export until it is absent.
+        """
+        def fetch(cursor):
+            with phase("dynamodb"):
+                return read_page(table, MAX_PAGE_SIZE, cursor, status_filter, due_filter)
+
+        body, next_key = ndjson_chunk(iter_pages(fetch, start_key))
+
+        headers = {"Content-Type": NDJSON_CONTENT_TYPE}
+        if next_key:
+            headers["X-Next-Token"] = encode_next_token(next_key)
+        return self.conditional_response(event, {"statusCode": 200, "headers": headers, "body": body}, etag)
+
+    def conditional_response(self, event, result, etag=None):
+        """
+        Tags a 200 response with an ETag (a hash of its body unless one is given)
+        and Cache-Control. Answers 304 when If-None-Match already matches it;
+        otherwise the body is compressed if the client accepts it.
+        """
+        etag = etag or content_etag(result["body"])
+        if if_none_match(event.get("headers"), etag):
+            return not_modified(etag)
+        with phase("compress"):
+            return compress_response(with_etag(result, etag), event.get("headers"))
+
+    def watermark(self):
+        """
+        Returns the watermark version of the table, or None when there is no
+        watermark table or it cannot be read (pages are then tagged by content).
+        """
+        if not self.meta_table:
+            return None
+        try:
+            with phase("watermark"):
+                return read_watermark(self.dynamodb, self.meta_table)
+        except Exception as e:
+            print(f"Error reading the watermark: {e}")
+            return None
+
+    def touch_watermark(self):
+        """
+        Moves the watermark forward after a write, so cached pages are revalidated.
+        Returns False when it could not be moved: the write is kept, but this
+        process stops issuing watermark ETags until a later bump succeeds.
+        """
+        if not self.meta_table:
+            return True
+        try:
+            with phase("watermark"):
+                touch_watermark(self.dynamodb, self.meta_table)
+            return True
+        except Exception as e:
+            count("watermarkErrors")
+            print(f"Error updating the watermark: {e}")
+            return False
+
+    def relay_outbox(self, event):
+        """
+        Publishes the pending events of an outbox stream batch in batches and
+        reports the ones that failed so Lambda retries them.
+        """
+        return relay(event["Records"], timed("publish", self.publisher.publish_batch))
+
+
+def read_page(table, limit, cursor, status_filter, due_filter):
+    """
+    Reads one page of work orders: from the delivery index when a closed due
+    date range is given (the status, if any, narrows it), from the status
+    index when only a status is given or the due date range is open, and with
+    a scan otherwise. Internal attributes are left out of the items, as in
+    lookups.
+    Returns (items, next_cursor).
+    """
+    if due_filter and not is_open_range(due_filter):
+        status = status_filter["status"] if status_filter else None
+        items, next_cursor = query_by_delivery_date(table, limit, cursor=cursor, status=status, **due_filter)
+    elif status_filter:
+        items, next_cursor = query_by_status(table, limit=limit, cursor=cursor, **status_filter, **(due_filter or {}))
+    else:
+        items, next_cursor = scan_page(table, limit, cursor)
+    return [public_attributes(item) for item in items], next_cursor
+
+
+def cache_invalidation(result, invalidated):
+    """
+    Flags a write response whose watermark bump failed: the data was stored,
+    but list pages cached by clients may not be revalidated until they expire.
+    """
+    if not invalidated:
+        result["headers"]["X-Cache-Invalidation"] = "failed"
+    return result
+
+
+def stored_item(work_order):
+    """
+    Returns the item stored for a work order: the work order plus the
+    attributes its secondary indexes are keyed on.
+    """
+    return with_delivery_bucket(with_status_shard(work_order))
+
+
+def build_work_order(body):
+    """
+    Builds a new work order item from a validated payload.
+    """
+    # Generate unique ID
+    work_order_id = str(uuid.uuid4())
+    created_at = datetime.datetime.utcnow().isoformat()
+
+    # Create work order item
+    work_order = {
+        "id": work_order_id,
+        "createdAt": created_at,
+        "description": body["description"],
+        "deliveryDate": body["deliveryDate"],
+        "status": body["status"],
+        "cancellationReason": body.get("cancellationReason"),
+        "customerId": body.get("customerId")
+    }
+
+    return work_order
+
+
+def response(status_code, body):
+    """
+    Returns an API Gateway-compatible response.
+    `body` is serialized unless it is already a JSON string.
+    """
+    return {
+        "statusCode": status_code,
+        "headers": {"Content-Type": "application/json"},
+        "body": body if isinstance(body, str) else dumps(body)
+    }
@@ -0,0 +1,349 @@
+"""
+Incremental datamart export: work order changes from the DynamoDB stream are
+written as compressed columnar files (Parquet or Arrow IPC), partitioned by
+status and change date, so analytics never reads the OLTP table.
+
+    <prefix>/status=<status>/date=<YYYY-MM-DD>/part-<sequence>-<digest>.parquet
+
+Small files are periodically merged into one per partition by `compact`.
+"""
+import datetime
+import hashlib
+import os
+import time
+import uuid
+
+from work_orders.pagination import estimate_size
+from work_orders.stream_image import deserialize_image
+
+# pyarrow is optional: only the datamart functions ship it in their layer
+try:
+    import pyarrow
+    import pyarrow.compute
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Where the files go: s3://bucket/prefix or a local directory
+DATAMART_URI = os.getenv("DATAMART_URI")
+DATAMART_FORMAT = os.getenv("DATAMART_FORMAT", "parquet")
+DATAMART_COMPRESSION = os.getenv("DATAMART_COMPRESSION", "zstd")
+
+# Micro-batch limits: a file is written when any of them is reached
+DATAMART_MAX_ROWS = int(os.getenv("DATAMART_MAX_ROWS", "10000"))
+DATAMART_MAX_BYTES = int(os.getenv("DATAMART_MAX_BYTES", str(16 * 1024 * 1024)))
+DATAMART_MAX_SECONDS = float(os.getenv("DATAMART_MAX_SECONDS", "60"))
+
+# A partition is compacted once it has this many small files
+DATAMART_COMPACT_MIN_FILES = int(os.getenv("DATAMART_COMPACT_MIN_FILES", "8"))
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# Stream sequence numbers are decimal strings of varying length (and can
+# exceed 64 bits), so they are zero-padded to this width to sort numerically
+SEQUENCE_NUMBER_WIDTH = 40
+COMPACTED_PREFIX = "compacted-"
+
+# Attributes of the work order, then the change metadata
+WORK_ORDER_COLUMNS = ("id", "createdAt", "description", "deliveryDate", "status", "cancellationReason", "customerId")
+COLUMNS = WORK_ORDER_COLUMNS + ("previousStatus", "eventName", "sequenceNumber", "changedAt")
+
+
+def require_pyarrow():
+    if pyarrow is None:
+        raise RuntimeError("pyarrow is required to write datamart files.")
+
+
+def schema():
+    require_pyarrow()
+    fields = [(name, pyarrow.string()) for name in COLUMNS[:-1]]
+    fields.append(("changedAt", pyarrow.timestamp("s", tz="UTC")))
+    return pyarrow.schema(fields)
+
+
+def change_row(record):
+    """
+    Turns a stream record into a datamart row: the work order as it is after
+    the change (before it, for REMOVEs) plus the change metadata.
+    Returns None for records without an image.
+    """
+    stream = record["dynamodb"]
+    image = stream.get("OldImage") if record["eventName"] == "REMOVE" else stream.get("NewImage")
+    if not image:
+        return None
+    work_order = deserialize_image(image)
+    old_status = stream.get("OldImage", {}).get("status", {}).get("S")
+    changed_at = stream.get("ApproximateCreationDateTime") or time.time()
+
+    row = {name: work_order.get(name) for name in WORK_ORDER_COLUMNS}
+    row.update({
+        "previousStatus": old_status if record["eventName"] == "MODIFY" else None,
+        "eventName": record["eventName"],
+        "sequenceNumber": stream.get("SequenceNumber"),
+        "eventId": record.get("eventID"),
+        "changedAt": datetime.datetime.fromtimestamp(int(float(changed_at)), tz=datetime.timezone.utc),
+    })
+    return row
+
+
+def partition(row):
+    """
+    Returns the partition path of a row: status and change date.
+    """
+    return f"status={row['status'] or 'unknown'}/date={row['changedAt'].date().isoformat()}"
+
+
+class LocalStore:
+    """
+    Stores datamart files in a local directory; used for tests and development.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def put(self, key, data):
+        path = os.path.join(self.root, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Written aside and renamed, so readers never see a partial file
+        temporary = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temporary, "wb") as output:
+            output.write(data)
+        os.replace(temporary, path)
+
+    def get(self, key):
+        with open(os.path.join(self.root, key), "rb") as source:
+            return source.read()
+
+    def list(self, prefix=""):
+        base = os.path.join(self.root, prefix)
+        keys = []
+        for directory, _, files in os.walk(base):
+            for name in files:
+                if not name.endswith(".tmp"):
+                    keys.append(os.path.relpath(os.path.join(directory, name), self.root).replace(os.sep, "/"))
+        return sorted(keys)
+
+    def delete(self, keys):
+        for key in keys:
+            os.remove(os.path.join(self.root, key))
+
+
+class S3Store:
+    """
+    Stores datamart files in an S3 (or S3-compatible) bucket under `prefix`.
+    """
+
+    def __init__(self, s3, bucket, prefix=""):
+        self.s3 = s3
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+
+    def _key(self, key):
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def put(self, key, data):
+        self.s3.put_object(Bucket=self.bucket, Key=self._key(key), Body=data)
+
+    def get(self, key):
+        return self.s3.get_object(Bucket=self.bucket, Key=self._key(key))["Body"].read()
+
+    def list(self, prefix=""):
+        keys = []
+        kwargs = {"Bucket": self.bucket, "Prefix": self._key(prefix)}
+        while True:
+            result = self.s3.list_objects_v2(**kwargs)
+            for entry in result.get("Contents", []):
+                keys.append(entry["Key"][len(self.prefix) + 1:] if self.prefix else entry["Key"])
+            if not result.get("IsTruncated"):
+                return sorted(keys)
+            kwargs["ContinuationToken"] = result["NextContinuationToken"]
+
+    def delete(self, keys):
+        # DeleteObjects accepts up to 1000 keys per request
+        for start in range(0, len(keys), 1000):
+            self.s3.delete_objects(Bucket=self.bucket, Delete={
+                "Objects": [{"Key": self._key(key)} for key in keys[start:start + 1000]],
+                "Quiet": True,
+            })
+
+
+def make_store(uri=None, s3=None):
+    """
+    Builds the store for a datamart URI: s3://bucket/prefix or a local path.
+    """
+    uri = uri or DATAMART_URI
+    if not uri:
+        raise ValueError("DATAMART_URI is not configured.")
+    if uri.startswith("s3://"):
+        from work_orders.clients import lazy_client
+
+        bucket, _, prefix = uri[len("s3://"):].partition("/")
+        return S3Store(s3 or lazy_client("s3"), bucket, prefix)
+    return LocalStore(uri[len("file://"):] if uri.startswith("file://") else uri)
+
+
+def encode_table(table, file_format=None, compression=None):
+    """
+    Serializes an Arrow table as a compressed Parquet or Arrow IPC file.
+    """
+    file_format = file_format or DATAMART_FORMAT
+    compression = compression or DATAMART_COMPRESSION
+    sink = pyarrow.BufferOutputStream()
+    if file_format == "parquet":
+        pyarrow.parquet.write_table(table, sink, compression=compression)
+    elif file_format == "arrow":
+        options = pyarrow.ipc.IpcWriteOptions(compression=compression)
+        with pyarrow.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+    else:
+        raise ValueError(f"Unknown datamart format: {file_format}")
+    return sink.getvalue().to_pybytes()
+
+
+def decode_table(data, file_format=None):
+    file_format = file_format or DATAMART_FORMAT
+    if file_format == "parquet":
+        return pyarrow.parquet.read_table(pyarrow.BufferReader(data))
+    return pyarrow.ipc.open_file(pyarrow.BufferReader(data)).read_all()
+
+
+def conform(table):
+    """
+    Brings a table written with an older set of columns to the current
+    schema, with nulls in the columns it lacks.
+    """
+    target = schema()
+    columns = [
+        table.column(field.name) if field.name in table.column_names else pyarrow.nulls(table.num_rows, field.type)
+        for field in target
+    ]
+    return pyarrow.Table.from_arrays(columns, schema=target)
+
+
+def write_rows(store, rows, file_format=None, compression=None):
+    """
+    Writes rows as one file per partition and returns the written keys.
+    File names derive from the records they hold, so a retried batch
+    overwrites its own files instead of duplicating them.
+    """
+    require_pyarrow()
+    file_format = file_format or DATAMART_FORMAT
+    by_partition = {}
+    for row in rows:
+        by_partition.setdefault(partition(row), []).append(row)
+
+    keys = []
+    for path, partition_rows in by_partition.items():
+        digest = hashlib.blake2b(
+            "".join(str(row["eventId"] or row["sequenceNumber"]) for row in partition_rows).encode("utf-8"),
+            digest_size=8
+        ).hexdigest()
+        key = f"{path}/part-{partition_rows[0]['sequenceNumber']}-{digest}{FORMATS[file_format]}"
+        table = pyarrow.Table.from_pylist(
+            [{name: row[name] for name in COLUMNS} for row in partition_rows], schema=schema()
+        )
+        store.put(key, encode_table(table, file_format, compression))
+        keys.append(key)
+    return keys
+
+
+class MicroBatcher:
+    """
+    Buffers rows and hands them to `flush(rows)` once `max_rows`, `max_bytes`
+    or `max_seconds` (since the first buffered row) is reached.
+    """
+
+    def __init__(self, flush, max_rows=None, max_bytes=None, max_seconds=None, clock=time.monotonic):
+        self._flush = flush
+        self.max_rows = max_rows or DATAMART_MAX_ROWS
+        self.max_bytes = max_bytes or DATAMART_MAX_BYTES
+        self.max_seconds = DATAMART_MAX_SECONDS if max_seconds is None else max_seconds
+        self.clock = clock
+        self.rows = []
+        self.size = 0
+        self.started = None
+
+    def add(self, row):
+        if not self.rows:
+            self.started = self.clock()
+        self.rows.append(row)
+        self.size += estimate_size(row)
+        if (len(self.rows) >= self.max_rows or self.size >= self.max_bytes
+                or self.clock() - self.started >= self.max_seconds):
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            rows, self.rows, self.size = self.rows, [], 0
+            self._flush(rows)
+
+
+def export_records(records, store, file_format=None, max_rows=None, max_bytes=None):
+    """
+    Writes the changes of a stream batch to the datamart.
+    Returns the written keys.
+    """
+    keys = []
+    batcher = MicroBatcher(
+        lambda rows: keys.extend(write_rows(store, rows, file_format)),
+        max_rows=max_rows, max_bytes=max_bytes, max_seconds=float("inf")
+    )
+    for record in records:
+        if record["eventName"] not in ("INSERT", "MODIFY", "REMOVE"):
+            continue
+        row = change_row(record)
+        if row is not None:
+            batcher.add(row)
+    batcher.flush()
+    return keys
+
+
+def compact(store, prefix, file_format=None, min_files=None, now=time.time):
+    """
+    Merges the small files of one partition into a single file sorted by
+    change time. The merged file is written before the inputs are deleted,
+    so a reader may briefly see both but never misses a change.
+    Returns the key of the merged file, or None if there was nothing to do.
+    """
+    require_pyarrow()
+    file_format = file_format or DATAMART_FORMAT
+    min_files = min_files or DATAMART_COMPACT_MIN_FILES
+    extension = FORMATS[file_format]
+    keys = [
+        key for key in store.list(prefix)
+        if key.endswith(extension) and not key.rsplit("/", 1)[-1].startswith(COMPACTED_PREFIX)
+    ]
+    if len(keys) < min_files:
+        return None
+
+    tables = [conform(decode_table(store.get(key), file_format)) for key in keys]
+    merged = pyarrow.concat_tables(tables)
+    sequence = pyarrow.compute.utf8_lpad(merged.column("sequenceNumber"), width=SEQUENCE_NUMBER_WIDTH, padding="0")
+    order = merged.append_column("_sequence", sequence).sort_by(
+        [("changedAt", "ascending"), ("_sequence", "ascending")]
+    )
+    merged = order.drop_columns(["_sequence"])
+    key = f"{prefix.rstrip('/')}/{COMPACTED_PREFIX}{int(now())}-{uuid.uuid4().hex[:8]}{extension}"
+    store.put(key, encode_table(merged, file_format))
+    store.delete(keys)
+    return key
+
+
+def partitions(store):
+    """
+    Lists the partition paths that hold files.
+    """
+    return sorted({key.rsplit("/", 1)[0] for key in store.list() if "/" in key})
+
+
+def compact_all(store, file_format=None, min_files=None):
+    """
+    Compacts every partition with enough small files. Returns the merged keys.
+    """
+    merged = []
+    for path in partitions(store):
+        key = compact(store, path, file_format, min_files)
+        if key:
+            merged.append(key)
+    return merged
@@ -0,0 +1,176 @@
+import datetime
+import os
+import zlib
+
+from work_orders.pagination import KEY_ATTRIBUTES, PaginationError
+from work_orders.partitions import PARTITION_QUERY_WORKERS, query_partitions
+
+# Global secondary index on (deliveryBucket, deliveryDate)
+DELIVERY_INDEX_NAME = "DeliveryDateIndex"
+DELIVERY_BUCKET_ATTRIBUTE = "deliveryBucket"
+DELIVERY_DATE_ATTRIBUTE = "deliveryDate"
+
+# Every delivery day is spread over this many partitions, like the status
+# index. Changing it requires re-bucketing existing items.
+DELIVERY_SHARD_COUNT = int(os.getenv("DELIVERY_SHARD_COUNT", "4"))
+
+# Longest dueAfter..dueBefore range served by the delivery index
+DUE_RANGE_MAX_DAYS = int(os.getenv("DUE_RANGE_MAX_DAYS", "31"))
+
+DELIVERY_INDEX_KEY_ATTRIBUTES = KEY_ATTRIBUTES + (DELIVERY_BUCKET_ATTRIBUTE, DELIVERY_DATE_ATTRIBUTE)
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def delivery_bucket(delivery_date, work_order_id, shard_count=None):
+    """
+    Returns the day-bucket partition value for a work order, e.g. '2025-02-20#1'.
+    """
+    shard_count = shard_count or DELIVERY_SHARD_COUNT
+    shard = zlib.crc32(work_order_id.encode("utf-8")) % shard_count
+    return f"{delivery_date[:10]}#{shard}"
+
+
+def with_delivery_bucket(work_order, shard_count=None):
+    """
+    Returns a copy of the work order including the delivery index attribute.
+    """
+    return {
+        **work_order,
+        DELIVERY_BUCKET_ATTRIBUTE: delivery_bucket(work_order["deliveryDate"], work_order["id"], shard_count),
+    }
+
+
+def parse_due_filter(params, max_days=None):
+    """
+    Reads the 'dueAfter' and 'dueBefore' query parameters (inclusive bounds on
+    deliveryDate). A closed range cannot exceed `max_days`; an open range
+    leaves the missing bound as None and is not limited (see is_open_range).
+    Returns None when no due filter was requested.
+    """
+    params = params or {}
+    due_after = _due_bound("dueAfter", params.get("dueAfter"))
+    due_before = _due_bound("dueBefore", params.get("dueBefore"))
+    if due_after is None and due_before is None:
+        return None
+
+    if due_after is not None and due_before is not None:
+        span = datetime.timedelta(days=max_days or DUE_RANGE_MAX_DAYS)
+        if due_after > due_before:
+            raise PaginationError("'dueAfter' must not be later than 'dueBefore'.")
+        if due_before - due_after > span:
+            raise PaginationError(f"The due date range cannot exceed {span.days} days.")
+
+    return {
+        "due_after": due_after.strftime(DATE_FORMAT) if due_after else None,
+        "due_before": due_before.strftime(DATE_FORMAT) if due_before else None,
+    }
+
+
+def is_open_range(due_filter):
+    """
+    Tells whether a parsed due filter lacks one of its bounds. Open ranges
+    cannot be served by day buckets, so they are read from the status index
+    with deliveryDate as a filter, and require a status.
+    """
+    return due_filter["due_after"] is None or due_filter["due_before"] is None
+
+
+def _due_bound(name, value):
+    if value is None:
+        return None
+    try:
+        return datetime.datetime.strptime(value, DATE_FORMAT)
+    except ValueError:
+        raise PaginationError(f"'{name}' must be in ISO 8601 format (YYYY-MM-DDTHH:MM:SSZ).")
+
+
+def bucket_days(due_after, due_before):
+    """
+    Lists the day buckets (YYYY-MM-DD) between two bounds, both included.
+    """
+    day = datetime.date.fromisoformat(due_after[:10])
+    last = datetime.date.fromisoformat(due_before[:10])
+    days = []
+    while day <= last:
+        days.append(day.isoformat())
+        day += datetime.timedelta(days=1)
+    return days
+
+
+def query_by_delivery_date(table, limit, due_after, due_before, cursor=None, status=None,
+                           shard_count=None, max_workers=None):
+    """
+    Lists work orders due between two dates, soonest first, using Query on the
+    delivery index instead of a full table scan. Only the day buckets in range
+    are read: a window of days is queried in parallel (all their shards) and
+    merged; later windows are read only if the page is not full yet, each
+    twice as wide as the previous one.
+    `status` narrows the results with a filter expression.
+
+    Every day costs `shard_count` queries whether or not it has orders, so a
+    page over a sparse range costs up to days x shard_count queries (124 for
+    31 days with the default 4 shards); widening the windows bounds the
+    sequential round trips to about log2 of the number of windows.
+    The cursor names the window to resume and its partition cursors, or
+    None for partitions when the next page starts a fresh window.
+    Returns (items, next_cursor).
+    """
+    shard_count = shard_count or DELIVERY_SHARD_COUNT
+    window_days = max(1, (max_workers or PARTITION_QUERY_WORKERS) // shard_count)
+    days = bucket_days(due_after, due_before)
+
+    start, partition_cursor = 0, None
+    if cursor is not None:
+        window = cursor.get("window")
+        partitions = cursor.get("partitions")
+        if (not (partitions is None or isinstance(partitions, dict)) or not isinstance(window, list)
+                or len(window) != 2 or window[0] not in days or window[1] not in days):
+            raise PaginationError("Invalid 'nextToken'.")
+        start, partition_cursor = days.index(window[0]), cursor["partitions"]
+
+    condition = "#bucket = :bucket AND #deliveryDate BETWEEN :dueAfter AND :dueBefore"
+    names = {"#bucket": DELIVERY_BUCKET_ATTRIBUTE, "#deliveryDate": DELIVERY_DATE_ATTRIBUTE}
+    values = {":dueAfter": due_after, ":dueBefore": due_before}
+    filters = {}
+    if status:
+        names["#status"] = "status"
+        values[":status"] = status
+        filters["FilterExpression"] = "#status = :status"
+
+    def build_query(partition):
+        return {
+            "IndexName": DELIVERY_INDEX_NAME,
+            "KeyConditionExpression": condition,
+            "ExpressionAttributeNames": names,
+            "ExpressionAttributeValues": {":bucket": partition, **values},
+            "ScanIndexForward": True,
+            **filters,
+        }
+
+    items = []
+    while start < len(days) and len(items) < limit:
+        if partition_cursor is not None:
+            end = days.index(cursor["window"][1]) + 1
+        else:
+            end = min(start + window_days, len(days))
+            window_days *= 2
+        window = days[start:end]
+        partitions = [f"{day}#{shard}" for day in window for shard in range(shard_count)]
+
+        page, next_partitions = query_partitions(
+            table, partitions, build_query,
+            sort_key=DELIVERY_DATE_ATTRIBUTE,
+            key_attributes=DELIVERY_INDEX_KEY_ATTRIBUTES,
+            limit=limit - len(items),
+            cursor=partition_cursor,
+        )
+        items.extend(page)
+        if next_partitions:
+            return items, {"window": [window[0], window[-1]], "partitions": next_partitions}
+        start, partition_cursor = end, None
+
+    if start < len(days):
+        # The page filled up exactly at a window boundary: later days remain
+        return items, {"window": [days[start], days[start]], "partitions": None}
+    return items, None
@@ -0,0 +1,130 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from work_orders.metrics import count
+from work_orders.outbox import OUTBOX_TABLE, outbox_entry
+from work_orders.stream_image import serialize_item
+
+# How create_work_order stores and publishes a work order:
+#   serial     - PutItem, then publish (two round trips in sequence)
+#   concurrent - PutItem and publish at the same time
+#   outbox     - the work order and a pending event are written in one
+#                transaction; a stream-triggered relay publishes the event
+# In serial and concurrent mode a failed publish is handed to the outbox
+# relay (mark_unpublished). Outbox mode is the default when OUTBOX_TABLE is set.
+PUBLISH_MODE_SERIAL = "serial"
+PUBLISH_MODE_CONCURRENT = "concurrent"
+PUBLISH_MODE_OUTBOX = "outbox"
+PUBLISH_MODE = os.getenv("PUBLISH_MODE", PUBLISH_MODE_OUTBOX if OUTBOX_TABLE else PUBLISH_MODE_SERIAL)
+
+# The write is idempotent (same item, same key), so it can be retried safely
+STORE_ATTEMPTS = 2
+
+# Shared across warm invocations
+_executor = ThreadPoolExecutor(max_workers=int(os.getenv("DISPATCH_WORKERS", "4")),
+                               thread_name_prefix="dispatch")
+
+
+def uses_outbox(mode=None):
+    """
+    Tells whether events are published through the outbox relay.
+    """
+    return (mode or PUBLISH_MODE) == PUBLISH_MODE_OUTBOX
+
+
+def store_and_publish(store, publish, on_unpublished=None, compensate=None, outbox=None, mode=None,
+                      store_attempts=STORE_ATTEMPTS):
+    """
+    Stores a work order and publishes its event.
+
+    `store()` raises on failure; `publish()` returns a falsy value on failure.
+    In serial mode the publish follows the write. In concurrent mode both run
+    at the same time and the outcome is reconciled: if the event went out but
+    the write kept failing, `compensate()` publishes a voiding event before the
+    error is raised. In both, when the write succeeded but the publish failed,
+    `on_unpublished()` hands the event to the outbox relay. The order is
+    already stored at that point, so a failure there is logged and counted as
+    a lost event (the 'lostEvents' metric) instead of failing the request.
+    In outbox mode only `outbox()` runs; it stores the order with its pending event.
+    Returns True when the event was published.
+    """
+    mode = mode or PUBLISH_MODE
+
+    if mode == PUBLISH_MODE_OUTBOX:
+        if outbox is None:
+            raise ValueError("Outbox mode requires an outbox writer.")
+        outbox()
+        return False
+
+    if mode == PUBLISH_MODE_SERIAL:
+        store()
+        if publish():
+            return True
+        hand_off(on_unpublished)
+        return False
+    if mode != PUBLISH_MODE_CONCURRENT:
+        raise ValueError(f"Unknown publish mode: {mode}")
+
+    published = _executor.submit(publish)
+    try:
+        for attempt in range(store_attempts):
+            try:
+                store()
+                break
+            except Exception:
+                if attempt + 1 == store_attempts:
+                    raise
+    except Exception:
+        if published.result() and compensate:
+            compensate()
+        raise
+
+    if published.result():
+        return True
+    hand_off(on_unpublished)
+    return False
+
+
+def hand_off(on_unpublished):
+    """
+    Runs `on_unpublished()` for an event that was not published, and records
+    the event as lost if that is not possible.
+    """
+    if on_unpublished is None:
+        count("lostEvents")
+        print("Error publishing an event: no outbox relay to hand it to")
+        return
+    try:
+        on_unpublished()
+    except Exception as e:
+        count("lostEvents")
+        print(f"Error scheduling the re-publishing of an unpublished event: {e}")
+
+
+def voided(work_order, reason="Work order could not be stored."):
+    """
+    Builds the compensating event for a work order that was published but not stored.
+    """
+    return {**work_order, "voided": True, "voidReason": reason}
+
+
+def mark_unpublished(dynamodb, table_name, work_order, outbox_table=None):
+    """
+    Hands the event of a stored work order whose publish failed to the outbox
+    relay: in one transaction the order is flagged with publishPending and a
+    pending event is written to the outbox table, whose stream-triggered relay
+    publishes it with retries like any other outbox event.
+    """
+    outbox_table = outbox_table or OUTBOX_TABLE
+    if not outbox_table:
+        raise ValueError("Re-publishing unpublished events requires OUTBOX_TABLE.")
+    entry = serialize_item(outbox_entry(work_order))
+    dynamodb.meta.client.transact_write_items(TransactItems=[
+        {"Update": {
+            "TableName": table_name,
+            "Key": {"id": {"S": work_order["id"]}},
+            "UpdateExpression": "SET publishPending = :pending",
+            "ExpressionAttributeValues": {":pending": {"BOOL": True}},
+        }},
+        {"Put": {"TableName": outbox_table, "Item": entry}},
+    ])
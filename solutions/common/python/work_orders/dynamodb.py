@@ -0,0 +1,116 @@
+"""
+Resource-style access to DynamoDB on top of the low-level client.
+
+The boto3 resource layer is slow to build on a cold start (it loads and
+materializes the resource model) and is not thread-safe. DynamoDB and Table
+keep the small part of its interface the handlers use, with plain Python
+values in and out, but encode them and decode the results with the
+attribute value codec of work_orders.stream_image, calling the client directly.
+"""
+import types
+
+from work_orders.stream_image import deserialize_item, serialize_item
+
+# Request members holding items or values, and response members holding items
+_SERIALIZED = ("Item", "Key", "ExclusiveStartKey", "ExpressionAttributeValues")
+_ITEM_RESULTS = ("Item", "Attributes", "LastEvaluatedKey")
+
+
+def _request(kwargs):
+    request = dict(kwargs)
+    for name in _SERIALIZED:
+        if name in request:
+            request[name] = serialize_item(request[name])
+    return request
+
+
+def _result(result):
+    decoded = dict(result)
+    for name in _ITEM_RESULTS:
+        if name in decoded:
+            decoded[name] = deserialize_item(decoded[name])
+    if "Items" in decoded:
+        decoded["Items"] = [deserialize_item(item) for item in decoded["Items"]]
+    return decoded
+
+
+class Table:
+    """
+    A table bound to a low-level client, with the Table actions the handlers use.
+    """
+
+    def __init__(self, client, name):
+        self.name = name
+        self.meta = types.SimpleNamespace(client=client)
+
+    def _call(self, operation, kwargs):
+        return _result(getattr(self.meta.client, operation)(TableName=self.name, **_request(kwargs)))
+
+    def put_item(self, **kwargs):
+        return self._call("put_item", kwargs)
+
+    def get_item(self, **kwargs):
+        return self._call("get_item", kwargs)
+
+    def update_item(self, **kwargs):
+        return self._call("update_item", kwargs)
+
+    def delete_item(self, **kwargs):
+        return self._call("delete_item", kwargs)
+
+    def scan(self, **kwargs):
+        return self._call("scan", kwargs)
+
+    def query(self, **kwargs):
+        return self._call("query", kwargs)
+
+
+class DynamoDB:
+    """
+    Stand-in for boto3.resource("dynamodb"): Table objects and the batch actions.
+    """
+
+    def __init__(self, client):
+        self.meta = types.SimpleNamespace(client=client)
+
+    def Table(self, name):
+        return Table(self.meta.client, name)
+
+    def batch_write_item(self, RequestItems, **kwargs):
+        result = self.meta.client.batch_write_item(
+            RequestItems={name: [_write_request(request, serialize_item) for request in requests]
+                          for name, requests in RequestItems.items()},
+            **kwargs
+        )
+        unprocessed = result.get("UnprocessedItems") or {}
+        return {**result, "UnprocessedItems": {
+            name: [_write_request(request, deserialize_item) for request in requests]
+            for name, requests in unprocessed.items()
+        }}
+
+    def batch_get_item(self, RequestItems, **kwargs):
+        result = self.meta.client.batch_get_item(
+            RequestItems={name: _keys(request, serialize_item) for name, request in RequestItems.items()},
+            **kwargs
+        )
+        return {
+            **result,
+            "Responses": {
+                name: [deserialize_item(item) for item in items]
+                for name, items in result.get("Responses", {}).items()
+            },
+            "UnprocessedKeys": {
+                name: _keys(request, deserialize_item)
+                for name, request in (result.get("UnprocessedKeys") or {}).items()
+            },
+        }
+
+
+def _write_request(request, convert):
+    if "PutRequest" in request:
+        return {"PutRequest": {"Item": convert(request["PutRequest"]["Item"])}}
+    return {"DeleteRequest": {"Key": convert(request["DeleteRequest"]["Key"])}}
+
+
+def _keys(request, convert):
+    return {**request, "Keys": [convert(key) for key in request["Keys"]]}
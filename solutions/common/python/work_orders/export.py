@@ -0,0 +1,66 @@
+"""
+Admin entry point that exports a whole work-orders table as NDJSON.
+
+    python -m work_orders.export --table WorkOrdersTable --segments 16 --workers 8 > work-orders.ndjson
+"""
+import argparse
+import sys
+
+from work_orders.clients import client_config
+from work_orders.dynamodb import DynamoDB
+from work_orders.ndjson import ndjson_lines
+from work_orders.parallel_scan import DEFAULT_MAX_WORKERS, DEFAULT_TOTAL_SEGMENTS, parallel_scan
+
+
+def table_factory(table_name, region_name=None):
+    """
+    Returns a callable that builds a Table bound to its own boto3 session,
+    since sessions must not be shared between threads.
+    """
+    import boto3
+
+    def make_table():
+        session = boto3.session.Session(region_name=region_name)
+        return DynamoDB(session.client("dynamodb", config=client_config())).Table(table_name)
+
+    return make_table
+
+
+def export_table(make_table, output, total_segments=None, max_workers=None, page_size=None):
+    """
+    Writes every item of the table to `output` as newline-delimited JSON.
+    Returns the number of exported items.
+    """
+    count = 0
+    items = parallel_scan(make_table, total_segments=total_segments, max_workers=max_workers, page_size=page_size)
+    for line in ndjson_lines(items):
+        output.write(line)
+        count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a work-orders table as NDJSON.")
+    parser.add_argument("--table", required=True, help="DynamoDB table name")
+    parser.add_argument("--region", help="AWS region")
+    parser.add_argument("--segments", type=int, default=DEFAULT_TOTAL_SEGMENTS, help="Scan TotalSegments")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="Segments scanned concurrently")
+    parser.add_argument("--page-size", type=int, help="Scan Limit per request")
+    parser.add_argument("--output", help="Output file (defaults to stdout)")
+    args = parser.parse_args(argv)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        count = export_table(table_factory(args.table, args.region), output,
+                             total_segments=args.segments, max_workers=args.workers,
+                             page_size=args.page_size)
+    finally:
+        if args.output:
+            output.close()
+
+    print(f"Exported {count} work orders from {args.table}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+import os
+import zlib
+
+# How messages are assigned to SQS FIFO message groups:
+#   order  - one group per work order id (ordering per order, maximum parallelism)
+#   hash   - MESSAGE_GROUP_KEY (by default the optional 'customerId' of the POST body)
+#            hashed into MESSAGE_GROUP_COUNT groups
+#   status - one group per status (legacy; serializes every order with the same status)
+GROUP_BY_ORDER = "order"
+GROUP_BY_HASH = "hash"
+GROUP_BY_STATUS = "status"
+MESSAGE_GROUP_STRATEGIES = (GROUP_BY_ORDER, GROUP_BY_HASH, GROUP_BY_STATUS)
+
+MESSAGE_GROUP_STRATEGY = os.getenv("MESSAGE_GROUP_STRATEGY", GROUP_BY_ORDER)
+MESSAGE_GROUP_KEY = os.getenv("MESSAGE_GROUP_KEY", "customerId")
+MESSAGE_GROUP_COUNT = int(os.getenv("MESSAGE_GROUP_COUNT", "16"))
+
+
+def message_group_id(work_order, strategy=None, key=None, group_count=None):
+    """
+    Returns the MessageGroupId for a work order according to the grouping strategy.
+    Every strategy keeps all messages of the same work order in the same group.
+    """
+    strategy = strategy or MESSAGE_GROUP_STRATEGY
+
+    if strategy == GROUP_BY_ORDER:
+        return work_order["id"]
+    if strategy == GROUP_BY_HASH:
+        # Orders without the grouping attribute fall back to their own id
+        value = work_order.get(key or MESSAGE_GROUP_KEY) or work_order["id"]
+        group = zlib.crc32(str(value).encode("utf-8")) % (group_count or MESSAGE_GROUP_COUNT)
+        return f"group-{group}"
+    if strategy == GROUP_BY_STATUS:
+        return work_order["status"]
+
+    raise ValueError(f"Unknown message group strategy: {strategy}")
@@ -0,0 +1,96 @@
+"""
+Admin entry point that fills in the secondary index attributes of stored work orders.
+
+Orders written before the status and delivery indexes existed have no
+statusShard or deliveryBucket, and orders whose status was changed without
+set_status keep the statusShard of their previous status. This scans the
+table once and re-derives both where they are missing or out of date:
+
+    python -m work_orders.index_backfill --table WorkOrdersTable --segments 16 --workers 8
+
+It is also the way to re-shard after changing STATUS_SHARD_COUNT or
+DELIVERY_SHARD_COUNT.
+"""
+import argparse
+import sys
+
+from work_orders.delivery_index import DELIVERY_BUCKET_ATTRIBUTE, delivery_bucket
+from work_orders.export import table_factory
+from work_orders.parallel_scan import DEFAULT_MAX_WORKERS, DEFAULT_TOTAL_SEGMENTS, parallel_scan
+from work_orders.status_index import STATUS_SHARD_ATTRIBUTE, status_shard
+
+
+def index_updates(item):
+    """
+    Returns the index attributes an item should have and does not, e.g. {"statusShard": "completed#2"}.
+    """
+    updates = {}
+    if item.get("status"):
+        expected = status_shard(item["status"], item["id"])
+        if item.get(STATUS_SHARD_ATTRIBUTE) != expected:
+            updates[STATUS_SHARD_ATTRIBUTE] = expected
+    if item.get("deliveryDate"):
+        expected = delivery_bucket(item["deliveryDate"], item["id"])
+        if item.get(DELIVERY_BUCKET_ATTRIBUTE) != expected:
+            updates[DELIVERY_BUCKET_ATTRIBUTE] = expected
+    return updates
+
+
+def backfill_indexes(make_table, total_segments=None, max_workers=None):
+    """
+    Re-derives the index attributes of every work order that needs it.
+    Each update only applies while the status and deliveryDate are still the
+    scanned ones, so concurrent changes are not overwritten.
+    Returns (scanned, updated).
+    """
+    table = make_table()
+    items = parallel_scan(
+        make_table, total_segments=total_segments, max_workers=max_workers,
+        ProjectionExpression="id, #status, deliveryDate, #shard, #bucket",
+        ExpressionAttributeNames={"#status": "status", "#shard": STATUS_SHARD_ATTRIBUTE,
+                                  "#bucket": DELIVERY_BUCKET_ATTRIBUTE},
+    )
+    scanned = updated = 0
+    for item in items:
+        scanned += 1
+        updates = index_updates(item)
+        if not updates:
+            continue
+        names = {f"#a{index}": name for index, name in enumerate(updates)}
+        values = {f":a{index}": value for index, value in enumerate(updates.values())}
+        names.update({"#status": "status", "#deliveryDate": "deliveryDate"})
+        values.update({":status": item.get("status"), ":deliveryDate": item.get("deliveryDate")})
+        try:
+            table.update_item(
+                Key={"id": item["id"]},
+                UpdateExpression="SET " + ", ".join(f"#a{index} = :a{index}" for index in range(len(updates))),
+                ConditionExpression="#status = :status AND #deliveryDate = :deliveryDate",
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+            )
+            updated += 1
+        except Exception as e:
+            code = (getattr(e, "response", None) or {}).get("Error", {}).get("Code")
+            if code != "ConditionalCheckFailedException":
+                raise
+            # Changed since it was scanned: the write that changed it derives the attributes
+    return scanned, updated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fill in the secondary index attributes of stored work orders.")
+    parser.add_argument("--table", required=True, help="DynamoDB table name")
+    parser.add_argument("--region", help="AWS region")
+    parser.add_argument("--segments", type=int, default=DEFAULT_TOTAL_SEGMENTS, help="Scan TotalSegments")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="Segments scanned concurrently")
+    args = parser.parse_args(argv)
+
+    scanned, updated = backfill_indexes(table_factory(args.table, args.region),
+                                        total_segments=args.segments, max_workers=args.workers)
+
+    print(f"Updated the index attributes of {updated} of {scanned} work orders in {args.table}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from work_orders.batch import backoff, chunked
+from work_orders.pagination import PaginationError
+
+# BatchGetItem accepts up to 100 keys per request
+DYNAMODB_BATCH_GET_SIZE = 100
+MAX_BATCH_GET_ATTEMPTS = 5
+
+# Maximum number of ids accepted by GET /work-orders?ids=...
+MAX_LOOKUP_IDS = int(os.getenv("MAX_LOOKUP_IDS", "100"))
+
+# Warm-invocation cache of point lookups; a TTL of 0 disables it
+ITEM_CACHE_SIZE = int(os.getenv("ITEM_CACHE_SIZE", "1024"))
+ITEM_CACHE_TTL_SECONDS = float(os.getenv("ITEM_CACHE_TTL_SECONDS", "30"))
+
+# Attributes returned by lookups (internal ones such as statusShard are left out)
+WORK_ORDER_ATTRIBUTES = ("id", "createdAt", "description", "deliveryDate", "status", "cancellationReason", "customerId")
+
+# Attributes kept on the item for the indexes and the publisher, never returned
+INTERNAL_ATTRIBUTES = frozenset(("statusShard", "deliveryBucket", "publishPending"))
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries also expire after `ttl` seconds.
+    Thread-safe; counts hits and misses.
+    """
+
+    def __init__(self, maxsize, ttl, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key):
+        """
+        Returns the cached value, or None when it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > self.clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (value, self.clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Shared across warm invocations
+work_order_cache = TTLCache(ITEM_CACHE_SIZE, ITEM_CACHE_TTL_SECONDS)
+
+
+def projection(attributes=WORK_ORDER_ATTRIBUTES):
+    """
+    Builds a ProjectionExpression and its ExpressionAttributeNames
+    ('status' is a DynamoDB reserved word, so every name is aliased).
+    """
+    names = {f"#{attribute}": attribute for attribute in attributes}
+    return ", ".join(names), names
+
+
+def public_attributes(item):
+    """
+    Returns a work order without its internal attributes, for the read paths
+    that cannot project them out (index cursors need the index keys).
+    """
+    return {name: value for name, value in item.items() if name not in INTERNAL_ATTRIBUTES}
+
+
+def parse_ids(value, max_ids=None):
+    """
+    Reads the comma-separated 'ids' query parameter, dropping blanks and duplicates.
+    """
+    max_ids = max_ids or MAX_LOOKUP_IDS
+    ids = list(dict.fromkeys(part.strip() for part in value.split(",") if part.strip()))
+    if not ids:
+        raise PaginationError("'ids' must contain at least one id.")
+    if len(ids) > max_ids:
+        raise PaginationError(f"'ids' can contain at most {max_ids} ids.")
+    return ids
+
+
+def get_work_order(table, work_order_id, cache=None):
+    """
+    Reads one work order with GetItem, going through the cache first.
+    Returns (item, cache_hit); item is None when it does not exist.
+    """
+    cache = work_order_cache if cache is None else cache
+    key = (table.name, work_order_id)
+    if cache.enabled:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached, True
+
+    expression, names = projection()
+    result = table.get_item(Key={"id": work_order_id}, ProjectionExpression=expression,
+                            ExpressionAttributeNames=names)
+    item = result.get("Item")
+    if item is not None:
+        cache.put(key, item)
+    return item, False
+
+
+def batch_get_work_orders(dynamodb, table_name, ids, cache=None, max_attempts=MAX_BATCH_GET_ATTEMPTS,
+                          sleep=time.sleep):
+    """
+    Reads many work orders with BatchGetItem in chunks of 100 keys, retrying
+    UnprocessedKeys with backoff. Cached work orders are not read again.
+    Returns (items_by_id, unprocessed_ids).
+    """
+    cache = work_order_cache if cache is None else cache
+    found = {}
+    pending = []
+    for work_order_id in ids:
+        cached = cache.get((table_name, work_order_id)) if cache.enabled else None
+        if cached is not None:
+            found[work_order_id] = cached
+        else:
+            pending.append(work_order_id)
+
+    expression, names = projection()
+    unprocessed = []
+    for chunk in chunked(pending, DYNAMODB_BATCH_GET_SIZE):
+        request = {table_name: {
+            "Keys": [{"id": work_order_id} for work_order_id in chunk],
+            "ProjectionExpression": expression,
+            "ExpressionAttributeNames": names,
+        }}
+        for attempt in range(max_attempts):
+            result = dynamodb.batch_get_item(RequestItems=request)
+            for item in result.get("Responses", {}).get(table_name, []):
+                found[item["id"]] = item
+                cache.put((table_name, item["id"]), item)
+            request = result.get("UnprocessedKeys") or {}
+            if not request.get(table_name, {}).get("Keys"):
+                request = {}
+                break
+            if attempt + 1 < max_attempts:
+                backoff(attempt, sleep)
+        if request:
+            unprocessed.extend(key["id"] for key in request[table_name]["Keys"])
+
+    return found, unprocessed
@@ -0,0 +1,203 @@
+"""
+Per-invocation metrics written as CloudWatch Embedded Metric Format (EMF).
+
+Handlers are wrapped with `instrument`; inside an invocation, `phase(name)`
+times a phase (parse, validate, dynamodb, publish, serialize...) and `count`
+adds to a counter. AWS calls and their retries are counted by botocore event
+hooks on the shared clients. Everything is flushed as a single JSON log line
+per invocation, which CloudWatch turns into metrics.
+
+With METRICS_ENABLED unset, `instrument` returns the handler untouched and
+`phase` returns a shared no-op context manager, so the cost is one global
+lookup per phase.
+"""
+import contextlib
+import functools
+import os
+import threading
+import time
+
+from work_orders.serialization import dumps
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+METRICS_NAMESPACE = os.getenv("METRICS_NAMESPACE", "WorkOrders")
+SERVICE_NAME = os.getenv("AWS_LAMBDA_FUNCTION_NAME", "work-orders")
+
+# Recorder of the running invocation; a Lambda process runs one at a time
+_current = None
+_cold_start = True
+_NO_PHASE = contextlib.nullcontext()
+
+
+class Recorder:
+    """
+    Collects the timings (milliseconds) and counters of one invocation.
+    Thread-safe, since publishing and partition queries may run in a pool.
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.timings = {}
+        self.counts = {}
+        self._lock = threading.Lock()
+
+    def add_time(self, name, milliseconds):
+        with self._lock:
+            self.timings[name] = self.timings.get(name, 0.0) + milliseconds
+
+    def add_count(self, name, value=1):
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + value
+
+    def emf(self, namespace=None, service=None, timestamp=None):
+        """
+        Builds the EMF document: metric definitions under '_aws' and the values
+        as top-level members, with Service and Handler as dimensions.
+        """
+        with self._lock:
+            timings, counts = dict(self.timings), dict(self.counts)
+        metrics = [{"Name": name, "Unit": "Milliseconds"} for name in sorted(timings)]
+        metrics += [{"Name": name, "Unit": "Count"} for name in sorted(counts)]
+        document = {
+            "_aws": {
+                "Timestamp": int((timestamp or time.time()) * 1000),
+                "CloudWatchMetrics": [{
+                    "Namespace": namespace or METRICS_NAMESPACE,
+                    "Dimensions": [["Service", "Handler"]],
+                    "Metrics": metrics,
+                }],
+            },
+            "Service": service or SERVICE_NAME,
+            "Handler": self.handler,
+        }
+        document.update({name: round(value, 3) for name, value in timings.items()})
+        document.update(counts)
+        return document
+
+
+class _Phase:
+    __slots__ = ("recorder", "name", "started")
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.recorder.add_time(self.name, (time.perf_counter() - self.started) * 1000)
+        return False
+
+
+def phase(name):
+    """
+    Times a phase of the running invocation: `with phase("dynamodb"): ...`.
+    Repeated phases add up.
+    """
+    recorder = _current
+    if recorder is None:
+        return _NO_PHASE
+    return _Phase(recorder, name)
+
+
+def count(name, value=1):
+    """
+    Adds to a counter of the running invocation.
+    """
+    recorder = _current
+    if recorder is not None:
+        recorder.add_count(name, value)
+
+
+def timed(name, function):
+    """
+    Returns `function` timed as phase `name`, or `function` itself outside an
+    instrumented invocation.
+    """
+    if _current is None:
+        return function
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        with phase(name):
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+def instrument(handler_name, enabled=None, emit=None):
+    """
+    Decorates a Lambda handler so each invocation records its duration,
+    phases, AWS calls, cold start and response class (2xx, 4xx, 5xx), then
+    writes them as one EMF log line. A no-op unless metrics are enabled.
+    """
+    enabled = METRICS_ENABLED if enabled is None else enabled
+
+    def decorate(handler):
+        if not enabled:
+            return handler
+
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            global _current, _cold_start
+            recorder = _current = Recorder(handler_name)
+            cold_start, _cold_start = _cold_start, False
+            started = time.perf_counter()
+            try:
+                result = handler(event, context)
+                if isinstance(result, dict) and isinstance(result.get("statusCode"), int):
+                    recorder.add_count(f"status{result['statusCode'] // 100}xx")
+                return result
+            except Exception:
+                recorder.add_count("errors")
+                raise
+            finally:
+                recorder.add_time("duration", (time.perf_counter() - started) * 1000)
+                recorder.add_count("coldStart", int(cold_start))
+                _current = None
+                (emit or _print)(dumps(recorder.emf()))
+
+        return wrapper
+
+    return decorate
+
+
+def _print(line):
+    print(line, flush=True)
+
+
+def _after_call(http_response=None, parsed=None, **kwargs):
+    recorder = _current
+    if recorder is None:
+        return
+    recorder.add_count("awsCalls")
+    parsed = parsed or {}
+    retries = parsed.get("ResponseMetadata", {}).get("RetryAttempts", 0)
+    if retries:
+        recorder.add_count("awsRetries", retries)
+    # Service errors (throttling, conditional checks...) arrive here as responses
+    status_code = getattr(http_response, "status_code", None)
+    if parsed.get("Error") or (status_code is not None and status_code >= 300):
+        recorder.add_count("awsErrors")
+
+
+def _after_call_error(**kwargs):
+    recorder = _current
+    if recorder is None:
+        return
+    recorder.add_count("awsCalls")
+    recorder.add_count("awsErrors")
+
+
+def register_client_hooks(client):
+    """
+    Counts the calls, retries and errors of a botocore client through its
+    event system ('after-call' covers every operation of the client and the
+    errors returned by the service; 'after-call-error' the ones raised
+    before a response, such as connection errors).
+    """
+    client.meta.events.register("after-call", _after_call)
+    client.meta.events.register("after-call-error", _after_call_error)
+    return client
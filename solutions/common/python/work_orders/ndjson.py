@@ -0,0 +1,61 @@
+import os
+
+from work_orders.pagination import PaginationError
+from work_orders.serialization import dumps
+
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+FORMATS = ("json", "ndjson")
+
+# Python Lambdas cannot stream responses, so the export is served in chunks:
+# each response stops after this many bytes (plus at most one 1 MB page),
+# well below the 6 MB Lambda/API Gateway limit, and hands back a token.
+NDJSON_CHUNK_BYTES = int(os.getenv("NDJSON_CHUNK_BYTES", str(4 * 1024 * 1024)))
+
+
+def parse_format(params):
+    """
+    Reads the 'format' query parameter: 'json' (default) or 'ndjson'.
+    """
+    value = (params or {}).get("format") or "json"
+    if value not in FORMATS:
+        raise PaginationError(f"'format' must be one of {list(FORMATS)}.")
+    return value
+
+
+def iter_pages(fetch, cursor=None):
+    """
+    Yields (items, next_cursor) pages from `fetch(cursor)` until the source is
+    exhausted. Pages are read lazily, one at a time.
+    """
+    while True:
+        items, cursor = fetch(cursor)
+        yield items, cursor
+        if not cursor:
+            return
+
+
+def ndjson_lines(items):
+    """
+    Serializes items lazily, one JSON document per line.
+    """
+    for item in items:
+        yield dumps(item) + "\n"
+
+
+def ndjson_chunk(pages, max_bytes=None):
+    """
+    Collects whole pages as NDJSON until `max_bytes` (of UTF-8) is reached.
+    Returns (body, next_cursor); next_cursor is None once the source is exhausted.
+    Memory is bounded by the chunk size, whatever the size of the table.
+    """
+    max_bytes = max_bytes or NDJSON_CHUNK_BYTES
+    parts = []
+    size = 0
+    for items, cursor in pages:
+        for line in ndjson_lines(items):
+            parts.append(line)
+            # The limit is on the UTF-8 body: non-ASCII text is not escaped
+            size += len(line.encode("utf-8"))
+        if not cursor or size >= max_bytes:
+            return "".join(parts), cursor
+    return "".join(parts), None
@@ -0,0 +1,92 @@
+import os
+import time
+
+from work_orders.batch import chunked
+from work_orders.stream_image import deserialize_value, serialize_item
+
+# Table holding one pending event per created work order
+OUTBOX_TABLE = os.getenv("OUTBOX_TABLE")
+
+# Relayed entries are removed by the table TTL after this many seconds
+OUTBOX_RETENTION_SECONDS = int(os.getenv("OUTBOX_RETENTION_DAYS", "7")) * 24 * 3600
+
+# TransactWriteItems accepts 100 actions; every work order takes two
+TRANSACTION_SIZE = 100
+WORK_ORDERS_PER_TRANSACTION = TRANSACTION_SIZE // 2
+
+
+def outbox_entry(work_order, now=time.time):
+    """
+    Builds the pending event stored next to a new work order.
+    """
+    return {
+        "id": work_order["id"],
+        "workOrder": work_order,
+        "expiresAt": int(now()) + OUTBOX_RETENTION_SECONDS,
+    }
+
+
+def _put(table_name, item):
+    return {"Put": {"TableName": table_name, "Item": serialize_item(item)}}
+
+
+def store_with_outbox(dynamodb, table_name, item, entry, outbox_table=None):
+    """
+    Stores a work order and its pending event in a single transaction,
+    so an order is never stored without the event that announces it.
+    """
+    dynamodb.meta.client.transact_write_items(TransactItems=[
+        _put(table_name, item),
+        _put(outbox_table or OUTBOX_TABLE, entry),
+    ])
+
+
+def store_batch_with_outbox(dynamodb, table_name, items, entries, outbox_table=None, key="id"):
+    """
+    Stores work orders and their pending events with one transaction per 50 orders.
+    A failed transaction fails every order in it.
+    Returns a dict mapping the key of every item that could not be written to an error message.
+    """
+    outbox_table = outbox_table or OUTBOX_TABLE
+    failed = {}
+    pairs = list(zip(items, entries))
+    for chunk in chunked(pairs, WORK_ORDERS_PER_TRANSACTION):
+        actions = []
+        for item, entry in chunk:
+            actions.append(_put(table_name, item))
+            actions.append(_put(outbox_table, entry))
+        try:
+            dynamodb.meta.client.transact_write_items(TransactItems=actions)
+        except Exception as e:
+            for item, _ in chunk:
+                failed[item[key]] = str(e)
+    return failed
+
+
+def relay(records, publish):
+    """
+    Publishes the pending events found in a batch of outbox stream records.
+
+    `publish(work_orders)` is the handler's batched publisher and returns a
+    dict of failed ids. Returns the batchItemFailures response, so Lambda
+    retries the failed records and, once retries are exhausted, sends them
+    to the on-failure destination.
+    """
+    work_orders = []
+    sequence_numbers = {}
+    for record in records:
+        if record["eventName"] != "INSERT":
+            continue
+        work_order = deserialize_value(record["dynamodb"]["NewImage"]["workOrder"])
+        sequence_numbers[work_order["id"]] = record["dynamodb"]["SequenceNumber"]
+        work_orders.append(work_order)
+
+    failed = publish(work_orders) if work_orders else {}
+    for work_order_id, message in failed.items():
+        print(f"Error relaying work order {work_order_id}: {message}")
+
+    return {
+        "batchItemFailures": [
+            {"itemIdentifier": sequence_numbers[work_order_id]} for work_order_id in failed
+        ]
+    }
@@ -0,0 +1,111 @@
+import base64
+import binascii
+import json
+
+# Page size limits for GET /work-orders
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+# Keeps the serialized page well below the 6 MB Lambda/API Gateway limit
+MAX_PAGE_BYTES = 1024 * 1024
+
+# Primary key of WorkOrdersTable
+KEY_ATTRIBUTES = ("id",)
+
+
+class PaginationError(ValueError):
+    """
+    Raised when the GET /work-orders query parameters are invalid.
+    """
+
+
+def encode_next_token(key):
+    """
+    Encodes a DynamoDB LastEvaluatedKey as an opaque, URL-safe token.
+    """
+    if not key:
+        return None
+    raw = json.dumps(key, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_next_token(token):
+    """
+    Decodes a token produced by encode_next_token back into an ExclusiveStartKey.
+    """
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise PaginationError("Invalid 'nextToken'.")
+    if not isinstance(key, dict) or not key:
+        raise PaginationError("Invalid 'nextToken'.")
+    return key
+
+
+def parse_page_params(params):
+    """
+    Reads 'limit' and 'nextToken' from the query string parameters.
+    Returns a (limit, exclusive_start_key) tuple.
+    """
+    params = params or {}
+    raw_limit = params.get("limit")
+    if raw_limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    else:
+        try:
+            limit = int(raw_limit)
+        except (TypeError, ValueError):
+            raise PaginationError("'limit' must be an integer.")
+        if limit < 1 or limit > MAX_PAGE_SIZE:
+            raise PaginationError(f"'limit' must be between 1 and {MAX_PAGE_SIZE}.")
+
+    return limit, decode_next_token(params.get("nextToken"))
+
+
+def item_key(item, key_attributes=KEY_ATTRIBUTES):
+    """
+    Builds the key of an item, usable as an ExclusiveStartKey.
+    """
+    return {name: item[name] for name in key_attributes}
+
+
+def estimate_size(item):
+    """
+    Approximates the serialized size of an item in bytes.
+    """
+    return len(json.dumps(item, default=str))
+
+
+def scan_page(table, limit, start_key=None, max_bytes=MAX_PAGE_BYTES):
+    """
+    Reads a single page of up to `limit` items with Scan, following
+    LastEvaluatedKey across DynamoDB's 1 MB pages until the page is full.
+    Stops early once `max_bytes` of items have been collected.
+    Returns (items, next_key); next_key is None once the table is exhausted.
+    """
+    items = []
+    size = 0
+    next_key = start_key
+
+    while len(items) < limit:
+        kwargs = {"Limit": limit - len(items)}
+        if next_key:
+            kwargs["ExclusiveStartKey"] = next_key
+        result = table.scan(**kwargs)
+        next_key = result.get("LastEvaluatedKey")
+
+        page = result.get("Items", [])
+        for item in page:
+            size += estimate_size(item)
+            if items and size > max_bytes:
+                # Resume right after the last item that fits in the response
+                return items, item_key(items[-1])
+            items.append(item)
+
+        if not next_key:
+            break
+
+    return items, next_key
@@ -0,0 +1,110 @@
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Number of Scan segments used for full-table exports
+DEFAULT_TOTAL_SEGMENTS = int(os.getenv("SCAN_TOTAL_SEGMENTS", "8"))
+
+# Maximum number of segments scanned at the same time
+DEFAULT_MAX_WORKERS = int(os.getenv("SCAN_MAX_WORKERS", "8"))
+
+# Pages buffered between the scanning threads and the consumer
+DEFAULT_BUFFERED_PAGES = 16
+
+_DONE = object()
+
+
+class _SegmentError:
+    """
+    Carries an exception raised while scanning a segment to the consumer.
+    """
+
+    def __init__(self, error):
+        self.error = error
+
+
+def parallel_scan(table_factory, total_segments=None, max_workers=None, page_size=None,
+                  buffered_pages=DEFAULT_BUFFERED_PAGES, **scan_kwargs):
+    """
+    Scans the whole table with `total_segments` parallel segments and yields
+    items as soon as each page arrives, without accumulating the result set.
+
+    `table_factory` is called once per worker thread because boto3 resources
+    are not thread-safe. `max_workers` caps how many segments are scanned
+    concurrently; `page_size` is passed to Scan as Limit.
+    """
+    total_segments = total_segments or DEFAULT_TOTAL_SEGMENTS
+    max_workers = min(max_workers or DEFAULT_MAX_WORKERS, total_segments)
+    if page_size:
+        scan_kwargs["Limit"] = page_size
+
+    pages = queue.Queue(maxsize=buffered_pages)
+    stop = threading.Event()
+    local = threading.local()
+
+    def put(entry):
+        # Blocks while the consumer is behind, but gives up once it has stopped
+        while not stop.is_set():
+            try:
+                pages.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def scan_segment(segment):
+        try:
+            if not hasattr(local, "table"):
+                local.table = table_factory()
+            start_key = None
+            while not stop.is_set():
+                kwargs = dict(scan_kwargs, Segment=segment, TotalSegments=total_segments)
+                if start_key:
+                    kwargs["ExclusiveStartKey"] = start_key
+                result = local.table.scan(**kwargs)
+                items = result.get("Items", [])
+                if items and not put(items):
+                    return
+                start_key = result.get("LastEvaluatedKey")
+                if not start_key:
+                    break
+            put(_DONE)
+        except Exception as e:
+            put(_SegmentError(e))
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scan-segment")
+    try:
+        for segment in range(total_segments):
+            executor.submit(scan_segment, segment)
+
+        remaining = total_segments
+        while remaining:
+            entry = pages.get()
+            if entry is _DONE:
+                remaining -= 1
+            elif isinstance(entry, _SegmentError):
+                raise entry.error
+            else:
+                yield from entry
+    finally:
+        stop.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def serial_scan(table, page_size=None, **scan_kwargs):
+    """
+    Scans the whole table in a single sequential pass, yielding items page by page.
+    """
+    if page_size:
+        scan_kwargs["Limit"] = page_size
+    start_key = None
+    while True:
+        kwargs = dict(scan_kwargs)
+        if start_key:
+            kwargs["ExclusiveStartKey"] = start_key
+        result = table.scan(**kwargs)
+        yield from result.get("Items", [])
+        start_key = result.get("LastEvaluatedKey")
+        if not start_key:
+            return
@@ -0,0 +1,94 @@
+import heapq
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from work_orders.pagination import item_key
+
+# Partitions queried at the same time, with a pool reused across warm invocations
+PARTITION_QUERY_WORKERS = int(os.getenv("PARTITION_QUERY_WORKERS", "8"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def partition_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=PARTITION_QUERY_WORKERS, thread_name_prefix="partition-query")
+    return _executor
+
+
+def query_partitions(table, partitions, build_query, sort_key, key_attributes, limit,
+                     cursor=None, descending=False, parallel=True):
+    """
+    Reads one page of up to `limit` items spread over several index partitions
+    and merges them by `sort_key` with a k-way merge. With `parallel`, the
+    partitions are queried concurrently with the same Table, which is
+    backed by the thread-safe low-level client (work_orders.dynamodb).
+
+    `build_query(partition)` returns the Query arguments for a partition.
+    `cursor` maps each partition to its ExclusiveStartKey (None to start from
+    the beginning); partitions missing from the cursor are already exhausted.
+    Returns (items, next_cursor); next_cursor is None once every partition is exhausted.
+    """
+    if cursor is None:
+        cursor = {partition: None for partition in partitions}
+
+    pending = [partition for partition in partitions if partition in cursor]
+
+    def read(partition):
+        return _read_partition(table, build_query(partition), limit, cursor[partition])
+
+    if parallel and len(pending) > 1:
+        pages = dict(zip(pending, partition_executor().map(read, pending)))
+    else:
+        pages = {partition: read(partition) for partition in pending}
+
+    # Partitions with more data bound how far the merge can safely go
+    bounds = [page[-1][sort_key] for page, last_key in pages.values() if last_key]
+    frontier = (max(bounds) if descending else min(bounds)) if bounds else None
+
+    tagged = [
+        [(item[sort_key], partition, item) for item in page]
+        for partition, (page, _) in pages.items()
+    ]
+    merged = heapq.merge(*tagged, key=lambda entry: entry[0], reverse=descending)
+
+    items = []
+    taken = {partition: 0 for partition in pages}
+    for value, partition, item in merged:
+        if len(items) >= limit:
+            break
+        if frontier is not None and (value < frontier if descending else value > frontier):
+            break
+        items.append(item)
+        taken[partition] += 1
+
+    next_cursor = {}
+    for partition, (page, last_key) in pages.items():
+        count = taken[partition]
+        if count < len(page):
+            next_cursor[partition] = item_key(page[count - 1], key_attributes) if count else cursor[partition]
+        elif last_key:
+            next_cursor[partition] = last_key
+
+    return items, next_cursor or None
+
+
+def _read_partition(table, arguments, limit, start_key):
+    """
+    Reads up to `limit` items from one partition, skipping empty pages.
+    Returns (items, last_evaluated_key).
+    """
+    while True:
+        kwargs = dict(arguments, Limit=limit)
+        if start_key:
+            kwargs["ExclusiveStartKey"] = start_key
+        result = table.query(**kwargs)
+        items = result.get("Items", [])
+        start_key = result.get("LastEvaluatedKey")
+        if items or not start_key:
+            return items, start_key
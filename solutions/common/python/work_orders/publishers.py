@@ -0,0 +1,251 @@
+import abc
+import os
+
+from work_orders.batch import publish_batch, put_events_batch, send_message_batch
+from work_orders.clients import lazy_client
+from work_orders.dispatch import voided
+from work_orders.grouping import message_group_id
+from work_orders.serialization import dumps
+
+# Routing backends selectable with the PUBLISHER environment variable
+PUBLISHER_SQS = "sqs"
+PUBLISHER_SNS = "sns"
+PUBLISHER_EVENTBRIDGE = "eventbridge"
+PUBLISHER_NONE = "none"
+
+EVENT_SOURCE = "work-orders"
+WORK_ORDER_CREATED = "WorkOrderCreated"
+WORK_ORDER_VOIDED = "WorkOrderVoided"
+
+class Publisher(abc.ABC):
+    """
+    Publishes work order events, one at a time or in batches.
+
+    Subclasses say where a work order goes (`destination`), how it becomes a
+    batch entry (`entry`) and how a list of entries is sent (`send_batch`).
+    Grouping by destination and failure reporting are shared; chunking to the
+    service limit and retrying throttled entries is done by work_orders.batch.
+    """
+
+    name = "publisher"
+    enabled = True
+
+    def publish(self, work_order, **options):
+        """
+        Publishes a single event. Pass `body` when the work order is already serialized.
+        Returns the service response, or None if the event could not be published.
+        """
+        try:
+            return self.send(work_order, **options)
+        except Exception as e:
+            print(f"Error publishing to {self.name}: {e}")
+
+    def publish_voided(self, work_order):
+        """
+        Publishes the compensating event of a work order that could not be stored.
+        """
+        return self.publish(voided(work_order))
+
+    def publish_batch(self, work_orders):
+        """
+        Publishes many events with the batched API of the service.
+        Returns a dict mapping the ids that could not be published to an error message.
+        """
+        failed = {}
+        entries_by_destination = {}
+        for work_order in work_orders:
+            try:
+                destination = self.destination(work_order)
+            except ValueError as e:
+                failed[work_order["id"]] = str(e)
+                continue
+            entries_by_destination.setdefault(destination, []).append(self.entry(work_order))
+
+        for destination, entries in entries_by_destination.items():
+            failed.update(self.send_batch(destination, entries))
+        return failed
+
+    def destination(self, work_order):
+        return None
+
+    @abc.abstractmethod
+    def send(self, work_order, **options):
+        """
+        Sends one event and returns the service response; raises on failure.
+        """
+
+    @abc.abstractmethod
+    def entry(self, work_order):
+        """
+        Returns the batch entry of a work order, with the work order id as 'Id'.
+        """
+
+    @abc.abstractmethod
+    def send_batch(self, destination, entries):
+        """
+        Sends a list of entries and returns a dict mapping failed ids to an error message.
+        """
+
+
+class SqsFifoPublisher(Publisher):
+    """
+    Sends work orders to the SQS FIFO queue of their status.
+    """
+
+    name = "SQS"
+
+    def __init__(self, sqs, queues, group_id=message_group_id, ordered=False):
+        self.sqs = sqs
+        self.queues = queues
+        self.group_id = group_id
+        self.ordered = ordered
+
+    def destination(self, work_order):
+        queue_url = self.queues.get(work_order["status"])
+        if not queue_url:
+            raise ValueError(f"No queue configured for status: {work_order['status']}")
+        return queue_url
+
+    def send(self, work_order, deduplication_id=None, body=None):
+        return self.sqs.send_message(
+            QueueUrl=self.destination(work_order),
+            MessageBody=body or dumps(work_order),
+            MessageGroupId=self.group_id(work_order),
+            MessageDeduplicationId=deduplication_id or work_order["id"]
+        )
+
+    def publish_voided(self, work_order):
+        # A distinct deduplication id, or FIFO would drop it as a duplicate
+        return self.publish(voided(work_order), deduplication_id=f"{work_order['id']}-voided")
+
+    def entry(self, work_order):
+        return {
+            "Id": work_order["id"],
+            "MessageBody": dumps(work_order),
+            "MessageGroupId": self.group_id(work_order),
+            "MessageDeduplicationId": work_order["id"]
+        }
+
+    def send_batch(self, destination, entries):
+        return send_message_batch(self.sqs, destination, entries, ordered=self.ordered)
+
+
+class SnsPublisher(Publisher):
+    """
+    Publishes work orders to an SNS topic with a 'status' attribute for subscription filters.
+    """
+
+    name = "SNS"
+
+    def __init__(self, sns, topic_arn):
+        self.sns = sns
+        self.topic_arn = topic_arn
+
+    def _attributes(self, work_order):
+        return {
+            "status": {
+                "DataType": "String",
+                "StringValue": work_order["status"]
+            }
+        }
+
+    def send(self, work_order, body=None):
+        return self.sns.publish(
+            TopicArn=self.topic_arn,
+            Message=body or dumps(work_order),
+            MessageAttributes=self._attributes(work_order)
+        )
+
+    def entry(self, work_order):
+        return {
+            "Id": work_order["id"],
+            "Message": dumps(work_order),
+            "MessageAttributes": self._attributes(work_order)
+        }
+
+    def send_batch(self, destination, entries):
+        return publish_batch(self.sns, self.topic_arn, entries)
+
+
+class EventBridgePublisher(Publisher):
+    """
+    Sends work order events to an EventBridge bus.
+    """
+
+    name = "EventBridge"
+
+    def __init__(self, eventbridge, event_bus_name):
+        self.eventbridge = eventbridge
+        self.event_bus_name = event_bus_name
+
+    def send(self, work_order, detail_type=WORK_ORDER_CREATED, body=None):
+        response = self.eventbridge.put_events(Entries=[self._event(work_order, detail_type, body)])
+        if response.get("FailedEntryCount"):
+            raise RuntimeError(response["Entries"][0].get("ErrorMessage", "Event was not accepted."))
+        return response
+
+    def publish_voided(self, work_order):
+        return self.publish(voided(work_order), detail_type=WORK_ORDER_VOIDED)
+
+    def _event(self, work_order, detail_type=WORK_ORDER_CREATED, body=None):
+        return {
+            "Source": EVENT_SOURCE,
+            "DetailType": detail_type,
+            "Detail": body or dumps(work_order),
+            "EventBusName": self.event_bus_name
+        }
+
+    def entry(self, work_order):
+        return {"Id": work_order["id"], **self._event(work_order)}
+
+    def send_batch(self, destination, entries):
+        return put_events_batch(self.eventbridge, entries)
+
+
+class NullPublisher(Publisher):
+    """
+    Publishes nothing; used when a DynamoDB stream routes the work orders.
+    """
+
+    name = "none"
+    enabled = False
+
+    def send(self, work_order, **options):
+        return None
+
+    def entry(self, work_order):
+        return {"Id": work_order["id"]}
+
+    def send_batch(self, destination, entries):
+        return {}
+
+    def publish_batch(self, work_orders):
+        return {}
+
+
+def sqs_queues_from_env():
+    """
+    Maps every status to the queue URL configured in the environment.
+    """
+    return {
+        "received": os.getenv("SQS_RECEIVED"),
+        "in_progress": os.getenv("SQS_IN_PROGRESS"),
+        "completed": os.getenv("SQS_COMPLETED"),
+        "canceled": os.getenv("SQS_CANCELED"),
+    }
+
+
+def make_publisher(kind, sqs=None, sns=None, eventbridge=None, queues=None, topic_arn=None, event_bus_name=None):
+    """
+    Builds the publisher for a routing backend. Clients and destinations that
+    are not given are taken from the shared clients and the environment.
+    """
+    if kind == PUBLISHER_SQS:
+        return SqsFifoPublisher(sqs or lazy_client("sqs"), queues or sqs_queues_from_env())
+    if kind == PUBLISHER_SNS:
+        return SnsPublisher(sns or lazy_client("sns"), topic_arn or os.getenv("SNS_TOPIC_ARN"))
+    if kind == PUBLISHER_EVENTBRIDGE:
+        return EventBridgePublisher(eventbridge or lazy_client("events"), event_bus_name or os.getenv("EVENT_BUS_NAME"))
+    if kind == PUBLISHER_NONE:
+        return NullPublisher()
+    raise ValueError(f"Unknown publisher: {kind}")
@@ -0,0 +1,60 @@
+import base64
+import json
+import os
+from decimal import Decimal
+
+# JSON backend: orjson when it is installed in the layer, the json module otherwise.
+# JSON_BACKEND=json forces the standard library.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = os.getenv("JSON_BACKEND", "orjson" if orjson else "json")
+if JSON_BACKEND == "orjson" and orjson is None:
+    JSON_BACKEND = "json"
+
+
+def json_default(value):
+    """
+    Encodes the DynamoDB types that the json module does not support:
+    Decimal as int or float, sets as sorted lists and bytes as base64.
+    """
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode("ascii")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value):
+    """
+    Serializes a value to a compact JSON string, including DynamoDB types.
+    """
+    if JSON_BACKEND == "orjson":
+        return orjson.dumps(value, default=json_default).decode("utf-8")
+    return json.dumps(value, default=json_default, separators=(",", ":"))
+
+
+def loads(data):
+    """
+    Parses a JSON document (str or bytes).
+    """
+    if JSON_BACKEND == "orjson":
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_with(envelope, name, raw):
+    """
+    Serializes `envelope` adding the member `name` from an already serialized
+    JSON string, so a work order serialized for its event is not encoded again
+    for the HTTP response.
+    """
+    head = dumps(envelope)
+    member = dumps(name) + ":" + raw
+    if head == "{}":
+        return "{" + member + "}"
+    return head[:-1] + "," + member + "}"
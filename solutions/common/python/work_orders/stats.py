@@ -0,0 +1,170 @@
+"""
+Materialized work order counters, kept next to the watermark in the meta table:
+
+    {"id": "stats", "total": 42, "received": 10, "in_progress": 20, ...}
+    {"id": "stats#2025-02-20", ...}   counters per deliveryDate day (optional)
+
+They are maintained from the DynamoDB stream: the changes of a batch are
+coalesced into one delta per item and applied with atomic ADDs, so a GET
+answers with a single GetItem instead of a scan. Orders written before the
+counters existed are counted once with work_orders.stats_backfill.
+"""
+import hashlib
+import os
+import re
+import time
+
+from work_orders.batch import chunked
+from work_orders.outbox import TRANSACTION_SIZE
+from work_orders.stream_image import serialize_value
+
+STATS_KEY = "stats"
+TOTAL = "total"
+STATS_BY_DELIVERY_DATE = os.getenv("STATS_BY_DELIVERY_DATE", "false").lower() == "true"
+
+DAY_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# Markers of the applied batches; they outlive the 24 hours a stream keeps its records
+APPLIED_PREFIX = "stats-applied#"
+STATS_APPLIED_RETENTION_SECONDS = int(os.getenv("STATS_APPLIED_RETENTION_DAYS", "2")) * 24 * 60 * 60
+
+
+def stats_key(day=None):
+    return f"{STATS_KEY}#{day}" if day else STATS_KEY
+
+
+def _count(image, sign, deltas, by_day):
+    # Raw attributes are read directly: nothing else of the image is decoded
+    _add(image.get("status", {}).get("S"), image.get("deliveryDate", {}).get("S", ""), sign, deltas, by_day)
+
+
+def _add(status, delivery_date, sign, deltas, by_day):
+    if not status:
+        return
+    keys = [STATS_KEY]
+    day = (delivery_date or "")[:10]
+    if by_day and DAY_PATTERN.match(day):
+        keys.append(stats_key(day))
+    for key in keys:
+        counters = deltas.setdefault(key, {})
+        counters[status] = counters.get(status, 0) + sign
+        counters[TOTAL] = counters.get(TOTAL, 0) + sign
+
+
+def count_deltas(records, by_day=None):
+    """
+    Coalesces the counter changes of a batch of stream records into one delta
+    per stats item, e.g. {"stats": {"received": -1, "completed": 1}}.
+    A MODIFY moves one unit from the old status (and day) to the new one;
+    MODIFYs without an OldImage cannot be counted and are ignored.
+    """
+    by_day = STATS_BY_DELIVERY_DATE if by_day is None else by_day
+    deltas = {}
+    for record in records:
+        event_name = record["eventName"]
+        stream = record["dynamodb"]
+        old_image, new_image = stream.get("OldImage"), stream.get("NewImage")
+        if event_name == "INSERT" and new_image:
+            _count(new_image, 1, deltas, by_day)
+        elif event_name == "MODIFY" and old_image and new_image:
+            _count(old_image, -1, deltas, by_day)
+            _count(new_image, 1, deltas, by_day)
+        elif event_name == "REMOVE" and old_image:
+            _count(old_image, -1, deltas, by_day)
+
+    coalesced = {}
+    for key, counters in deltas.items():
+        changed = {name: delta for name, delta in counters.items() if delta}
+        if changed:
+            coalesced[key] = changed
+    return coalesced
+
+
+def _update(table_name, key, counters):
+    names = {}
+    values = {}
+    additions = []
+    for index, (name, delta) in enumerate(sorted(counters.items())):
+        names[f"#c{index}"] = name
+        values[f":c{index}"] = serialize_value(delta)
+        additions.append(f"#c{index} :c{index}")
+    return {"Update": {
+        "TableName": table_name,
+        "Key": {"id": {"S": key}},
+        "UpdateExpression": "ADD " + ", ".join(additions),
+        "ExpressionAttributeNames": names,
+        "ExpressionAttributeValues": values,
+    }}
+
+
+def _marker(table_name, marker_id, now):
+    return {"Put": {
+        "TableName": table_name,
+        "Item": {"id": {"S": marker_id}, "expiresAt": {"N": str(int(now()) + STATS_APPLIED_RETENTION_SECONDS)}},
+        "ConditionExpression": "attribute_not_exists(id)",
+    }}
+
+
+def _already_applied(error):
+    # The marker is the first action, so its cancellation reason comes first
+    response = getattr(error, "response", None) or {}
+    reasons = response.get("CancellationReasons") or [{}]
+    return (response.get("Error", {}).get("Code") == "TransactionCanceledException"
+            and reasons[0].get("Code") == "ConditionalCheckFailed")
+
+
+def apply_deltas(dynamodb, table_name, deltas, token=None, now=time.time):
+    """
+    Applies coalesced deltas with one atomic update per stats item, grouped
+    in transactions.
+
+    With a `token` (derived from the records) each transaction also creates
+    a marker item that must not exist yet, so a batch retried at any point
+    of the stream retention is not counted twice; the token is also sent as
+    ClientRequestToken, which makes a retry within 10 minutes a no-op.
+    """
+    actions = [_update(table_name, key, counters) for key, counters in sorted(deltas.items())]
+    size = TRANSACTION_SIZE - 1 if token else TRANSACTION_SIZE
+    for index, chunk in enumerate(chunked(actions, size)):
+        kwargs = {"TransactItems": chunk}
+        if token:
+            kwargs["TransactItems"] = [_marker(table_name, f"{APPLIED_PREFIX}{token}-{index}", now), *chunk]
+            kwargs["ClientRequestToken"] = f"{token}-{index}"[:36]
+        try:
+            dynamodb.meta.client.transact_write_items(**kwargs)
+        except Exception as e:
+            if not _already_applied(e):
+                raise
+            print(f"Counters of batch {token}-{index} were already applied")
+
+
+def batch_token(records):
+    """
+    Idempotency token of a batch of stream records.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for record in records:
+        digest.update(str(record.get("eventID")).encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+def count_work_orders(work_orders, by_day=None):
+    """
+    Counts decoded work orders into the stats items, e.g. {"stats": {"received": 3, "total": 3}}.
+    """
+    by_day = STATS_BY_DELIVERY_DATE if by_day is None else by_day
+    totals = {}
+    for work_order in work_orders:
+        _add(work_order.get("status"), work_order.get("deliveryDate"), 1, totals, by_day)
+    return totals
+
+
+def read_stats(table, statuses, day=None):
+    """
+    Reads a stats item with a single GetItem: {"total": n, "byStatus": {...}}.
+    """
+    item = table.get_item(Key={"id": stats_key(day)}).get("Item", {})
+    return {
+        TOTAL: int(item.get(TOTAL, 0)),
+        "byStatus": {status: int(item.get(status, 0)) for status in sorted(statuses)},
+    }
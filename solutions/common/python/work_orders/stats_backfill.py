@@ -0,0 +1,56 @@
+"""
+Admin entry point that counts the existing work orders into the stats items.
+
+The stream processor only counts the changes it sees, so orders written
+before the counters were enabled are missing from them. This scans the
+table once and overwrites the stats items with the totals:
+
+    python -m work_orders.stats_backfill --table WorkOrdersTable --meta-table WorkOrdersMetaTable
+
+Changes made while it runs are counted twice or not at all, so run it
+before the stream processor gets META_TABLE, or in a quiet window.
+"""
+import argparse
+import sys
+
+from work_orders.export import table_factory
+from work_orders.parallel_scan import DEFAULT_MAX_WORKERS, DEFAULT_TOTAL_SEGMENTS, parallel_scan
+from work_orders.stats import STATS_BY_DELIVERY_DATE, count_work_orders
+
+
+def backfill_stats(make_table, meta_table, total_segments=None, max_workers=None, by_day=None):
+    """
+    Recounts every work order and writes one stats item per key.
+    Returns the counted totals.
+    """
+    work_orders = parallel_scan(
+        make_table, total_segments=total_segments, max_workers=max_workers,
+        ProjectionExpression="#status, deliveryDate", ExpressionAttributeNames={"#status": "status"}
+    )
+    totals = count_work_orders(work_orders, by_day=by_day)
+    for key, counters in sorted(totals.items()):
+        meta_table.put_item(Item={"id": key, **counters})
+    return totals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Count the existing work orders into the stats items.")
+    parser.add_argument("--table", required=True, help="Work orders table name")
+    parser.add_argument("--meta-table", required=True, help="Table holding the stats items")
+    parser.add_argument("--region", help="AWS region")
+    parser.add_argument("--segments", type=int, default=DEFAULT_TOTAL_SEGMENTS, help="Scan TotalSegments")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="Segments scanned concurrently")
+    parser.add_argument("--by-day", action="store_true", default=STATS_BY_DELIVERY_DATE,
+                        help="Also write the per deliveryDate day items")
+    args = parser.parse_args(argv)
+
+    totals = backfill_stats(table_factory(args.table, args.region), table_factory(args.meta_table, args.region)(),
+                            total_segments=args.segments, max_workers=args.workers, by_day=args.by_day)
+
+    print(f"Counted {totals.get('stats', {}).get('total', 0)} work orders into {len(totals)} stats items",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
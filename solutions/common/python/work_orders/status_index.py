@@ -0,0 +1,195 @@
+import datetime
+import os
+import zlib
+
+from work_orders.pagination import KEY_ATTRIBUTES, PaginationError
+from work_orders.partitions import query_partitions
+
+# Global secondary index on (statusShard, createdAt)
+STATUS_INDEX_NAME = "StatusCreatedAtIndex"
+STATUS_SHARD_ATTRIBUTE = "statusShard"
+CREATED_AT_ATTRIBUTE = "createdAt"
+
+# Each status is spread over this many partitions so a popular status
+# does not become a hot partition. Changing it requires re-sharding existing
+# items (python -m work_orders.index_backfill).
+STATUS_SHARD_COUNT = int(os.getenv("STATUS_SHARD_COUNT", "4"))
+
+STATUS_INDEX_KEY_ATTRIBUTES = KEY_ATTRIBUTES + (STATUS_SHARD_ATTRIBUTE, CREATED_AT_ATTRIBUTE)
+
+
+def status_shard(status, work_order_id, shard_count=None):
+    """
+    Returns the write-sharded partition value for a work order, e.g. 'received#3'.
+    """
+    shard_count = shard_count or STATUS_SHARD_COUNT
+    shard = zlib.crc32(work_order_id.encode("utf-8")) % shard_count
+    return f"{status}#{shard}"
+
+
+def with_status_shard(work_order, shard_count=None):
+    """
+    Returns a copy of the work order including the status index attribute.
+    """
+    return {
+        **work_order,
+        STATUS_SHARD_ATTRIBUTE: status_shard(work_order["status"], work_order["id"], shard_count),
+    }
+
+
+def set_status(table, work_order_id, status, shard_count=None):
+    """
+    Changes the status of a stored work order together with its status index
+    partition. Status updates must go through here (or set statusShard the
+    same way): otherwise the order stays listed under its previous status.
+    """
+    return table.update_item(
+        Key={"id": work_order_id},
+        UpdateExpression="SET #status = :status, #shard = :shard",
+        ConditionExpression="attribute_exists(id)",
+        ExpressionAttributeNames={"#status": "status", "#shard": STATUS_SHARD_ATTRIBUTE},
+        ExpressionAttributeValues={":status": status, ":shard": status_shard(status, work_order_id, shard_count)},
+    )
+
+
+def stale_status_shard(image, shard_count=None):
+    """
+    Checks the statusShard of a raw (stream) image against its status.
+    Returns the partition the work order belongs to when the stored one is
+    missing or out of date, or None when it is right.
+    """
+    status = image.get("status", {}).get("S")
+    work_order_id = image.get("id", {}).get("S")
+    if not status or not work_order_id:
+        return None
+    expected = status_shard(status, work_order_id, shard_count)
+    if image.get(STATUS_SHARD_ATTRIBUTE, {}).get("S") == expected:
+        return None
+    return expected
+
+
+def repair_status_shard(table, image, shard_count=None):
+    """
+    Re-derives the statusShard of a work order from a raw (stream) image.
+    The update only applies while the status is still the one it was derived
+    from, so a newer status change is left to its own record.
+    Returns True when the item was repaired.
+    """
+    shard = stale_status_shard(image, shard_count)
+    if shard is None:
+        return False
+    try:
+        table.update_item(
+            Key={"id": image["id"]["S"]},
+            UpdateExpression="SET #shard = :shard",
+            ConditionExpression="#status = :status",
+            ExpressionAttributeNames={"#status": "status", "#shard": STATUS_SHARD_ATTRIBUTE},
+            ExpressionAttributeValues={":status": image["status"]["S"], ":shard": shard},
+        )
+    except Exception as e:
+        code = (getattr(e, "response", None) or {}).get("Error", {}).get("Code")
+        if code != "ConditionalCheckFailedException":
+            raise
+        return False
+    return True
+
+
+def parse_status_filter(params, valid_statuses):
+    """
+    Reads the 'status', 'since' and 'until' query parameters.
+    Returns None when no status filter was requested.
+    """
+    params = params or {}
+    status = params.get("status")
+    since = params.get("since")
+    until = params.get("until")
+
+    if status is None:
+        if since or until:
+            raise PaginationError("The 'since' and 'until' filters require 'status'.")
+        return None
+    if status not in valid_statuses:
+        raise PaginationError(f"Invalid status '{status}'.")
+
+    return {
+        "status": status,
+        "since": _created_at_bound("since", since),
+        "until": _created_at_bound("until", until),
+    }
+
+
+def _created_at_bound(name, value):
+    """
+    Converts an ISO 8601 (YYYY-MM-DDTHH:MM:SSZ) filter into the createdAt format.
+    """
+    if value is None:
+        return None
+    try:
+        parsed = datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
+    except ValueError:
+        raise PaginationError(f"'{name}' must be in ISO 8601 format (YYYY-MM-DDTHH:MM:SSZ).")
+    return parsed.isoformat()
+
+
+def query_by_status(table, status, limit, cursor=None, since=None, until=None, due_after=None, due_before=None,
+                    shard_count=None):
+    """
+    Lists work orders with the given status, most recent first, using Query on
+    the status index instead of a full table scan. The status is also applied
+    as a filter, so an order whose statusShard was not re-derived after a
+    status change is left out instead of being listed under the old status.
+    `due_after`/`due_before` filter on deliveryDate; they read every order
+    with the status, so they are meant for ranges the delivery index cannot
+    serve, such as "overdue" with no lower bound.
+    Returns (items, next_cursor).
+    """
+    shard_count = shard_count or STATUS_SHARD_COUNT
+    if cursor is not None:
+        if not isinstance(cursor.get("partitions"), dict):
+            raise PaginationError("Invalid 'nextToken'.")
+        cursor = cursor["partitions"]
+
+    partitions = [f"{status}#{shard}" for shard in range(shard_count)]
+    condition = "#shard = :shard"
+    names = {"#shard": STATUS_SHARD_ATTRIBUTE, "#status": "status"}
+    values = {":status": status}
+    if since and until:
+        condition += " AND #createdAt BETWEEN :since AND :until"
+        values.update({":since": since, ":until": until})
+    elif since:
+        condition += " AND #createdAt >= :since"
+        values[":since"] = since
+    elif until:
+        condition += " AND #createdAt <= :until"
+        values[":until"] = until
+    if since or until:
+        names["#createdAt"] = CREATED_AT_ATTRIBUTE
+    filters = ["#status = :status"]
+    if due_after:
+        filters.append("#deliveryDate >= :dueAfter")
+        values[":dueAfter"] = due_after
+    if due_before:
+        filters.append("#deliveryDate <= :dueBefore")
+        values[":dueBefore"] = due_before
+    if due_after or due_before:
+        names["#deliveryDate"] = "deliveryDate"
+
+    def build_query(partition):
+        return {
+            "IndexName": STATUS_INDEX_NAME,
+            "KeyConditionExpression": condition,
+            "ExpressionAttributeNames": names,
+            "ExpressionAttributeValues": {":shard": partition, **values},
+            "FilterExpression": " AND ".join(filters),
+            "ScanIndexForward": False,
+        }
+
+    items, next_cursor = query_partitions(
+        table, partitions, build_query,
+        sort_key=CREATED_AT_ATTRIBUTE,
+        key_attributes=STATUS_INDEX_KEY_ATTRIBUTES,
+        limit=limit,
+        cursor=cursor,
+        descending=True,
+    )
+    return items, {"partitions": next_cursor} if next_cursor else None
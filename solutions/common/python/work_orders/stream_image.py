@@ -0,0 +1,193 @@
+"""
+Conversion between plain Python values and DynamoDB attribute values: the
+encoder used for low-level client requests, the decoder for stream images
+(as delivered to Lambda) and the decoder for low-level client responses.
+"""
+import base64
+from collections.abc import Mapping
+from decimal import Decimal
+
+
+def serialize_value(value):
+    """
+    Encodes a Python value as a DynamoDB attribute value, e.g. 5 -> {"N": "5"}.
+    """
+    if value is None:
+        return {"NULL": True}
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, str):
+        return {"S": value}
+    if isinstance(value, (int, float, Decimal)):
+        return {"N": str(value)}
+    if isinstance(value, (bytes, bytearray)):
+        return {"B": bytes(value)}
+    if isinstance(value, (set, frozenset)) and value:
+        if all(isinstance(element, str) for element in value):
+            return {"SS": sorted(value)}
+        if all(isinstance(element, (bytes, bytearray)) for element in value):
+            return {"BS": sorted(bytes(element) for element in value)}
+        if all(isinstance(element, (int, float, Decimal)) and not isinstance(element, bool) for element in value):
+            return {"NS": [str(element) for element in value]}
+    if isinstance(value, dict):
+        return {"M": serialize_item(value)}
+    if isinstance(value, (list, tuple)):
+        return {"L": [serialize_value(element) for element in value]}
+    raise TypeError(f"Unsupported DynamoDB value of type {type(value).__name__}")
+
+
+def serialize_item(item):
+    """
+    Encodes a plain dict as a low-level DynamoDB item.
+    """
+    return {name: serialize_value(value) for name, value in item.items()}
+
+
+def _number(value):
+    """
+    Integers are returned as int; any other number keeps its precision as Decimal.
+    """
+    try:
+        return int(value)
+    except ValueError:
+        return Decimal(value)
+
+
+def _identity(value):
+    return value
+
+
+def _null(value):
+    return None
+
+
+def _binary(value):
+    return base64.b64decode(value)
+
+
+def _number_set(values):
+    return {_number(value) for value in values}
+
+
+def _binary_set(values):
+    return {base64.b64decode(value) for value in values}
+
+
+def _list(values):
+    return [deserialize_value(value) for value in values]
+
+
+def _map(value):
+    return deserialize_image(value)
+
+
+# Decoder per DynamoDB type tag
+DECODERS = {
+    "S": _identity,
+    "N": _number,
+    "BOOL": _identity,
+    "NULL": _null,
+    "M": _map,
+    "L": _list,
+    "SS": set,
+    "NS": _number_set,
+    "B": _binary,
+    "BS": _binary_set,
+}
+
+
+def deserialize_value(attribute):
+    """
+    Decodes a single DynamoDB attribute value, e.g. {"N": "5"} -> 5.
+    """
+    (tag, value), = attribute.items()
+    return value if tag == "S" else DECODERS[tag](value)
+
+
+def deserialize_image(image):
+    """
+    Converts a DynamoDB stream image (NewImage/OldImage) into a plain dict.
+    Supports every DynamoDB type: S, N, B, BOOL, NULL, M, L, SS, NS and BS.
+    """
+    decoders = DECODERS
+    item = {}
+    for name, attribute in image.items():
+        (tag, value), = attribute.items()
+        # Strings are by far the most common type and need no decoding
+        item[name] = value if tag == "S" else decoders[tag](value)
+    return item
+
+
+def _client_list(values):
+    return [deserialize_client_value(value) for value in values]
+
+
+def _client_map(value):
+    return deserialize_item(value)
+
+
+# The low-level client returns binary values already decoded from base64 as
+# bytes; stream records delivered to Lambda carry them as base64 strings
+CLIENT_DECODERS = {**DECODERS, "M": _client_map, "L": _client_list, "B": _identity, "BS": set}
+
+
+def deserialize_client_value(attribute):
+    """
+    Decodes a single attribute value returned by the low-level client.
+    """
+    (tag, value), = attribute.items()
+    return value if tag == "S" else CLIENT_DECODERS[tag](value)
+
+
+def deserialize_item(item):
+    """
+    Converts an item returned by the low-level client (GetItem, Query, Scan...)
+    into a plain dict. Unlike stream images, binary values are already bytes.
+    """
+    decoders = CLIENT_DECODERS
+    decoded = {}
+    for name, attribute in item.items():
+        (tag, value), = attribute.items()
+        decoded[name] = value if tag == "S" else decoders[tag](value)
+    return decoded
+
+
+def deserialize_fields(image, fields):
+    """
+    Decodes only the given fields of a stream image, skipping missing ones.
+    """
+    return {name: deserialize_value(image[name]) for name in fields if name in image}
+
+
+class LazyImage(Mapping):
+    """
+    Read-only view of a stream image that decodes each attribute on first access.
+    Routing code can read 'id' or 'status' without decoding the whole item.
+    """
+
+    __slots__ = ("_image", "_decoded")
+
+    def __init__(self, image):
+        self._image = image
+        self._decoded = {}
+
+    def __getitem__(self, name):
+        try:
+            return self._decoded[name]
+        except KeyError:
+            value = self._decoded[name] = deserialize_value(self._image[name])
+            return value
+
+    def __iter__(self):
+        return iter(self._image)
+
+    def __len__(self):
+        return len(self._image)
+
+    def to_dict(self, names=None):
+        """
+        Decodes every attribute, or only `names` when given, reusing the ones already decoded.
+        """
+        if names is None:
+            return {name: self[name] for name in self._image}
+        return {name: self[name] for name in names if name in self._image}
@@ -0,0 +1,98 @@
+import os
+from datetime import datetime
+
+VALID_STATUSES = frozenset({"received", "in_progress", "completed", "canceled"})
+REQUIRED_FIELDS = ("description", "deliveryDate", "status")
+
+# Field length limits (characters)
+MAX_DESCRIPTION_LENGTH = int(os.getenv("MAX_DESCRIPTION_LENGTH", "1000"))
+MAX_CANCELLATION_REASON_LENGTH = int(os.getenv("MAX_CANCELLATION_REASON_LENGTH", "500"))
+MAX_CUSTOMER_ID_LENGTH = int(os.getenv("MAX_CUSTOMER_ID_LENGTH", "128"))
+
+INVALID_DATE_MESSAGE = "Invalid date format. The 'deliveryDate' must be in ISO 8601 format (YYYY-MM-DDTHH:MM:SSZ)."
+
+
+def is_valid_iso8601(value):
+    """
+    Validates if a string is in ISO 8601 format (YYYY-MM-DDTHH:MM:SSZ).
+    The fixed layout is checked first, then the C parser validates the
+    calendar; both are much cheaper than strptime with a format string.
+    """
+    if type(value) is not str or len(value) != 20 or not value.isascii():
+        return False
+    if (value[4] != "-" or value[7] != "-" or value[10] != "T"
+            or value[13] != ":" or value[16] != ":" or value[19] != "Z"):
+        return False
+    try:
+        datetime.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+class WorkOrderValidator:
+    """
+    Validates work order payloads. The schema (statuses, limits) is prepared
+    once, so a valid payload only goes through a handful of dict lookups and
+    the date check. Every problem is reported: 'message' is the first one,
+    'errors' lists all of them.
+    """
+
+    def __init__(self, valid_statuses=VALID_STATUSES, max_description_length=None,
+                 max_cancellation_reason_length=None, max_customer_id_length=None):
+        self.valid_statuses = frozenset(valid_statuses)
+        self.valid_status_list = tuple(sorted(self.valid_statuses))
+        self.limits = (
+            ("description", max_description_length or MAX_DESCRIPTION_LENGTH),
+            ("cancellationReason", max_cancellation_reason_length or MAX_CANCELLATION_REASON_LENGTH),
+            # Optional: the customer or tenant the order belongs to (used for message grouping)
+            ("customerId", max_customer_id_length or MAX_CUSTOMER_ID_LENGTH),
+        )
+
+    def __call__(self, body):
+        """
+        Returns the error body for a 400 response, or None if the payload is valid.
+        """
+        if not isinstance(body, dict):
+            return {"message": "The work order must be a JSON object."}
+
+        errors = self.errors(body)
+        if not errors:
+            return None
+
+        result = {"message": errors[0][1]}
+        for _, _, details in errors:
+            result.update(details)
+        result["errors"] = [{"field": field, "message": message} for field, message, _ in errors]
+        return result
+
+    def errors(self, body):
+        """
+        Returns a list of (field, message, details) tuples, empty when the payload is valid.
+        """
+        errors = []
+
+        if "description" not in body or "deliveryDate" not in body or "status" not in body:
+            missing_fields = [field for field in REQUIRED_FIELDS if field not in body]
+            errors.append((None, "Missing required fields.", {"missingFields": missing_fields}))
+
+        status = body.get("status")
+        if "status" in body and (type(status) is not str or status not in self.valid_statuses):
+            errors.append(("status", f"Invalid status '{status}'.", {"validStatuses": list(self.valid_status_list)}))
+
+        if "deliveryDate" in body and not is_valid_iso8601(body["deliveryDate"]):
+            errors.append(("deliveryDate", INVALID_DATE_MESSAGE, {}))
+
+        if status == "canceled" and "cancellationReason" not in body:
+            errors.append(("cancellationReason", "Cancellation reason is required when status is 'canceled'.", {}))
+
+        for field, limit in self.limits:
+            value = body.get(field)
+            if value is None:
+                continue
+            if type(value) is not str:
+                errors.append((field, f"The '{field}' field must be a string.", {}))
+            elif len(value) > limit:
+                errors.append((field, f"The '{field}' field must be at most {limit} characters long.", {}))
+
+        return errors
@@ -0,0 +1,107 @@
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders import batch
+
+
+def no_sleep(seconds):
+    pass
+
+
+class TestBatch(unittest.TestCase):
+
+    def test_chunked(self):
+        self.assertEqual(batch.chunked(list(range(5)), 2), [[0, 1], [2, 3], [4]])
+
+    def test_parse_batch_errors(self):
+        for body in [{}, {"workOrders": []}, {"workOrders": "x"}, {"workOrders": [{}] * 3}]:
+            with self.assertRaises(batch.BatchError):
+                batch.parse_batch(body, max_size=2)
+
+    def test_batch_write_items_retries_unprocessed(self):
+        dynamodb = MagicMock()
+        items = [{"id": str(i)} for i in range(30)]
+        unprocessed = {"UnprocessedItems": {"TestTable": [{"PutRequest": {"Item": {"id": "3"}}}]}}
+        dynamodb.batch_write_item.side_effect = [unprocessed, {}, {}]
+
+        failed = batch.batch_write_items(dynamodb, "TestTable", items, sleep=no_sleep)
+        self.assertEqual(failed, {})
+        # Dos chunks (25 + 5) y un reintento del ítem no procesado
+        self.assertEqual(dynamodb.batch_write_item.call_count, 3)
+        retried = dynamodb.batch_write_item.call_args_list[1].kwargs["RequestItems"]["TestTable"]
+        self.assertEqual(retried, [{"PutRequest": {"Item": {"id": "3"}}}])
+
+    def test_batch_write_items_reports_failures(self):
+        dynamodb = MagicMock()
+        dynamodb.batch_write_item.return_value = {
+            "UnprocessedItems": {"TestTable": [{"PutRequest": {"Item": {"id": "1"}}}]}
+        }
+        failed = batch.batch_write_items(dynamodb, "TestTable", [{"id": "1"}], max_attempts=2, sleep=no_sleep)
+        self.assertIn("1", failed)
+        self.assertEqual(dynamodb.batch_write_item.call_count, 2)
+
+    def test_send_message_batch_retries_only_server_faults(self):
+        sqs = MagicMock()
+        sqs.send_message_batch.side_effect = [
+            {"Failed": [
+                {"Id": "a", "Code": "InternalError", "SenderFault": False},
+                {"Id": "b", "Code": "InvalidMessageContents", "Message": "bad", "SenderFault": True},
+            ]},
+            {"Failed": []},
+        ]
+        entries = [{"Id": "a", "MessageBody": "{}"}, {"Id": "b", "MessageBody": "{}"}]
+        failed = batch.send_message_batch(sqs, "queue-url", entries, sleep=no_sleep)
+        self.assertEqual(failed, {"b": "bad"})
+        self.assertEqual(sqs.send_message_batch.call_args.kwargs["Entries"], [entries[0]])
+
+    def test_send_message_batch_ordered_stops_after_failure(self):
+        sqs = MagicMock()
+        sqs.send_message_batch.return_value = {
+            "Failed": [{"Id": "0", "Code": "InvalidParameterValue", "Message": "bad", "SenderFault": True}]
+        }
+        entries = [{"Id": str(i), "MessageBody": "{}"} for i in range(15)]
+        failed = batch.send_message_batch(sqs, "queue-url", entries, sleep=no_sleep, ordered=True)
+        # El segundo chunk no se envía para no adelantar mensajes al reintento
+        self.assertEqual(sqs.send_message_batch.call_count, 1)
+        self.assertEqual(set(failed), {"0"} | {str(i) for i in range(10, 15)})
+
+    def test_put_events_batch_strips_ids(self):
+        eventbridge = MagicMock()
+        eventbridge.put_events.return_value = {
+            "FailedEntryCount": 1,
+            "Entries": [{"EventId": "1"}, {"ErrorCode": "ValidationException", "ErrorMessage": "invalid"}],
+        }
+        entries = [{"Id": "a", "Detail": "{}"}, {"Id": "b", "Detail": "{}"}]
+        failed = batch.put_events_batch(eventbridge, entries, sleep=no_sleep)
+        self.assertEqual(failed, {"b": "invalid"})
+        sent = eventbridge.put_events.call_args.kwargs["Entries"]
+        self.assertNotIn("Id", sent[0])
+
+    def test_create_batch_reports_each_item(self):
+        def validate(payload):
+            return None if payload.get("ok") else {"message": "invalid"}
+
+        built = iter(["1", "2", "3"])
+
+        def build(payload):
+            return {"id": next(built)}
+
+        results, all_created = batch.create_batch(
+            [{"ok": True}, {"ok": False}, "x", {"ok": True}],
+            validate=validate,
+            build=build,
+            store=lambda work_orders: {"2": "throttled"},
+            publish=lambda work_orders: {},
+        )
+        self.assertFalse(all_created)
+        self.assertEqual([result["statusCode"] for result in results], [201, 400, 400, 500])
+        self.assertTrue(results[0]["published"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders import clients
+
+
+class TestClients(unittest.TestCase):
+
+    def setUp(self):
+        clients.reset()
+        # Simulamos boto3 para verificar cuándo se crean los clientes
+        self.boto3 = MagicMock()
+        self.modules = patch.dict(sys.modules, {"boto3": self.boto3})
+        self.modules.start()
+        self.config = patch("work_orders.clients.client_config", return_value="config")
+        self.config.start()
+
+    def tearDown(self):
+        self.config.stop()
+        self.modules.stop()
+        clients.reset()
+
+    def test_lazy_client_is_created_on_first_use(self):
+        sqs = clients.lazy_client("sqs")
+        self.boto3.client.assert_not_called()
+
+        sqs.send_message(QueueUrl="queue-url")
+        sqs.send_message(QueueUrl="queue-url")
+        self.boto3.client.assert_called_once_with("sqs", config="config")
+
+    def test_tables_are_cached(self):
+        dynamodb = clients.lazy_resource("dynamodb")
+        first = dynamodb.Table("WorkOrdersTable")
+        second = dynamodb.Table("WorkOrdersTable")
+        self.assertIs(first, second)
+        # DynamoDB usa el cliente de bajo nivel, no la capa de recursos de boto3
+        self.boto3.client.assert_called_once_with("dynamodb", config="config")
+        self.boto3.resource.assert_not_called()
+        self.assertEqual(first.name, "WorkOrdersTable")
+        self.assertIs(first.meta.client, self.boto3.client.return_value)
+
+    def test_introspection_does_not_create_clients(self):
+        sqs = clients.lazy_client("sqs")
+        self.assertFalse(hasattr(sqs, "__code__"))
+        self.boto3.client.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import base64
+import gzip
+import json
+import os
+import sys
+import unittest
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders import compression
+
+
+def json_response(size):
+    body = json.dumps({"data": {"items": [{"id": str(i), "status": "received"} for i in range(size)]}})
+    return {"statusCode": 200, "headers": {"Content-Type": "application/json"}, "body": body}
+
+
+class TestCompression(unittest.TestCase):
+
+    def test_negotiate(self):
+        self.assertEqual(compression.negotiate("gzip, deflate"), "gzip")
+        self.assertEqual(compression.negotiate("*"), next(iter(compression.ENCODERS)))
+        self.assertIsNone(compression.negotiate("gzip;q=0, deflate"))
+        self.assertIsNone(compression.negotiate("identity"))
+        self.assertIsNone(compression.negotiate(None))
+        self.assertIsNone(compression.negotiate("*;q=0"))
+
+    def test_compresses_large_bodies(self):
+        original = json_response(200)
+        result = compression.compress_response(original, {"accept-encoding": "gzip"}, min_bytes=100)
+        self.assertTrue(result["isBase64Encoded"])
+        self.assertEqual(result["headers"]["Content-Encoding"], "gzip")
+        self.assertEqual(result["headers"]["Content-Type"], "application/json")
+        self.assertEqual(gzip.decompress(base64.b64decode(result["body"])).decode("utf-8"), original["body"])
+        self.assertLess(len(result["body"]), len(original["body"]))
+
+    def test_skips_small_bodies_and_unsupported_clients(self):
+        small = json_response(1)
+        self.assertIs(compression.compress_response(small, {"Accept-Encoding": "gzip"}, min_bytes=1024), small)
+        large = json_response(200)
+        self.assertIs(compression.compress_response(large, {"Accept-Encoding": "deflate"}, min_bytes=100), large)
+        self.assertIs(compression.compress_response(large, None, min_bytes=100), large)
+
+    def test_request_body(self):
+        encoded = base64.b64encode('{"status": "received"}'.encode("utf-8")).decode("ascii")
+        self.assertEqual(compression.request_body({"body": encoded, "isBase64Encoded": True}), '{"status": "received"}')
+        self.assertEqual(compression.request_body({"body": "{}"}), "{}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders import conditional
+
+
+class TestConditional(unittest.TestCase):
+
+    def test_content_etag_is_stable(self):
+        self.assertEqual(conditional.content_etag('{"a":1}'), conditional.content_etag('{"a":1}'))
+        self.assertNotEqual(conditional.content_etag('{"a":1}'), conditional.content_etag('{"a":2}'))
+        # Débil: la misma representación se envía comprimida o sin comprimir
+        self.assertTrue(conditional.content_etag('{"a":1}').startswith('W/"'))
+
+    def test_page_etag_depends_on_version_and_page(self):
+        etag = conditional.page_etag(3, {"limit": "10"})
+        self.assertTrue(etag.startswith('W/"3-'))
+        self.assertEqual(etag, conditional.page_etag(3, {"limit": "10", "ignored": "x"}))
+        self.assertNotEqual(etag, conditional.page_etag(4, {"limit": "10"}))
+        self.assertNotEqual(etag, conditional.page_etag(3, {"limit": "20"}))
+
+    def test_if_none_match(self):
+        etag = conditional.page_etag(1, None)
+        self.assertTrue(conditional.if_none_match({"if-none-match": f'"other", {etag}'}, etag))
+        # La comparación es débil: W/"x" coincide con "x"
+        self.assertTrue(conditional.if_none_match({"If-None-Match": etag[2:]}, etag))
+        self.assertTrue(conditional.if_none_match({"If-None-Match": "*"}, etag))
+        self.assertFalse(conditional.if_none_match({"If-None-Match": '"other"'}, etag))
+        self.assertFalse(conditional.if_none_match(None, etag))
+
+    def test_not_modified_has_no_body(self):
+        response = conditional.not_modified('"x"')
+        self.assertEqual((response["statusCode"], response["body"]), (304, ""))
+        self.assertEqual(response["headers"]["ETag"], '"x"')
+        self.assertIn("Cache-Control", response["headers"])
+
+    def test_watermark(self):
+        dynamodb = MagicMock()
+        table = dynamodb.Table.return_value
+        table.get_item.return_value = {}
+        self.assertEqual(conditional.read_watermark(dynamodb, "Meta"), 0)
+
+        table.get_item.return_value = {"Item": {"id": "work-orders", "version": 7}}
+        self.assertEqual(conditional.read_watermark(dynamodb, "Meta"), 7)
+        self.assertTrue(table.get_item.call_args.kwargs["ConsistentRead"])
+
+        # Justo después de un incremento las páginas pueden no reflejarlo todavía
+        table.get_item.return_value = {"Item": {"id": "work-orders", "version": 8, "updatedAt": 100}}
+        self.assertIsNone(conditional.read_watermark(dynamodb, "Meta", now=lambda: 102, settle_seconds=5))
+        self.assertEqual(conditional.read_watermark(dynamodb, "Meta", now=lambda: 106, settle_seconds=5), 8)
+
+        conditional.touch_watermark(dynamodb, "Meta", now=lambda: 100)
+        kwargs = table.update_item.call_args.kwargs
+        self.assertIn("ADD version :one", kwargs["UpdateExpression"])
+        self.assertEqual(kwargs["ExpressionAttributeValues"], {":one": 1, ":now": 100})
+
+
+    def test_page_etag_expires(self):
+        period = conditional.WATERMARK_MAX_AGE_SECONDS
+        self.assertEqual(conditional.page_etag(3, None, now=lambda: 0), conditional.page_etag(3, None, now=lambda: 1))
+        self.assertNotEqual(conditional.page_etag(3, None, now=lambda: 0), conditional.page_etag(3, None, now=lambda: period))
+
+    def test_failed_bump_disables_watermark_etags(self):
+        dynamodb = MagicMock()
+        table = dynamodb.Table.return_value
+        table.get_item.return_value = {"Item": {"id": "work-orders", "version": 7}}
+        table.update_item.side_effect = RuntimeError("throttled")
+        with self.assertRaises(RuntimeError):
+            conditional.touch_watermark(dynamodb, "Meta")
+        self.assertIsNone(conditional.read_watermark(dynamodb, "Meta"))
+
+        # Un incremento correcto vuelve a habilitarlos
+        table.update_item.side_effect = None
+        conditional.touch_watermark(dynamodb, "Meta")
+        self.assertEqual(conditional.read_watermark(dynamodb, "Meta"), 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import json
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders import consumer
+
+FIFO_URL = "https://sqs.us-east-1.amazonaws.com/123/work-orders-received.fifo"
+
+
+def message(message_id, group_id, work_order_id=None):
+    return {
+        "MessageId": message_id,
+        "ReceiptHandle": f"receipt-{message_id}",
+        "Body": json.dumps({"id": work_order_id or message_id, "status": "received"}),
+        "Attributes": {"MessageGroupId": group_id},
+    }
+
+
+def fake_sqs():
+    sqs = MagicMock()
+    sqs.delete_message_batch.return_value = {"Successful": [], "Failed": []}
+    sqs.change_message_visibility_batch.return_value = {"Successful": [], "Failed": []}
+    return sqs
+
+
+def deleted_ids(sqs):
+    return [
+        entry["Id"]
+        for call in sqs.delete_message_batch.call_args_list
+        for entry in call.kwargs["Entries"]
+    ]
+
+
+class TestDecode(unittest.TestCase):
+
+    def test_raw_sns_and_eventbridge_bodies(self):
+        work_order = {"id": "1", "status": "received"}
+        raw = json.dumps(work_order)
+        self.assertEqual(consumer.decode_work_order(raw), work_order)
+        sns = json.dumps({"Type": "Notification", "Message": raw})
+        self.assertEqual(consumer.decode_work_order(sns), work_order)
+        eventbridge = json.dumps({"detail-type": "WorkOrderCreated", "detail": work_order})
+        self.assertEqual(consumer.decode_work_order(eventbridge), work_order)
+
+
+class TestQueueConsumer(unittest.TestCase):
+
+    def test_receive_uses_long_polling_and_batches_of_ten(self):
+        sqs = fake_sqs()
+        sqs.receive_message.return_value = {}
+        service = consumer.QueueConsumer(sqs, FIFO_URL, handler=lambda work_order: None, workers=2)
+        self.assertEqual(service.receive(), [])
+        kwargs = sqs.receive_message.call_args.kwargs
+        self.assertEqual((kwargs["MaxNumberOfMessages"], kwargs["WaitTimeSeconds"]), (10, 20))
+        service.close()
+
+    def test_process_deletes_handled_messages_in_one_batch(self):
+        sqs = fake_sqs()
+        handled = []
+        service = consumer.QueueConsumer(sqs, FIFO_URL, handler=lambda work_order: handled.append(work_order["id"]))
+        messages = [message(str(i), f"group-{i % 3}") for i in range(10)]
+        self.assertEqual(service.process(messages), 10)
+        self.assertEqual(sorted(handled), sorted(m["MessageId"] for m in messages))
+        sqs.delete_message_batch.assert_called_once()
+        service.close()
+
+    def test_fifo_group_stops_after_a_failure(self):
+        sqs = fake_sqs()
+        handled = []
+
+        def handler(work_order):
+            if work_order["id"] == "a2":
+                raise RuntimeError("boom")
+            handled.append(work_order["id"])
+
+        service = consumer.QueueConsumer(sqs, FIFO_URL, handler=handler, workers=4)
+        messages = [message("a1", "a"), message("b1", "b"), message("a2", "a"), message("a3", "a"), message("b2", "b")]
+        self.assertEqual(service.process(messages), 3)
+        # a3 no adelanta a a2, que se reintentará; el grupo b no se ve afectado
+        self.assertNotIn("a3", handled)
+        self.assertEqual(sorted(deleted_ids(sqs)), ["a1", "b1", "b2"])
+        self.assertEqual((service.handled, service.failed), (3, 2))
+        service.close()
+
+    def test_groups_run_in_parallel_and_each_group_in_order(self):
+        sqs = fake_sqs()
+        order = {}
+        barrier = threading.Barrier(2, timeout=5)
+
+        def handler(work_order):
+            group = work_order["id"][0]
+            if work_order["id"].endswith("1"):
+                # Ambos grupos deben estar en curso a la vez para pasar la barrera
+                barrier.wait()
+            order.setdefault(group, []).append(work_order["id"])
+
+        service = consumer.QueueConsumer(sqs, FIFO_URL, handler=handler, workers=2)
+        messages = [message("a1", "a"), message("b1", "b"), message("a2", "a"), message("b2", "b")]
+        self.assertEqual(service.process(messages), 4)
+        self.assertEqual(order, {"a": ["a1", "a2"], "b": ["b1", "b2"]})
+        service.close()
+
+    def test_heartbeat_extends_tracked_messages(self):
+        sqs = fake_sqs()
+        heartbeat = consumer.VisibilityHeartbeat(sqs, FIFO_URL, timeout=30)
+        heartbeat.track([message("1", "a"), message("2", "a")])
+        heartbeat.release([message("1", "a")])
+        heartbeat.beat()
+        entries = sqs.change_message_visibility_batch.call_args.kwargs["Entries"]
+        self.assertEqual(entries, [{"Id": "2", "ReceiptHandle": "receipt-2", "VisibilityTimeout": 30}])
+
+
+class TestLambdaAdapter(unittest.TestCase):
+
+    def test_batch_item_failures_keep_fifo_order(self):
+        def handler(work_order):
+            if work_order["id"] == "a1":
+                raise RuntimeError("boom")
+
+        records = [
+            {"messageId": m["MessageId"], "body": m["Body"], "attributes": m["Attributes"]}
+            for m in [message("a1", "a"), message("b1", "b"), message("a2", "a")]
+        ]
+        result = consumer.sqs_batch_handler(handler)({"Records": records}, {})
+        self.assertEqual(result, {"batchItemFailures": [{"itemIdentifier": "a1"}, {"itemIdentifier": "a2"}]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+import json
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders import conditional, core
+from work_orders.publishers import NullPublisher
+
+
+def post(body, resource="/work-orders"):
+    return {"httpMethod": "POST", "resource": resource, "body": json.dumps(body)}
+
+
+VALID_BODY = {"description": "Test work order", "deliveryDate": "2025-02-14T12:00:00Z", "status": "received"}
+
+
+class TestCore(unittest.TestCase):
+
+    def test_validate_reports_missing_fields(self):
+        error = core.validate_work_order({"status": "received"})
+        self.assertEqual(error["missingFields"], ["description", "deliveryDate"])
+
+    def test_validate_valid_body(self):
+        self.assertIsNone(core.validate_work_order(VALID_BODY))
+
+    def test_create_publishes_through_publisher(self):
+        dynamodb = MagicMock()
+        publisher = MagicMock(enabled=True)
+        response = core.WorkOrderService(dynamodb, "TestTable", publisher).handle(post(VALID_BODY))
+        self.assertEqual(response["statusCode"], 201)
+        dynamodb.Table.return_value.put_item.assert_called_once()
+        publisher.publish.assert_called_once()
+
+    @patch("work_orders.dispatch.PUBLISH_MODE", "concurrent")
+    @patch("work_orders.dispatch.OUTBOX_TABLE", "Outbox")
+    def test_batch_hands_failed_publishes_to_the_outbox(self):
+        dynamodb = MagicMock()
+        dynamodb.meta.client.batch_write_item.return_value = {"UnprocessedItems": {}}
+        publisher = MagicMock(enabled=True)
+        publisher.publish_batch.side_effect = lambda orders: {orders[1]["id"]: "throttled"}
+        response = core.WorkOrderService(dynamodb, "TestTable", publisher).handle(
+            post({"workOrders": [VALID_BODY, VALID_BODY]}, resource="/work-orders/batch"))
+        results = json.loads(response["body"])["data"]["results"]
+        self.assertEqual([result["published"] for result in results], [True, False])
+        # Solo la orden no publicada pasa al relay del outbox
+        transaction = dynamodb.meta.client.transact_write_items.call_args.kwargs["TransactItems"]
+        self.assertEqual(transaction[0]["Update"]["Key"], {"id": {"S": results[1]["id"]}})
+        dynamodb.meta.client.transact_write_items.assert_called_once()
+
+    @patch("work_orders.dispatch.PUBLISH_MODE", "outbox")
+    def test_create_without_publisher_ignores_outbox(self):
+        # Sin publisher (el stream enruta las órdenes) no se escribe en el outbox
+        dynamodb = MagicMock()
+        response = core.WorkOrderService(dynamodb, "TestTable", NullPublisher()).handle(post(VALID_BODY))
+        self.assertEqual(response["statusCode"], 201)
+        dynamodb.Table.return_value.put_item.assert_called_once()
+        dynamodb.meta.client.transact_write_items.assert_not_called()
+
+    def test_list_not_modified_skips_the_table(self):
+        # Con la marca de agua sin cambios se responde 304 sin leer la tabla de órdenes
+        tables = {"TestTable": MagicMock(), "Meta": MagicMock()}
+        tables["Meta"].get_item.return_value = {"Item": {"version": 5}}
+        dynamodb = MagicMock()
+        dynamodb.Table.side_effect = tables.get
+        service = core.WorkOrderService(dynamodb, "TestTable", NullPublisher(), meta_table="Meta")
+        etag = conditional.page_etag(5, None)
+
+        response = service.handle({"httpMethod": "GET", "headers": {"If-None-Match": etag}})
+        self.assertEqual(response["statusCode"], 304)
+        tables["TestTable"].scan.assert_not_called()
+
+        tables["TestTable"].scan.return_value = {"Items": []}
+        response = service.handle({"httpMethod": "GET", "headers": {"If-None-Match": '"stale"'}})
+        self.assertEqual(response["statusCode"], 200)
+        self.assertEqual(response["headers"]["ETag"], etag)
+
+    def test_create_touches_the_watermark(self):
+        dynamodb = MagicMock()
+        service = core.WorkOrderService(dynamodb, "TestTable", NullPublisher(), meta_table="Meta")
+        self.assertEqual(service.handle(post(VALID_BODY))["statusCode"], 201)
+        dynamodb.Table.return_value.update_item.assert_called_once()
+
+    def test_failed_watermark_bump_is_reported(self):
+        dynamodb = MagicMock()
+        dynamodb.Table.return_value.update_item.side_effect = RuntimeError("throttled")
+        service = core.WorkOrderService(dynamodb, "TestTable", NullPublisher(), meta_table="Meta")
+        try:
+            response = service.handle(post(VALID_BODY))
+            # La orden se guarda, pero el cliente sabe que las páginas en caché no se invalidaron
+            self.assertEqual(response["statusCode"], 201)
+            self.assertEqual(response["headers"]["X-Cache-Invalidation"], "failed")
+            self.assertIsNone(service.watermark())
+        finally:
+            dynamodb.Table.return_value.update_item.side_effect = None
+            service.touch_watermark()
+
+    def test_list_without_watermark_uses_content_etag(self):
+        dynamodb = MagicMock()
+        dynamodb.Table.return_value.scan.return_value = {"Items": [{"id": "1"}]}
+        service = core.WorkOrderService(dynamodb, "TestTable", NullPublisher())
+        first = service.handle({"httpMethod": "GET"})
+        etag = first["headers"]["ETag"]
+        self.assertEqual(etag, conditional.content_etag(first["body"]))
+
+        second = service.handle({"httpMethod": "GET", "headers": {"if-none-match": etag}})
+        self.assertEqual((second["statusCode"], second["body"]), (304, ""))
+
+    def test_list_due_orders_queries_the_delivery_index(self):
+        dynamodb = MagicMock()
+        table = dynamodb.Table.return_value
+        table.query.return_value = {"Items": [{"id": "1", "deliveryDate": "2025-02-20T10:00:00Z"}]}
+        service = core.WorkOrderService(dynamodb, "TestTable", NullPublisher())
+        response = service.handle({"httpMethod": "GET", "queryStringParameters": {
+            "dueAfter": "2025-02-20T00:00:00Z", "dueBefore": "2025-02-21T00:00:00Z", "status": "in_progress"
+        }})
+        self.assertEqual(response["statusCode"], 200)
+        table.scan.assert_not_called()
+        # Dos días con 4 particiones cada uno
+        self.assertEqual(table.query.call_count, 8)
+        kwargs = table.query.call_args.kwargs
+        self.assertEqual(kwargs["IndexName"], "DeliveryDateIndex")
+        self.assertEqual(kwargs["ExpressionAttributeValues"][":status"], "in_progress")
+        self.assertEqual(json.loads(response["body"])["data"]["items"][0]["id"], "1")
+
+    def test_list_overdue_orders_queries_the_status_index(self):
+        dynamodb = MagicMock()
+        table = dynamodb.Table.return_value
+        table.query.return_value = {"Items": []}
+        service = core.WorkOrderService(dynamodb, "TestTable", NullPublisher())
+        response = service.handle({"httpMethod": "GET", "queryStringParameters": {
+            "dueBefore": "2025-02-20T09:00:00Z", "status": "in_progress"
+        }})
+        self.assertEqual(response["statusCode"], 200)
+        kwargs = table.query.call_args.kwargs
+        self.assertEqual(kwargs["IndexName"], "StatusCreatedAtIndex")
+        self.assertIn("#deliveryDate <= :dueBefore", kwargs["FilterExpression"])
+
+    def test_open_due_range_requires_a_status(self):
+        service = core.WorkOrderService(MagicMock(), "TestTable", NullPublisher())
+        response = service.handle({"httpMethod": "GET", "queryStringParameters": {"dueBefore": "2025-02-20T09:00:00Z"}})
+        self.assertEqual(response["statusCode"], 400)
+
+    def test_created_items_carry_the_index_attributes(self):
+        dynamodb = MagicMock()
+        core.WorkOrderService(dynamodb, "TestTable", NullPublisher()).handle(post(VALID_BODY))
+        item = dynamodb.Table.return_value.put_item.call_args.kwargs["Item"]
+        self.assertTrue(item["deliveryBucket"].startswith("2025-02-14#"))
+        self.assertIn("statusShard", item)
+
+    def test_listed_items_leave_out_the_index_attributes(self):
+        # Lo que se guarda lleva statusShard y deliveryBucket; el listado y el NDJSON no
+        dynamodb = MagicMock()
+        table = dynamodb.Table.return_value
+        service = core.WorkOrderService(dynamodb, "TestTable", NullPublisher())
+        service.handle(post(VALID_BODY))
+        table.scan.return_value = {"Items": [table.put_item.call_args.kwargs["Item"]]}
+
+        listed = json.loads(service.handle({"httpMethod": "GET"})["body"])["data"]["items"][0]
+        exported = json.loads(service.handle({"httpMethod": "GET", "queryStringParameters": {"format": "ndjson"}})["body"])
+        for item in (listed, exported):
+            self.assertNotIn("statusShard", item)
+            self.assertNotIn("deliveryBucket", item)
+            self.assertEqual(item["description"], VALID_BODY["description"])
+
+    def test_method_not_allowed(self):
+        service = core.WorkOrderService(MagicMock(), "TestTable", NullPublisher())
+        self.assertEqual(service.handle({"httpMethod": "DELETE"})["statusCode"], 405)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders import datamart
+
+
+def record(event_name, work_order_id, status, old_status=None, sequence="1", created=1739534400):
+    image = {
+        "id": {"S": work_order_id},
+        "createdAt": {"S": "2025-02-14T12:00:00"},
+        "description": {"S": "Test work order"},
+        "deliveryDate": {"S": "2025-02-20T12:00:00Z"},
+        "status": {"S": status},
+        "cancellationReason": {"NULL": True},
+        "customerId": {"S": "customer-1"},
+    }
+    stream = {"SequenceNumber": sequence, "ApproximateCreationDateTime": created}
+    if event_name == "REMOVE":
+        stream["OldImage"] = image
+    else:
+        stream["NewImage"] = image
+    if old_status:
+        stream["OldImage"] = dict(image, status={"S": old_status})
+    return {"eventID": f"event-{sequence}", "eventName": event_name, "dynamodb": stream}
+
+
+class TestDatamartRows(unittest.TestCase):
+
+    def test_change_row(self):
+        row = datamart.change_row(record("MODIFY", "1", "completed", old_status="in_progress"))
+        self.assertEqual((row["id"], row["status"], row["previousStatus"]), ("1", "completed", "in_progress"))
+        self.assertEqual(row["eventName"], "MODIFY")
+        self.assertIsNone(row["cancellationReason"])
+        self.assertEqual(row["customerId"], "customer-1")
+        self.assertEqual(datamart.partition(row), "status=completed/date=2025-02-14")
+
+    def test_remove_uses_the_old_image(self):
+        row = datamart.change_row(record("REMOVE", "1", "canceled"))
+        self.assertEqual((row["status"], row["eventName"]), ("canceled", "REMOVE"))
+
+    def test_micro_batcher_flushes_by_rows_and_time(self):
+        flushed = []
+        now = [0.0]
+        batcher = datamart.MicroBatcher(flushed.append, max_rows=3, max_bytes=10 ** 6, max_seconds=60,
+                                        clock=lambda: now[0])
+        for index in range(4):
+            batcher.add({"id": index})
+        self.assertEqual([len(rows) for rows in flushed], [3])
+        # La fila pendiente se escribe cuando vence la ventana de tiempo
+        now[0] = 61
+        batcher.add({"id": 4})
+        self.assertEqual([len(rows) for rows in flushed], [3, 2])
+
+    def test_local_store(self):
+        with tempfile.TemporaryDirectory() as root:
+            store = datamart.LocalStore(root)
+            store.put("status=received/date=2025-02-14/part-1.parquet", b"data")
+            self.assertEqual(store.list("status=received"), ["status=received/date=2025-02-14/part-1.parquet"])
+            self.assertEqual(store.get("status=received/date=2025-02-14/part-1.parquet"), b"data")
+            self.assertEqual(datamart.partitions(store), ["status=received/date=2025-02-14"])
+            store.delete(store.list())
+            self.assertEqual(store.list(), [])
+
+    def test_s3_store_paginates_and_strips_prefix(self):
+        s3 = MagicMock()
+        s3.list_objects_v2.side_effect = [
+            {"Contents": [{"Key": "work-orders/a.parquet"}], "IsTruncated": True, "NextContinuationToken": "t"},
+            {"Contents": [{"Key": "work-orders/b.parquet"}], "IsTruncated": False},
+        ]
+        store = datamart.make_store("s3://bucket/work-orders", s3=s3)
+        self.assertEqual(store.list(), ["a.parquet", "b.parquet"])
+        self.assertEqual(s3.list_objects_v2.call_args.kwargs["ContinuationToken"], "t")
+
+
+@unittest.skipUnless(datamart.pyarrow, "pyarrow is not installed")
+class TestDatamartFiles(unittest.TestCase):
+
+    def test_export_partitions_and_retries_are_idempotent(self):
+        records = [
+            record("INSERT", "1", "received", sequence="1"),
+            record("INSERT", "2", "received", sequence="2"),
+            record("MODIFY", "1", "in_progress", old_status="received", sequence="3"),
+        ]
+        with tempfile.TemporaryDirectory() as root:
+            store = datamart.LocalStore(root)
+            keys = datamart.export_records(records, store)
+            self.assertEqual(len(keys), 2)
+            # Un reintento del mismo lote sobrescribe los mismos ficheros
+            self.assertEqual(datamart.export_records(records, store), keys)
+            self.assertEqual(len(store.list()), 2)
+
+            table = datamart.decode_table(store.get(keys[0]))
+            self.assertEqual(table.column("id").to_pylist(), ["1", "2"])
+
+    def test_compaction_merges_small_files(self):
+        with tempfile.TemporaryDirectory() as root:
+            store = datamart.LocalStore(root)
+            for sequence in range(3):
+                datamart.export_records([record("INSERT", str(sequence), "received", sequence=str(sequence))], store)
+            merged = datamart.compact_all(store, min_files=3)
+            self.assertEqual(len(merged), 1)
+            self.assertEqual(store.list(), merged)
+            table = datamart.decode_table(store.get(merged[0]))
+            self.assertEqual(table.num_rows, 3)
+
+    def test_compaction_sorts_sequence_numbers_numerically(self):
+        with tempfile.TemporaryDirectory() as root:
+            store = datamart.LocalStore(root)
+            # Mismo instante de cambio: decide el número de secuencia, que no tiene longitud fija
+            for sequence in ("900", "1000", "10000000000000000000001"):
+                datamart.export_records([record("INSERT", sequence, "received", sequence=sequence)], store)
+            merged = datamart.compact_all(store, min_files=3)
+            table = datamart.decode_table(store.get(merged[0]))
+            self.assertEqual(table.column("sequenceNumber").to_pylist(), ["900", "1000", "10000000000000000000001"])
+            self.assertNotIn("_sequence", table.column_names)
+
+    def test_compaction_fills_columns_missing_from_older_files(self):
+        with tempfile.TemporaryDirectory() as root:
+            store = datamart.LocalStore(root)
+            keys = datamart.export_records([record("INSERT", "1", "received", sequence="1")], store)
+            # Un fichero escrito antes de que existiera la columna customerId
+            older = datamart.decode_table(store.get(keys[0])).drop_columns(["customerId"])
+            store.put(keys[0].replace("part-", "part-old-"), datamart.encode_table(older))
+            merged = datamart.compact_all(store, min_files=2)
+            table = datamart.decode_table(store.get(merged[0]))
+            self.assertCountEqual(table.column("customerId").to_pylist(), ["customer-1", None])
+
+    def test_arrow_format(self):
+        with tempfile.TemporaryDirectory() as root:
+            store = datamart.LocalStore(root)
+            keys = datamart.export_records([record("INSERT", "1", "received")], store, file_format="arrow")
+            self.assertTrue(keys[0].endswith(".arrow"))
+            self.assertEqual(datamart.decode_table(store.get(keys[0]), "arrow").num_rows, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
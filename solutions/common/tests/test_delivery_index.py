@@ -0,0 +1,150 @@
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders import delivery_index
+from work_orders.delivery_index import with_delivery_bucket
+from work_orders.pagination import PaginationError
+
+
+class FakeDeliveryIndexTable:
+    """
+    Tabla en memoria que simula Query sobre DeliveryDateIndex (con FilterExpression por estado).
+    """
+
+    def __init__(self, items, page_size=2):
+        self.items = items
+        self.page_size = page_size
+        self.partitions = []
+        self._lock = threading.Lock()
+
+    def query(self, **kwargs):
+        values = kwargs["ExpressionAttributeValues"]
+        partition = values[":bucket"]
+        with self._lock:
+            self.partitions.append(partition)
+        matches = sorted(
+            (item for item in self.items
+             if item["deliveryBucket"] == partition
+             and values[":dueAfter"] <= item["deliveryDate"] <= values[":dueBefore"]),
+            key=lambda item: (item["deliveryDate"], item["id"]),
+        )
+        start = kwargs.get("ExclusiveStartKey")
+        if start:
+            ids = [item["id"] for item in matches]
+            matches = matches[ids.index(start["id"]) + 1:]
+        size = min(kwargs["Limit"], self.page_size)
+        page = matches[:size]
+        result = {"Items": [item for item in page if ":status" not in values or item["status"] == values[":status"]]}
+        if len(matches) > size:
+            result["LastEvaluatedKey"] = {
+                "id": page[-1]["id"],
+                "deliveryBucket": partition,
+                "deliveryDate": page[-1]["deliveryDate"],
+            }
+        return result
+
+
+def work_orders(count, days=3):
+    return [
+        with_delivery_bucket({
+            "id": f"order-{i:03d}",
+            "deliveryDate": f"2025-02-{20 + i % days}T{i % 24:02d}:00:00Z",
+            "status": "completed" if i % 5 == 0 else "in_progress",
+        })
+        for i in range(count)
+    ]
+
+
+def read_all(table, limit, **kwargs):
+    items, cursor = [], None
+    while True:
+        page, cursor = delivery_index.query_by_delivery_date(table, limit, cursor=cursor, **kwargs)
+        items.extend(page)
+        if not cursor:
+            return items
+
+
+class TestDeliveryIndex(unittest.TestCase):
+
+    def test_delivery_bucket_is_the_day_plus_a_shard(self):
+        bucket = delivery_index.delivery_bucket("2025-02-20T12:00:00Z", "1234", 4)
+        self.assertEqual(bucket, delivery_index.delivery_bucket("2025-02-20T08:00:00Z", "1234", 4))
+        self.assertTrue(bucket.startswith("2025-02-20#"))
+
+    def test_parse_due_filter(self):
+        self.assertIsNone(delivery_index.parse_due_filter({}))
+        parsed = delivery_index.parse_due_filter({"dueBefore": "2025-02-20T00:00:00Z"}, max_days=7)
+        # Un rango abierto no se recorta a max_days
+        self.assertEqual(parsed, {"due_after": None, "due_before": "2025-02-20T00:00:00Z"})
+        self.assertTrue(delivery_index.is_open_range(parsed))
+        closed = delivery_index.parse_due_filter({"dueAfter": "2025-02-13T00:00:00Z", "dueBefore": "2025-02-20T00:00:00Z"})
+        self.assertFalse(delivery_index.is_open_range(closed))
+        with self.assertRaises(PaginationError):
+            delivery_index.parse_due_filter({"dueAfter": "2025-02-21T00:00:00Z", "dueBefore": "2025-02-20T00:00:00Z"})
+        with self.assertRaises(PaginationError):
+            delivery_index.parse_due_filter({"dueAfter": "2025-01-01T00:00:00Z", "dueBefore": "2025-03-01T00:00:00Z"})
+        with self.assertRaises(PaginationError):
+            delivery_index.parse_due_filter({"dueAfter": "tomorrow"})
+
+    def test_only_buckets_in_range_are_queried(self):
+        table = FakeDeliveryIndexTable(work_orders(30))
+        items = read_all(table, 100, due_after="2025-02-21T00:00:00Z", due_before="2025-02-21T23:59:59Z",
+                         shard_count=4)
+        self.assertTrue(all(partition.startswith("2025-02-21#") for partition in table.partitions))
+        self.assertEqual(len(items), 10)
+
+    def test_sparse_range_widens_the_windows(self):
+        table = FakeDeliveryIndexTable(work_orders(3, days=1))
+        with patch.object(delivery_index, "query_partitions", wraps=delivery_index.query_partitions) as rounds:
+            page, cursor = delivery_index.query_by_delivery_date(
+                table, 10, due_after="2025-01-21T00:00:00Z", due_before="2025-02-20T23:59:59Z",
+                shard_count=4, max_workers=8)
+        self.assertEqual((len(page), cursor), (3, None))
+        # Cada día cuesta 4 queries, pero las ventanas crecen 2, 4, 8, 16 y 1 días: 5 rondas y no 16
+        self.assertEqual(len(table.partitions), 31 * 4)
+        self.assertEqual(rounds.call_count, 5)
+
+    def test_pages_are_merged_in_delivery_order(self):
+        orders = work_orders(60)
+        table = FakeDeliveryIndexTable(orders)
+        items = read_all(table, 7, due_after="2025-02-20T00:00:00Z", due_before="2025-02-22T23:59:59Z",
+                         shard_count=4, max_workers=4)
+        expected = sorted(orders, key=lambda item: (item["deliveryDate"], item["id"]))
+        self.assertEqual([item["deliveryDate"] for item in items], [item["deliveryDate"] for item in expected])
+        self.assertEqual(sorted(item["id"] for item in items), sorted(item["id"] for item in orders))
+
+    def test_status_filter(self):
+        table = FakeDeliveryIndexTable(work_orders(30))
+        items = read_all(table, 5, due_after="2025-02-20T00:00:00Z", due_before="2025-02-22T23:59:59Z",
+                         status="completed", shard_count=4)
+        self.assertEqual(len(items), 6)
+        self.assertTrue(all(item["status"] == "completed" for item in items))
+
+    def test_page_ending_on_a_window_boundary(self):
+        # 10 órdenes en 5 días: con limit=2 cada página se llena justo al final de una ventana
+        orders = work_orders(10, days=5)
+        table = FakeDeliveryIndexTable(orders)
+        kwargs = dict(due_after="2025-02-20T00:00:00Z", due_before="2025-02-24T23:59:59Z",
+                      shard_count=4, max_workers=4)
+        page, cursor = delivery_index.query_by_delivery_date(table, 2, **kwargs)
+        self.assertEqual(len(page), 2)
+        self.assertEqual(cursor, {"window": ["2025-02-21", "2025-02-21"], "partitions": None})
+
+        items = read_all(table, 2, **kwargs)
+        self.assertEqual(sorted(item["id"] for item in items), sorted(item["id"] for item in orders))
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(PaginationError):
+            delivery_index.query_by_delivery_date(
+                FakeDeliveryIndexTable([]), 10, "2025-02-20T00:00:00Z", "2025-02-21T00:00:00Z",
+                cursor={"window": ["2024-01-01", "2024-01-01"], "partitions": {}})
+
+
+if __name__ == "__main__":
+    unittest.main()
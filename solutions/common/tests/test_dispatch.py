@@ -0,0 +1,100 @@
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders import dispatch
+
+
+class TestDispatch(unittest.TestCase):
+
+    def test_serial_mode(self):
+        calls = []
+        published = dispatch.store_and_publish(
+            store=lambda: calls.append("store"),
+            publish=lambda: calls.append("publish") or {"MessageId": "1"},
+            mode="serial",
+        )
+        self.assertTrue(published)
+        self.assertEqual(calls, ["store", "publish"])
+
+    def test_serial_mode_marks_unpublished(self):
+        on_unpublished = MagicMock()
+        published = dispatch.store_and_publish(store=MagicMock(), publish=lambda: None,
+                                               on_unpublished=on_unpublished, mode="serial")
+        self.assertFalse(published)
+        on_unpublished.assert_called_once()
+
+    def test_concurrent_mode_success(self):
+        store = MagicMock()
+        on_unpublished = MagicMock()
+        published = dispatch.store_and_publish(
+            store=store, publish=lambda: {"MessageId": "1"},
+            on_unpublished=on_unpublished, mode="concurrent",
+        )
+        self.assertTrue(published)
+        store.assert_called_once()
+        on_unpublished.assert_not_called()
+
+    def test_concurrent_mode_retries_store(self):
+        store = MagicMock(side_effect=[RuntimeError("throttled"), None])
+        dispatch.store_and_publish(store=store, publish=lambda: True, mode="concurrent")
+        self.assertEqual(store.call_count, 2)
+
+    def test_concurrent_mode_compensates_failed_store(self):
+        compensate = MagicMock()
+        store = MagicMock(side_effect=RuntimeError("unavailable"))
+        with self.assertRaises(RuntimeError):
+            dispatch.store_and_publish(store=store, publish=lambda: True,
+                                       compensate=compensate, mode="concurrent")
+        compensate.assert_called_once()
+
+    def test_concurrent_mode_marks_unpublished(self):
+        on_unpublished = MagicMock()
+        published = dispatch.store_and_publish(store=MagicMock(), publish=lambda: None,
+                                               on_unpublished=on_unpublished, mode="concurrent")
+        self.assertFalse(published)
+        on_unpublished.assert_called_once()
+
+    def test_outbox_mode(self):
+        outbox = MagicMock()
+        publish = MagicMock()
+        published = dispatch.store_and_publish(store=MagicMock(), publish=publish, outbox=outbox, mode="outbox")
+        self.assertFalse(published)
+        outbox.assert_called_once()
+        publish.assert_not_called()
+        with self.assertRaises(ValueError):
+            dispatch.store_and_publish(store=MagicMock(), publish=publish, mode="outbox")
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            dispatch.store_and_publish(store=MagicMock(), publish=MagicMock(), mode="parallel")
+
+    def test_failed_mark_unpublished_does_not_fail_the_write(self):
+        # La orden ya está guardada: un error al programar el reenvío solo se registra
+        on_unpublished = MagicMock(side_effect=RuntimeError("throttled"))
+        with patch("work_orders.dispatch.count") as count:
+            published = dispatch.store_and_publish(store=MagicMock(), publish=lambda: None,
+                                                   on_unpublished=on_unpublished, mode="concurrent")
+        self.assertFalse(published)
+        on_unpublished.assert_called_once()
+        # El evento perdido queda contado en las métricas
+        count.assert_called_once_with("lostEvents")
+
+    def test_mark_unpublished_hands_the_event_to_the_outbox(self):
+        dynamodb = MagicMock()
+        work_order = {"id": "1234", "status": "received"}
+        dispatch.mark_unpublished(dynamodb, "WorkOrders", work_order, outbox_table="Outbox")
+        update, put = dynamodb.meta.client.transact_write_items.call_args.kwargs["TransactItems"]
+        self.assertEqual(update["Update"]["Key"], {"id": {"S": "1234"}})
+        self.assertEqual(put["Put"]["TableName"], "Outbox")
+        self.assertEqual(put["Put"]["Item"]["workOrder"]["M"]["status"], {"S": "received"})
+        with self.assertRaises(ValueError):
+            dispatch.mark_unpublished(dynamodb, "WorkOrders", work_order, outbox_table="")
+
+
+if __name__ == "__main__":
+    unittest.main()
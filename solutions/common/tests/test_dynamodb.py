@@ -0,0 +1,88 @@
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders.dynamodb import DynamoDB
+
+
+class TestDynamoDB(unittest.TestCase):
+
+    def setUp(self):
+        self.client = MagicMock()
+        self.dynamodb = DynamoDB(self.client)
+
+    def test_table_actions_serialize_and_decode(self):
+        self.client.query.return_value = {
+            "Items": [{"id": {"S": "1"}, "version": {"N": "2"}}],
+            "LastEvaluatedKey": {"id": {"S": "1"}},
+            "Count": 1,
+        }
+        table = self.dynamodb.Table("WorkOrdersTable")
+        result = table.query(KeyConditionExpression="#s = :s", ExpressionAttributeValues={":s": "received"},
+                             ExclusiveStartKey={"id": "0"})
+        self.assertEqual(result["Items"], [{"id": "1", "version": 2}])
+        self.assertEqual((result["LastEvaluatedKey"], result["Count"]), ({"id": "1"}, 1))
+
+        kwargs = self.client.query.call_args.kwargs
+        self.assertEqual(kwargs["TableName"], "WorkOrdersTable")
+        self.assertEqual(kwargs["ExpressionAttributeValues"], {":s": {"S": "received"}})
+        self.assertEqual(kwargs["ExclusiveStartKey"], {"id": {"S": "0"}})
+
+    def test_put_and_get_item(self):
+        table = self.dynamodb.Table("WorkOrdersTable")
+        table.put_item(Item={"id": "1", "cancellationReason": None})
+        self.assertEqual(self.client.put_item.call_args.kwargs["Item"],
+                         {"id": {"S": "1"}, "cancellationReason": {"NULL": True}})
+
+        self.client.get_item.return_value = {}
+        self.assertNotIn("Item", table.get_item(Key={"id": "2"}))
+        self.assertEqual(self.client.get_item.call_args.kwargs["Key"], {"id": {"S": "2"}})
+
+    def test_binary_values_are_not_base64_decoded_again(self):
+        # El cliente de bajo nivel ya devuelve los binarios como bytes
+        table = self.dynamodb.Table("WorkOrdersTable")
+        table.put_item(Item={"id": "1", "blob": b"\x00\x01\xffhello", "tags": {"b", "a"}})
+        self.assertEqual(self.client.put_item.call_args.kwargs["Item"]["blob"], {"B": b"\x00\x01\xffhello"})
+        self.assertEqual(self.client.put_item.call_args.kwargs["Item"]["tags"], {"SS": ["a", "b"]})
+
+        self.client.get_item.return_value = {"Item": {
+            "blob": {"B": b"\x00\x01\xffhello"},
+            "blobs": {"BS": [b"aGVsbG8="]},
+            "nested": {"L": [{"M": {"blob": {"B": b"aGVsbG8="}}}]},
+        }}
+        item = table.get_item(Key={"id": "1"})["Item"]
+        self.assertEqual(item["blob"], b"\x00\x01\xffhello")
+        self.assertEqual(item["blobs"], {b"aGVsbG8="})
+        self.assertEqual(item["nested"], [{"blob": b"aGVsbG8="}])
+
+    def test_batch_write_returns_plain_unprocessed_items(self):
+        self.client.batch_write_item.return_value = {
+            "UnprocessedItems": {"WorkOrdersTable": [{"PutRequest": {"Item": {"id": {"S": "2"}}}}]}
+        }
+        result = self.dynamodb.batch_write_item(RequestItems={"WorkOrdersTable": [
+            {"PutRequest": {"Item": {"id": "1"}}}, {"PutRequest": {"Item": {"id": "2"}}}
+        ]})
+        sent = self.client.batch_write_item.call_args.kwargs["RequestItems"]["WorkOrdersTable"]
+        self.assertEqual(sent[0], {"PutRequest": {"Item": {"id": {"S": "1"}}}})
+        self.assertEqual(result["UnprocessedItems"], {"WorkOrdersTable": [{"PutRequest": {"Item": {"id": "2"}}}]})
+
+    def test_batch_get(self):
+        self.client.batch_get_item.return_value = {
+            "Responses": {"WorkOrdersTable": [{"id": {"S": "1"}}]},
+            "UnprocessedKeys": {"WorkOrdersTable": {"Keys": [{"id": {"S": "2"}}], "ProjectionExpression": "id"}},
+        }
+        result = self.dynamodb.batch_get_item(RequestItems={
+            "WorkOrdersTable": {"Keys": [{"id": "1"}, {"id": "2"}], "ProjectionExpression": "id"}
+        })
+        sent = self.client.batch_get_item.call_args.kwargs["RequestItems"]["WorkOrdersTable"]
+        self.assertEqual(sent["Keys"], [{"id": {"S": "1"}}, {"id": {"S": "2"}}])
+        self.assertEqual(result["Responses"], {"WorkOrdersTable": [{"id": "1"}]})
+        self.assertEqual(result["UnprocessedKeys"]["WorkOrdersTable"]["Keys"], [{"id": "2"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
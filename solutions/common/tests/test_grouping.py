@@ -0,0 +1,49 @@
+import os
+import sys
+import unittest
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders import grouping
+
+
+class TestGrouping(unittest.TestCase):
+
+    def setUp(self):
+        self.work_order = {"id": "1234", "status": "received", "customerId": "customer-1"}
+
+    def test_group_by_order(self):
+        self.assertEqual(grouping.message_group_id(self.work_order, strategy="order"), "1234")
+
+    def test_group_by_status(self):
+        self.assertEqual(grouping.message_group_id(self.work_order, strategy="status"), "received")
+
+    def test_group_by_hash_is_stable_and_bounded(self):
+        group = grouping.message_group_id(self.work_order, strategy="hash", key="customerId", group_count=4)
+        self.assertIn(group, {f"group-{i}" for i in range(4)})
+        other = dict(self.work_order, id="5678")
+        self.assertEqual(group, grouping.message_group_id(other, strategy="hash", key="customerId", group_count=4))
+
+    def test_group_by_hash_falls_back_to_id(self):
+        work_order = {"id": "1234", "status": "received"}
+        group = grouping.message_group_id(work_order, strategy="hash", key="customerId", group_count=4)
+        self.assertTrue(group.startswith("group-"))
+
+    def test_group_by_hash_uses_the_stored_customer(self):
+        # El customerId del POST se guarda en la orden y agrupa todas las órdenes del cliente
+        from work_orders.core import build_work_order
+
+        body = {"description": "x", "deliveryDate": "2025-02-20T12:00:00Z", "status": "received", "customerId": "c-1"}
+        first, second = build_work_order(body), build_work_order(body)
+        self.assertNotEqual(first["id"], second["id"])
+        self.assertEqual(grouping.message_group_id(first, strategy="hash", group_count=16),
+                         grouping.message_group_id(second, strategy="hash", group_count=16))
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            grouping.message_group_id(self.work_order, strategy="random")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders import lookup
+from work_orders.pagination import PaginationError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def fake_table(item=None):
+    table = MagicMock()
+    table.name = "TestTable"
+    table.get_item.return_value = {"Item": item} if item else {}
+    return table
+
+
+class TestTTLCache(unittest.TestCase):
+
+    def test_hits_misses_and_expiry(self):
+        clock = FakeClock()
+        cache = lookup.TTLCache(maxsize=10, ttl=30, clock=clock)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        # Tras el TTL la entrada caduca y cuenta como fallo
+        clock.now = 31
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats(), {"size": 0, "hits": 1, "misses": 2})
+
+    def test_least_recently_used_is_evicted(self):
+        cache = lookup.TTLCache(maxsize=2, ttl=30, clock=FakeClock())
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+
+    def test_zero_ttl_disables_the_cache(self):
+        cache = lookup.TTLCache(maxsize=10, ttl=0)
+        cache.put("a", 1)
+        self.assertFalse(cache.enabled)
+        self.assertIsNone(cache.get("a"))
+
+
+class TestLookup(unittest.TestCase):
+
+    def test_projection_aliases_reserved_words(self):
+        expression, names = lookup.projection(("id", "status"))
+        self.assertEqual(expression, "#id, #status")
+        self.assertEqual(names, {"#id": "id", "#status": "status"})
+
+    def test_parse_ids(self):
+        self.assertEqual(lookup.parse_ids(" a, b,,a "), ["a", "b"])
+        with self.assertRaises(PaginationError):
+            lookup.parse_ids(" , ")
+        with self.assertRaises(PaginationError):
+            lookup.parse_ids("a,b,c", max_ids=2)
+
+    def test_get_work_order_uses_projection_and_cache(self):
+        cache = lookup.TTLCache(maxsize=10, ttl=30)
+        table = fake_table({"id": "1", "status": "received"})
+
+        item, hit = lookup.get_work_order(table, "1", cache=cache)
+        self.assertEqual((item["id"], hit), ("1", False))
+        kwargs = table.get_item.call_args.kwargs
+        self.assertEqual(kwargs["Key"], {"id": "1"})
+        self.assertIn("#status", kwargs["ProjectionExpression"])
+
+        # La segunda lectura no llega a DynamoDB
+        item, hit = lookup.get_work_order(table, "1", cache=cache)
+        self.assertTrue(hit)
+        table.get_item.assert_called_once()
+
+    def test_missing_work_order_is_not_cached(self):
+        cache = lookup.TTLCache(maxsize=10, ttl=30)
+        table = fake_table()
+        self.assertEqual(lookup.get_work_order(table, "1", cache=cache), (None, False))
+        lookup.get_work_order(table, "1", cache=cache)
+        self.assertEqual(table.get_item.call_count, 2)
+
+    def test_batch_get_chunks_and_retries_unprocessed_keys(self):
+        ids = [str(i) for i in range(150)]
+        dynamodb = MagicMock()
+
+        def batch_get_item(RequestItems):
+            keys = RequestItems["TestTable"]["Keys"]
+            self.assertLessEqual(len(keys), 100)
+            # DynamoDB deja sin procesar la primera clave la primera vez que la ve
+            if keys[0]["id"] == "0" and dynamodb.batch_get_item.call_count == 1:
+                return {"Responses": {"TestTable": [{"id": k["id"]} for k in keys[1:]]},
+                        "UnprocessedKeys": {"TestTable": {"Keys": keys[:1]}}}
+            return {"Responses": {"TestTable": [{"id": k["id"]} for k in keys]}, "UnprocessedKeys": {}}
+
+        dynamodb.batch_get_item.side_effect = batch_get_item
+        found, unprocessed = lookup.batch_get_work_orders(
+            dynamodb, "TestTable", ids, cache=lookup.TTLCache(0, 0), sleep=lambda s: None
+        )
+        self.assertEqual(set(found), set(ids))
+        self.assertEqual(unprocessed, [])
+        self.assertEqual(dynamodb.batch_get_item.call_count, 3)
+
+    def test_batch_get_reports_keys_left_unprocessed(self):
+        dynamodb = MagicMock()
+        dynamodb.batch_get_item.return_value = {
+            "Responses": {}, "UnprocessedKeys": {"TestTable": {"Keys": [{"id": "1"}]}}
+        }
+        found, unprocessed = lookup.batch_get_work_orders(
+            dynamodb, "TestTable", ["1"], cache=lookup.TTLCache(0, 0), max_attempts=2, sleep=lambda s: None
+        )
+        self.assertEqual((found, unprocessed), ({}, ["1"]))
+        self.assertEqual(dynamodb.batch_get_item.call_count, 2)
+
+    def test_batch_get_skips_cached_ids(self):
+        cache = lookup.TTLCache(maxsize=10, ttl=30)
+        cache.put(("TestTable", "1"), {"id": "1"})
+        dynamodb = MagicMock()
+        dynamodb.batch_get_item.return_value = {"Responses": {"TestTable": [{"id": "2"}]}}
+        found, _ = lookup.batch_get_work_orders(dynamodb, "TestTable", ["1", "2"], cache=cache)
+        self.assertEqual(set(found), {"1", "2"})
+        keys = dynamodb.batch_get_item.call_args.kwargs["RequestItems"]["TestTable"]["Keys"]
+        self.assertEqual(keys, [{"id": "2"}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import json
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders import core, metrics
+from work_orders.publishers import NullPublisher
+
+
+def instrumented(handler, lines, name="api"):
+    return metrics.instrument(name, enabled=True, emit=lines.append)(handler)
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_disabled_handler_is_not_wrapped(self):
+        def handler(event, context):
+            return {"statusCode": 200}
+
+        self.assertIs(metrics.instrument("api", enabled=False)(handler), handler)
+        # Fuera de una invocación instrumentada las fases no hacen nada
+        self.assertIs(metrics.phase("parse"), metrics.phase("validate"))
+        self.assertIs(metrics.timed("dynamodb", handler), handler)
+
+    def test_one_emf_line_per_invocation(self):
+        lines = []
+
+        def handler(event, context):
+            with metrics.phase("dynamodb"):
+                pass
+            with metrics.phase("dynamodb"):
+                pass
+            metrics.count("items", 3)
+            return {"statusCode": 201}
+
+        with patch.object(metrics, "_cold_start", True):
+            wrapped = instrumented(handler, lines)
+            self.assertEqual(wrapped({}, None), {"statusCode": 201})
+            wrapped({}, None)
+
+        self.assertEqual(len(lines), 2)
+        document = json.loads(lines[0])
+        definition = document["_aws"]["CloudWatchMetrics"][0]
+        self.assertEqual(definition["Dimensions"], [["Service", "Handler"]])
+        units = {metric["Name"]: metric["Unit"] for metric in definition["Metrics"]}
+        self.assertEqual(units["dynamodb"], "Milliseconds")
+        self.assertEqual(units["duration"], "Milliseconds")
+        self.assertEqual(units["items"], "Count")
+        self.assertEqual((document["Handler"], document["items"], document["status2xx"]), ("api", 3, 1))
+        self.assertLessEqual(document["dynamodb"], document["duration"])
+        # Solo la primera invocación del proceso es un arranque en frío
+        self.assertEqual((document["coldStart"], json.loads(lines[1])["coldStart"]), (1, 0))
+
+    def test_errors_are_counted_and_flushed(self):
+        lines = []
+
+        def handler(event, context):
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            instrumented(handler, lines)({}, None)
+        self.assertEqual(json.loads(lines[0])["errors"], 1)
+        self.assertIsNone(metrics._current)
+
+    def test_client_hooks_count_calls_and_retries(self):
+        lines = []
+        client = MagicMock()
+        metrics.register_client_hooks(client)
+        hooks = {call.args[0]: call.args[1] for call in client.meta.events.register.call_args_list}
+
+        def handler(event, context):
+            hooks["after-call"](parsed={"ResponseMetadata": {"RetryAttempts": 2}}, model=None)
+            hooks["after-call"](parsed={"ResponseMetadata": {"RetryAttempts": 0}}, model=None)
+            hooks["after-call-error"](exception=RuntimeError("connection reset"))
+            # Los errores del servicio llegan por 'after-call' con la respuesta HTTP
+            hooks["after-call"](http_response=MagicMock(status_code=400), model=None,
+                                parsed={"Error": {"Code": "ConditionalCheckFailedException"}})
+            hooks["after-call"](http_response=MagicMock(status_code=503), parsed={}, model=None)
+            return {"statusCode": 200}
+
+        instrumented(handler, lines)({}, None)
+        document = json.loads(lines[0])
+        self.assertEqual((document["awsCalls"], document["awsRetries"], document["awsErrors"]), (5, 2, 3))
+
+    def test_create_records_its_phases(self):
+        lines = []
+        service = core.WorkOrderService(MagicMock(), "TestTable", NullPublisher())
+        body = {"description": "Test work order", "deliveryDate": "2025-02-14T12:00:00Z", "status": "received"}
+
+        response = instrumented(lambda event, context: service.handle(event), lines)(
+            {"httpMethod": "POST", "body": json.dumps(body)}, None
+        )
+        self.assertEqual(response["statusCode"], 201)
+        document = json.loads(lines[0])
+        for name in ("parse", "validate", "dynamodb", "serialize"):
+            self.assertIn(name, document)
+
+
+if __name__ == '__main__':
+    unittest.main()
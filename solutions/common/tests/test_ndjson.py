@@ -0,0 +1,76 @@
+import json
+import os
+import sys
+import unittest
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders import ndjson
+from work_orders.pagination import PaginationError
+
+
+def paged_source(pages):
+    """
+    Simula una fuente paginada: el cursor es el índice de la siguiente página.
+    """
+    calls = []
+
+    def fetch(cursor):
+        index = cursor or 0
+        calls.append(index)
+        next_cursor = index + 1 if index + 1 < len(pages) else None
+        return pages[index], next_cursor
+
+    return fetch, calls
+
+
+PAGES = [[{"id": f"{page}-{i}"} for i in range(3)] for page in range(4)]
+
+
+class TestNdjson(unittest.TestCase):
+
+    def test_parse_format(self):
+        self.assertEqual(ndjson.parse_format(None), "json")
+        self.assertEqual(ndjson.parse_format({"format": "ndjson"}), "ndjson")
+        with self.assertRaises(PaginationError):
+            ndjson.parse_format({"format": "csv"})
+
+    def test_pages_are_read_lazily(self):
+        fetch, calls = paged_source(PAGES)
+        pages = ndjson.iter_pages(fetch)
+        next(pages)
+        self.assertEqual(calls, [0])
+
+    def test_chunk_until_exhausted(self):
+        fetch, _ = paged_source(PAGES)
+        body, cursor = ndjson.ndjson_chunk(ndjson.iter_pages(fetch), max_bytes=10 ** 6)
+        lines = body.splitlines()
+        self.assertIsNone(cursor)
+        self.assertEqual(len(lines), 12)
+        self.assertEqual(json.loads(lines[-1]), {"id": "3-2"})
+
+    def test_chunk_is_bounded_and_resumable(self):
+        fetch, calls = paged_source(PAGES)
+        body, cursor = ndjson.ndjson_chunk(ndjson.iter_pages(fetch), max_bytes=1)
+        # Se corta tras la primera página completa y no se leen las demás
+        self.assertEqual(len(body.splitlines()), 3)
+        self.assertEqual((cursor, calls), (1, [0]))
+
+        rest, cursor = ndjson.ndjson_chunk(ndjson.iter_pages(fetch, cursor), max_bytes=10 ** 6)
+        self.assertIsNone(cursor)
+        self.assertEqual(len(rest.splitlines()), 9)
+
+    def test_chunk_counts_encoded_bytes(self):
+        # "Reparación de pantalla" ocupa más bytes que caracteres en UTF-8
+        pages = [[{"id": "1", "description": "Reparación de pantalla 修理"}], [{"id": "2"}]]
+        fetch, _ = paged_source(pages)
+        line = next(ndjson.ndjson_lines(pages[0]))
+        self.assertGreater(len(line.encode("utf-8")), len(line))
+        body, cursor = ndjson.ndjson_chunk(ndjson.iter_pages(fetch), max_bytes=len(line) + 1)
+        # Por caracteres cabría otra página; por bytes el límite ya se alcanzó
+        self.assertEqual((len(body.splitlines()), cursor), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import sys
+import unittest
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders import outbox
+from work_orders.stream_image import deserialize_image, serialize_item, serialize_value
+
+
+def work_order(work_order_id):
+    return {"id": work_order_id, "status": "received", "cancellationReason": None}
+
+
+def outbox_record(sequence_number, work_order_id):
+    entry = serialize_item(outbox.outbox_entry(work_order(work_order_id)))
+    return {"eventName": "INSERT", "dynamodb": {"SequenceNumber": sequence_number, "NewImage": entry}}
+
+
+class TestOutbox(unittest.TestCase):
+
+    def test_serialize_item_round_trip(self):
+        item = {"id": "1", "count": 3, "price": Decimal("1.5"), "active": True,
+                "reason": None, "tags": ["a"], "customer": {"name": "ACME"}}
+        self.assertEqual(deserialize_image(serialize_item(item)), item)
+
+    def test_serialize_unsupported_value(self):
+        with self.assertRaises(TypeError):
+            serialize_value(object())
+
+    def test_outbox_entry_expires(self):
+        entry = outbox.outbox_entry(work_order("1"), now=lambda: 1000)
+        self.assertEqual(entry["id"], "1")
+        self.assertEqual(entry["expiresAt"], 1000 + outbox.OUTBOX_RETENTION_SECONDS)
+
+    def test_store_with_outbox_is_one_transaction(self):
+        dynamodb = MagicMock()
+        outbox.store_with_outbox(dynamodb, "TestTable", work_order("1"),
+                                 outbox.outbox_entry(work_order("1")), outbox_table="OutboxTable")
+        actions = dynamodb.meta.client.transact_write_items.call_args.kwargs["TransactItems"]
+        self.assertEqual([action["Put"]["TableName"] for action in actions], ["TestTable", "OutboxTable"])
+        self.assertEqual(actions[0]["Put"]["Item"]["id"], {"S": "1"})
+
+    def test_store_batch_with_outbox_chunks_and_reports_failures(self):
+        dynamodb = MagicMock()
+        dynamodb.meta.client.transact_write_items.side_effect = [None, Exception("TransactionCanceled")]
+        items = [work_order(str(i)) for i in range(60)]
+        entries = [outbox.outbox_entry(item) for item in items]
+
+        failed = outbox.store_batch_with_outbox(dynamodb, "TestTable", items, entries, outbox_table="OutboxTable")
+        # Dos transacciones (50 + 10 órdenes); la segunda falla entera
+        self.assertEqual(dynamodb.meta.client.transact_write_items.call_count, 2)
+        first = dynamodb.meta.client.transact_write_items.call_args_list[0].kwargs["TransactItems"]
+        self.assertEqual(len(first), 100)
+        self.assertEqual(set(failed), {str(i) for i in range(50, 60)})
+
+    def test_relay_reports_failed_records(self):
+        publish = MagicMock(return_value={"2": "Throttled"})
+        records = [outbox_record("100", "1"), outbox_record("200", "2"),
+                   {"eventName": "REMOVE", "dynamodb": {"SequenceNumber": "300"}}]
+
+        result = outbox.relay(records, publish)
+        self.assertEqual([order["id"] for order in publish.call_args.args[0]], ["1", "2"])
+        self.assertEqual(result, {"batchItemFailures": [{"itemIdentifier": "200"}]})
+
+    def test_relay_without_inserts(self):
+        publish = MagicMock()
+        self.assertEqual(outbox.relay([], publish), {"batchItemFailures": []})
+        publish.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
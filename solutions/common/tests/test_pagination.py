@@ -0,0 +1,59 @@
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders import pagination
+
+
+class TestPagination(unittest.TestCase):
+
+    def test_token_round_trip(self):
+        key = {"id": "1234"}
+        token = pagination.encode_next_token(key)
+        self.assertNotIn("=", token)
+        self.assertEqual(pagination.decode_next_token(token), key)
+
+    def test_invalid_token(self):
+        with self.assertRaises(pagination.PaginationError):
+            pagination.decode_next_token("no-es-un-token")
+
+    def test_parse_page_params_defaults(self):
+        limit, start_key = pagination.parse_page_params(None)
+        self.assertEqual(limit, pagination.DEFAULT_PAGE_SIZE)
+        self.assertIsNone(start_key)
+
+    def test_parse_page_params_invalid_limit(self):
+        for value in ["abc", "0", str(pagination.MAX_PAGE_SIZE + 1)]:
+            with self.assertRaises(pagination.PaginationError):
+                pagination.parse_page_params({"limit": value})
+
+    def test_scan_page_follows_last_evaluated_key(self):
+        # Simulamos dos páginas de DynamoDB
+        table = MagicMock()
+        table.scan.side_effect = [
+            {"Items": [{"id": "1"}], "LastEvaluatedKey": {"id": "1"}},
+            {"Items": [{"id": "2"}]},
+        ]
+        items, next_key = pagination.scan_page(table, 5)
+        self.assertEqual([item["id"] for item in items], ["1", "2"])
+        self.assertIsNone(next_key)
+        self.assertEqual(table.scan.call_args_list[1].kwargs["ExclusiveStartKey"], {"id": "1"})
+        self.assertEqual(table.scan.call_args_list[1].kwargs["Limit"], 4)
+
+    def test_scan_page_respects_size_cap(self):
+        table = MagicMock()
+        table.scan.return_value = {
+            "Items": [{"id": str(i), "description": "x" * 100} for i in range(3)],
+            "LastEvaluatedKey": {"id": "2"},
+        }
+        items, next_key = pagination.scan_page(table, 3, max_bytes=300)
+        self.assertEqual(len(items), 2)
+        self.assertEqual(next_key, {"id": "1"})
+
+
+if __name__ == "__main__":
+    unittest.main()
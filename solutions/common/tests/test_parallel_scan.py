@@ -0,0 +1,85 @@
+import io
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders.export import export_table
+from work_orders.parallel_scan import parallel_scan, serial_scan
+
+
+class FakeSegmentedTable:
+    """
+    Tabla en memoria que simula Scan paginado y segmentado.
+    """
+
+    def __init__(self, count, page_size=3, delay=0.0):
+        self.items = [{"id": str(i)} for i in range(count)]
+        self.page_size = page_size
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def scan(self, Segment=None, TotalSegments=None, ExclusiveStartKey=None, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+
+        items = self.items
+        if TotalSegments:
+            items = [item for item in items if int(item["id"]) % TotalSegments == Segment]
+        start = 0
+        if ExclusiveStartKey:
+            start = [item["id"] for item in items].index(ExclusiveStartKey["id"]) + 1
+        page = items[start:start + self.page_size]
+        result = {"Items": page}
+        if start + self.page_size < len(items):
+            result["LastEvaluatedKey"] = {"id": page[-1]["id"]}
+        return result
+
+
+class TestParallelScan(unittest.TestCase):
+
+    def test_parallel_scan_returns_every_item_once(self):
+        table = FakeSegmentedTable(50)
+        ids = [item["id"] for item in parallel_scan(lambda: table, total_segments=4, max_workers=2)]
+        self.assertEqual(sorted(ids, key=int), [str(i) for i in range(50)])
+
+    def test_parallel_scan_respects_max_workers(self):
+        table = FakeSegmentedTable(40, delay=0.01)
+        list(parallel_scan(lambda: table, total_segments=8, max_workers=3))
+        self.assertLessEqual(table.max_active, 3)
+
+    def test_parallel_scan_propagates_errors(self):
+        class BrokenTable:
+            def scan(self, **kwargs):
+                raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            list(parallel_scan(BrokenTable, total_segments=2))
+
+    def test_serial_scan_follows_pages(self):
+        table = FakeSegmentedTable(10)
+        self.assertEqual(len(list(serial_scan(table))), 10)
+
+    def test_export_table_writes_ndjson(self):
+        table = FakeSegmentedTable(7)
+        output = io.StringIO()
+        count = export_table(lambda: table, output, total_segments=2)
+        self.assertEqual(count, 7)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 7)
+        self.assertIn("id", json.loads(lines[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
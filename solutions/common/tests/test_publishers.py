@@ -0,0 +1,103 @@
+import json
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders import publishers
+
+QUEUES = {"received": "received-url", "in_progress": "in-progress-url", "completed": None, "canceled": None}
+
+
+def work_order(work_order_id, status="received"):
+    return {"id": work_order_id, "status": status}
+
+
+class TestPublishers(unittest.TestCase):
+
+    def test_sqs_publish(self):
+        sqs = MagicMock()
+        publisher = publishers.SqsFifoPublisher(sqs, QUEUES)
+        publisher.publish(work_order("1"))
+        kwargs = sqs.send_message.call_args.kwargs
+        self.assertEqual(kwargs["QueueUrl"], "received-url")
+        self.assertEqual(kwargs["MessageDeduplicationId"], "1")
+
+    def test_sqs_publish_voided_uses_new_deduplication_id(self):
+        sqs = MagicMock()
+        publishers.SqsFifoPublisher(sqs, QUEUES).publish_voided(work_order("1"))
+        kwargs = sqs.send_message.call_args.kwargs
+        self.assertEqual(kwargs["MessageDeduplicationId"], "1-voided")
+        self.assertTrue(json.loads(kwargs["MessageBody"])["voided"])
+
+    def test_publish_failure_returns_none(self):
+        sqs = MagicMock()
+        sqs.send_message.side_effect = Exception("Service unavailable")
+        self.assertIsNone(publishers.SqsFifoPublisher(sqs, QUEUES).publish(work_order("1")))
+        # Un estado sin cola tampoco se publica
+        self.assertIsNone(publishers.SqsFifoPublisher(sqs, QUEUES).publish(work_order("2", "completed")))
+
+    def test_sqs_publish_batch_groups_by_queue(self):
+        sqs = MagicMock()
+        sqs.send_message_batch.return_value = {"Failed": []}
+        orders = [work_order("1"), work_order("2", "in_progress"), work_order("3"), work_order("4", "completed")]
+
+        failed = publishers.SqsFifoPublisher(sqs, QUEUES).publish_batch(orders)
+        self.assertEqual(list(failed), ["4"])
+        queues = [call.kwargs["QueueUrl"] for call in sqs.send_message_batch.call_args_list]
+        self.assertEqual(queues, ["received-url", "in-progress-url"])
+
+    def test_sns_publish_batch(self):
+        sns = MagicMock()
+        sns.publish_batch.return_value = {"Failed": []}
+        publishers.SnsPublisher(sns, "topic-arn").publish_batch([work_order(str(i)) for i in range(12)])
+        # Dos llamadas: 10 + 2 entradas, cada una con el atributo de filtrado
+        self.assertEqual(sns.publish_batch.call_count, 2)
+        entry = sns.publish_batch.call_args_list[0].kwargs["PublishBatchRequestEntries"][0]
+        self.assertEqual(entry["MessageAttributes"]["status"]["StringValue"], "received")
+
+    def test_eventbridge_failed_entry_is_not_published(self):
+        eventbridge = MagicMock()
+        eventbridge.put_events.return_value = {"FailedEntryCount": 1, "Entries": [{"ErrorCode": "InternalFailure"}]}
+        self.assertIsNone(publishers.EventBridgePublisher(eventbridge, "bus").publish(work_order("1")))
+
+    def test_eventbridge_publish_voided(self):
+        eventbridge = MagicMock()
+        eventbridge.put_events.return_value = {"FailedEntryCount": 0, "Entries": [{"EventId": "1"}]}
+        publishers.EventBridgePublisher(eventbridge, "bus").publish_voided(work_order("1"))
+        entry = eventbridge.put_events.call_args.kwargs["Entries"][0]
+        self.assertEqual(entry["DetailType"], "WorkOrderVoided")
+
+    def test_null_publisher(self):
+        publisher = publishers.NullPublisher()
+        self.assertFalse(publisher.enabled)
+        self.assertEqual(publisher.publish_batch([work_order("1")]), {})
+
+    def test_incomplete_publisher_cannot_be_created(self):
+        # Un publisher sin send_batch falla al crearse, no al primer lote
+        class Incomplete(publishers.Publisher):
+            def send(self, work_order, **options):
+                return None
+
+            def entry(self, work_order):
+                return {"Id": work_order["id"]}
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_make_publisher(self):
+        self.assertIsInstance(publishers.make_publisher("sqs", sqs=MagicMock(), queues=QUEUES),
+                              publishers.SqsFifoPublisher)
+        self.assertIsInstance(publishers.make_publisher("sns", sns=MagicMock()), publishers.SnsPublisher)
+        self.assertIsInstance(publishers.make_publisher("eventbridge", eventbridge=MagicMock()),
+                              publishers.EventBridgePublisher)
+        self.assertIsInstance(publishers.make_publisher("none"), publishers.NullPublisher)
+        with self.assertRaises(ValueError):
+            publishers.make_publisher("kinesis")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import json
+import os
+import sys
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders import serialization
+
+ITEM = {"id": "1", "priority": Decimal("2"), "cost": Decimal("10.5"), "tags": {"b", "a"}, "note": "ñ"}
+EXPECTED = {"id": "1", "priority": 2, "cost": 10.5, "tags": ["a", "b"], "note": "ñ"}
+
+
+class TestSerialization(unittest.TestCase):
+
+    def test_dumps_with_each_backend(self):
+        backends = ["json"] + (["orjson"] if serialization.orjson else [])
+        for backend in backends:
+            with patch("work_orders.serialization.JSON_BACKEND", backend):
+                self.assertEqual(json.loads(serialization.dumps(ITEM)), EXPECTED, backend)
+                self.assertEqual(serialization.loads(b'{"a": [1, 2]}'), {"a": [1, 2]}, backend)
+
+    def test_dumps_is_compact(self):
+        self.assertEqual(serialization.dumps({"a": 1, "b": [1, 2]}), '{"a":1,"b":[1,2]}')
+
+    def test_dumps_with_raw_member(self):
+        raw = serialization.dumps({"id": "1"})
+        body = serialization.dumps_with({"message": "ok"}, "data", raw)
+        self.assertEqual(json.loads(body), {"message": "ok", "data": {"id": "1"}})
+        self.assertEqual(json.loads(serialization.dumps_with({}, "data", raw)), {"data": {"id": "1"}})
+
+    def test_unsupported_type(self):
+        with self.assertRaises(TypeError):
+            serialization.dumps({"value": object()})
+
+
+if __name__ == "__main__":
+    unittest.main()
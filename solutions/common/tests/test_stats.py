@@ -0,0 +1,128 @@
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders import stats
+
+
+class ClientError(Exception):
+    """
+    Igual que botocore.exceptions.ClientError: la respuesta de error va en `response`.
+    """
+
+    def __init__(self, response, operation_name):
+        super().__init__(response["Error"]["Message"])
+        self.response = response
+
+
+def image(status, delivery_date="2025-02-20T12:00:00Z"):
+    return {"id": {"S": "1"}, "status": {"S": status}, "deliveryDate": {"S": delivery_date}}
+
+
+class TestStats(unittest.TestCase):
+
+    def test_changes_are_coalesced_per_item(self):
+        records = [
+            {"eventName": "INSERT", "dynamodb": {"NewImage": image("received")}},
+            {"eventName": "INSERT", "dynamodb": {"NewImage": image("received")}},
+            {"eventName": "MODIFY", "dynamodb": {"OldImage": image("received"), "NewImage": image("completed")}},
+            # Un MODIFY que no cambia el estado no altera los contadores
+            {"eventName": "MODIFY", "dynamodb": {"OldImage": image("completed"), "NewImage": image("completed")}},
+            {"eventName": "REMOVE", "dynamodb": {"OldImage": image("canceled")}},
+        ]
+        deltas = stats.count_deltas(records, by_day=False)
+        self.assertEqual(deltas, {"stats": {"received": 1, "completed": 1, "canceled": -1, "total": 1}})
+
+    def test_per_delivery_day(self):
+        records = [
+            {"eventName": "INSERT", "dynamodb": {"NewImage": image("received", "2025-02-20T12:00:00Z")}},
+            {"eventName": "INSERT", "dynamodb": {"NewImage": image("received", "2025-02-21T08:00:00Z")}},
+        ]
+        deltas = stats.count_deltas(records, by_day=True)
+        self.assertEqual(deltas["stats"], {"received": 2, "total": 2})
+        self.assertEqual(deltas["stats#2025-02-20"], {"received": 1, "total": 1})
+        self.assertEqual(deltas["stats#2025-02-21"], {"received": 1, "total": 1})
+
+    def test_modify_without_old_image_is_ignored(self):
+        records = [{"eventName": "MODIFY", "dynamodb": {"NewImage": image("completed")}}]
+        self.assertEqual(stats.count_deltas(records, by_day=False), {})
+
+    def test_apply_deltas_uses_one_atomic_add_per_item(self):
+        dynamodb = MagicMock()
+        stats.apply_deltas(dynamodb, "Meta", {"stats": {"received": 2, "total": 2}}, token="abc", now=lambda: 1000)
+        kwargs = dynamodb.meta.client.transact_write_items.call_args.kwargs
+        marker, update = kwargs["TransactItems"][0]["Put"], kwargs["TransactItems"][1]["Update"]
+        self.assertEqual(update["UpdateExpression"], "ADD #c0 :c0, #c1 :c1")
+        self.assertEqual(update["ExpressionAttributeNames"], {"#c0": "received", "#c1": "total"})
+        self.assertEqual(update["ExpressionAttributeValues"], {":c0": {"N": "2"}, ":c1": {"N": "2"}})
+        self.assertEqual(kwargs["ClientRequestToken"], "abc-0")
+        # El marcador del lote solo se crea si no existe, y caduca por TTL
+        self.assertEqual(marker["Item"]["id"], {"S": "stats-applied#abc-0"})
+        self.assertEqual(marker["Item"]["expiresAt"], {"N": str(1000 + stats.STATS_APPLIED_RETENTION_SECONDS)})
+        self.assertEqual(marker["ConditionExpression"], "attribute_not_exists(id)")
+
+    def test_batch_retried_after_the_token_expired_is_not_counted_twice(self):
+        dynamodb = MagicMock()
+        dynamodb.meta.client.transact_write_items.side_effect = ClientError({
+            "Error": {"Code": "TransactionCanceledException", "Message": "canceled"},
+            "CancellationReasons": [{"Code": "ConditionalCheckFailed"}, {"Code": "None"}],
+        }, "TransactWriteItems")
+        # El marcador ya existe: el lote se dio por aplicado y no se lanza el error
+        stats.apply_deltas(dynamodb, "Meta", {"stats": {"received": 1, "total": 1}}, token="abc")
+
+        dynamodb.meta.client.transact_write_items.side_effect = ClientError({
+            "Error": {"Code": "TransactionCanceledException", "Message": "canceled"},
+            "CancellationReasons": [{"Code": "None"}, {"Code": "TransactionConflict"}],
+        }, "TransactWriteItems")
+        with self.assertRaises(ClientError):
+            stats.apply_deltas(dynamodb, "Meta", {"stats": {"received": 1, "total": 1}}, token="abc")
+
+    def test_marker_leaves_room_in_each_transaction(self):
+        dynamodb = MagicMock()
+        deltas = {stats.stats_key(str(day)): {"received": 1} for day in range(stats.TRANSACTION_SIZE)}
+        stats.apply_deltas(dynamodb, "Meta", deltas, token="abc")
+        self.assertEqual(dynamodb.meta.client.transact_write_items.call_count, 2)
+        for call in dynamodb.meta.client.transact_write_items.call_args_list:
+            self.assertLessEqual(len(call.kwargs["TransactItems"]), stats.TRANSACTION_SIZE)
+            self.assertIn("Put", call.kwargs["TransactItems"][0])
+
+    def test_count_work_orders(self):
+        work_orders = [
+            {"status": "received", "deliveryDate": "2025-02-20T12:00:00Z"},
+            {"status": "completed", "deliveryDate": "2025-02-20T08:00:00Z"},
+            {"status": "completed"},
+        ]
+        totals = stats.count_work_orders(work_orders, by_day=True)
+        self.assertEqual(totals["stats"], {"received": 1, "completed": 2, "total": 3})
+        self.assertEqual(totals["stats#2025-02-20"], {"received": 1, "completed": 1, "total": 2})
+
+    def test_backfill_overwrites_the_stats_items(self):
+        from work_orders.stats_backfill import backfill_stats
+
+        table = MagicMock()
+        table.scan.return_value = {"Items": [{"status": "received"}, {"status": "received"}]}
+        meta_table = MagicMock()
+        totals = backfill_stats(lambda: table, meta_table, total_segments=1, by_day=False)
+        self.assertEqual(totals, {"stats": {"received": 2, "total": 2}})
+        meta_table.put_item.assert_called_once_with(Item={"id": "stats", "received": 2, "total": 2})
+        self.assertEqual(table.scan.call_args.kwargs["ProjectionExpression"], "#status, deliveryDate")
+
+    def test_batch_token_is_deterministic(self):
+        records = [{"eventID": "a"}, {"eventID": "b"}]
+        self.assertEqual(stats.batch_token(records), stats.batch_token(list(records)))
+        self.assertLessEqual(len(stats.batch_token(records)), 32)
+
+    def test_read_stats(self):
+        table = MagicMock()
+        table.get_item.return_value = {"Item": {"id": "stats", "total": 3, "received": 3}}
+        result = stats.read_stats(table, {"received", "completed"})
+        self.assertEqual(result, {"total": 3, "byStatus": {"completed": 0, "received": 3}})
+        table.get_item.assert_called_once_with(Key={"id": "stats"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders import index_backfill, status_index
+from work_orders.pagination import PaginationError
+
+VALID_STATUSES = {"received", "in_progress", "completed", "canceled"}
+
+
+class FakeIndexTable:
+    """
+    Tabla en memoria que simula Query sobre StatusCreatedAtIndex.
+    """
+
+    def __init__(self, items, page_size=2):
+        self.items = items
+        self.page_size = page_size
+
+    def query(self, **kwargs):
+        partition = kwargs["ExpressionAttributeValues"][":shard"]
+        matches = sorted(
+            (item for item in self.items if item["statusShard"] == partition),
+            key=lambda item: item["createdAt"],
+            reverse=not kwargs.get("ScanIndexForward", True),
+        )
+        start = kwargs.get("ExclusiveStartKey")
+        if start:
+            ids = [item["id"] for item in matches]
+            matches = matches[ids.index(start["id"]) + 1:]
+        size = min(kwargs["Limit"], self.page_size)
+        page = matches[:size]
+        # Como en DynamoDB, el filtro se aplica después de leer la página
+        status = kwargs["ExpressionAttributeValues"].get(":status")
+        result = {"Items": [item for item in page if "FilterExpression" not in kwargs or item["status"] == status]}
+        if len(matches) > size:
+            result["LastEvaluatedKey"] = {
+                "id": page[-1]["id"],
+                "statusShard": partition,
+                "createdAt": page[-1]["createdAt"],
+            }
+        return result
+
+
+class TestStatusIndex(unittest.TestCase):
+
+    def test_status_shard_is_stable(self):
+        shard = status_index.status_shard("received", "1234", 4)
+        self.assertEqual(shard, status_index.status_shard("received", "1234", 4))
+        self.assertTrue(shard.startswith("received#"))
+
+    def test_parse_status_filter(self):
+        self.assertIsNone(status_index.parse_status_filter({}, VALID_STATUSES))
+        parsed = status_index.parse_status_filter(
+            {"status": "received", "since": "2025-02-14T12:00:00Z"}, VALID_STATUSES)
+        self.assertEqual(parsed["since"], "2025-02-14T12:00:00")
+        self.assertIsNone(parsed["until"])
+
+    def test_parse_status_filter_errors(self):
+        for params in [{"status": "unknown"}, {"since": "2025-02-14T12:00:00Z"},
+                       {"status": "received", "until": "2025-02-14"}]:
+            with self.assertRaises(PaginationError):
+                status_index.parse_status_filter(params, VALID_STATUSES)
+
+    def test_query_by_status_paginates_across_shards(self):
+        # Creamos órdenes repartidas entre los shards de 'received'
+        items = []
+        for i in range(11):
+            item = {"id": f"order-{i}", "status": "received", "createdAt": f"2025-02-14T12:00:{i:02d}"}
+            items.append(status_index.with_status_shard(item, 3))
+        table = FakeIndexTable(items)
+
+        seen = []
+        cursor = None
+        while True:
+            page, cursor = status_index.query_by_status(table, "received", limit=4, cursor=cursor, shard_count=3)
+            seen.extend(item["createdAt"] for item in page)
+            if cursor is None:
+                break
+
+        expected = sorted((item["createdAt"] for item in items), reverse=True)
+        self.assertEqual(seen, expected)
+
+    def test_stale_status_shard_is_filtered_out(self):
+        # Una orden completada cuyo statusShard sigue en 'received' no aparece como recibida
+        stale = {**status_index.with_status_shard({"id": "old", "status": "received", "createdAt": "1"}, 1),
+                 "status": "completed"}
+        fresh = status_index.with_status_shard({"id": "new", "status": "received", "createdAt": "2"}, 1)
+        items, cursor = status_index.query_by_status(FakeIndexTable([stale, fresh]), "received", limit=10,
+                                                     shard_count=1)
+        self.assertEqual([item["id"] for item in items], ["new"])
+        self.assertIsNone(cursor)
+
+    def test_set_status_updates_the_shard(self):
+        table = MagicMock()
+        status_index.set_status(table, "1234", "completed", shard_count=4)
+        kwargs = table.update_item.call_args.kwargs
+        self.assertEqual(kwargs["ExpressionAttributeValues"],
+                         {":status": "completed", ":shard": status_index.status_shard("completed", "1234", 4)})
+        self.assertEqual(kwargs["UpdateExpression"], "SET #status = :status, #shard = :shard")
+
+    def test_repair_status_shard(self):
+        table = MagicMock()
+        image = {"id": {"S": "1234"}, "status": {"S": "completed"}, "statusShard": {"S": "received#0"}}
+        self.assertTrue(status_index.repair_status_shard(table, image, shard_count=1))
+        self.assertEqual(table.update_item.call_args.kwargs["ExpressionAttributeValues"],
+                         {":status": "completed", ":shard": "completed#0"})
+
+        # Ya correcto: no se escribe nada
+        table.reset_mock()
+        self.assertFalse(status_index.repair_status_shard(table, {**image, "statusShard": {"S": "completed#0"}},
+                                                          shard_count=1))
+        table.update_item.assert_not_called()
+
+        # El estado cambió otra vez: lo repara el registro de ese cambio
+        error = Exception("conditional")
+        error.response = {"Error": {"Code": "ConditionalCheckFailedException"}}
+        table.update_item.side_effect = error
+        self.assertFalse(status_index.repair_status_shard(table, image, shard_count=1))
+
+    def test_index_backfill(self):
+        current = status_index.with_status_shard({"id": "1", "status": "received"})
+        table = MagicMock()
+        table.scan.return_value = {"Items": [
+            {**current, "deliveryDate": "2025-02-20T12:00:00Z",
+             "deliveryBucket": index_backfill.delivery_bucket("2025-02-20T12:00:00Z", "1")},
+            {**current, "id": "2", "deliveryDate": "2025-02-20T12:00:00Z"},
+        ]}
+        scanned, updated = index_backfill.backfill_indexes(lambda: table, total_segments=1)
+        self.assertEqual((scanned, updated), (2, 1))
+        kwargs = table.update_item.call_args.kwargs
+        self.assertEqual(kwargs["Key"], {"id": "2"})
+        self.assertEqual(set(kwargs["ExpressionAttributeNames"].values()) - {"status", "deliveryDate"},
+                         {"statusShard", "deliveryBucket"})
+        self.assertEqual(kwargs["ExpressionAttributeValues"][":status"], "received")
+
+    def test_query_by_status_time_range(self):
+        table = MagicMock()
+        table.query.return_value = {"Items": []}
+        status_index.query_by_status(table, "completed", limit=10, since="2025-02-01T00:00:00",
+                                     until="2025-02-02T00:00:00", shard_count=2)
+        self.assertEqual(table.query.call_count, 2)
+        kwargs = table.query.call_args.kwargs
+        self.assertEqual(kwargs["ExpressionAttributeValues"][":since"], "2025-02-01T00:00:00")
+        self.assertEqual(kwargs["IndexName"], status_index.STATUS_INDEX_NAME)
+        self.assertIn("BETWEEN", kwargs["KeyConditionExpression"])
+        self.assertFalse(kwargs["ScanIndexForward"])
+
+    def test_query_by_status_open_due_range(self):
+        table = MagicMock()
+        table.query.return_value = {"Items": []}
+        status_index.query_by_status(table, "in_progress", limit=10, due_before="2025-02-20T09:00:00Z", shard_count=2)
+        kwargs = table.query.call_args.kwargs
+        # Las órdenes vencidas hace más de un mes también se leen: no hay límite inferior
+        self.assertEqual(kwargs["FilterExpression"], "#status = :status AND #deliveryDate <= :dueBefore")
+        self.assertEqual(kwargs["ExpressionAttributeValues"][":dueBefore"], "2025-02-20T09:00:00Z")
+        self.assertNotIn(":dueAfter", kwargs["ExpressionAttributeValues"])
+        self.assertEqual(kwargs["ExpressionAttributeNames"]["#deliveryDate"], "deliveryDate")
+
+    def test_query_by_status_rejects_scan_token(self):
+        with self.assertRaises(PaginationError):
+            status_index.query_by_status(MagicMock(), "received", limit=10, cursor={"id": "1"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import json
+import os
+import sys
+import unittest
+from decimal import Decimal
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders.serialization import json_default
+from work_orders.stream_image import LazyImage, deserialize_fields, deserialize_image
+
+
+class TestStreamImage(unittest.TestCase):
+
+    def test_deserialize_all_types(self):
+        image = {
+            "id": {"S": "1234"},
+            "priority": {"N": "3"},
+            "cost": {"N": "10.50"},
+            "urgent": {"BOOL": False},
+            "cancellationReason": {"NULL": True},
+            "payload": {"B": "aGVsbG8="},
+            "tags": {"SS": ["a", "b"]},
+            "sizes": {"NS": ["1", "2.5"]},
+            "blobs": {"BS": ["aGVsbG8="]},
+            "history": {"L": [{"S": "received"}, {"N": "1"}]},
+            "customer": {"M": {"name": {"S": "Ana"}, "vip": {"BOOL": True}}},
+        }
+        item = deserialize_image(image)
+        self.assertEqual(item["id"], "1234")
+        self.assertEqual(item["priority"], 3)
+        self.assertEqual(item["cost"], Decimal("10.50"))
+        self.assertIs(item["urgent"], False)
+        # NULL se decodifica como None y no como True
+        self.assertIsNone(item["cancellationReason"])
+        self.assertEqual(item["payload"], b"hello")
+        self.assertEqual(item["tags"], {"a", "b"})
+        self.assertEqual(item["sizes"], {1, Decimal("2.5")})
+        self.assertEqual(item["blobs"], {b"hello"})
+        self.assertEqual(item["history"], ["received", 1])
+        self.assertEqual(item["customer"], {"name": "Ana", "vip": True})
+
+    def test_deserialize_fields(self):
+        image = {"id": {"S": "1"}, "status": {"S": "received"}, "description": {"S": "x"}}
+        self.assertEqual(deserialize_fields(image, ("id", "status", "missing")), {"id": "1", "status": "received"})
+
+    def test_lazy_image_decodes_on_access(self):
+        image = {"id": {"S": "1"}, "status": {"S": "received"}, "broken": {"XX": "?"}}
+        lazy = LazyImage(image)
+        # Un atributo con tipo desconocido no afecta a los demás mientras no se lea
+        self.assertEqual(lazy["status"], "received")
+        self.assertEqual(len(lazy), 3)
+        with self.assertRaises(KeyError):
+            lazy["broken"]
+
+    def test_json_default(self):
+        body = json.dumps({"n": Decimal("2"), "f": Decimal("2.5"), "s": {"b", "a"}, "b": b"hi"}, default=json_default)
+        self.assertEqual(json.loads(body), {"n": 2, "f": 2.5, "s": ["a", "b"], "b": "aGk="})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import datetime
+import os
+import sys
+import unittest
+
+# Agregamos la capa compartida al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
+
+from work_orders import validation
+
+VALID_BODY = {"description": "Test work order", "deliveryDate": "2025-02-14T12:00:00Z", "status": "received"}
+
+
+def strptime_valid(value):
+    try:
+        datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
+        return True
+    except ValueError:
+        return False
+
+
+class TestValidation(unittest.TestCase):
+
+    def setUp(self):
+        self.validate = validation.WorkOrderValidator(max_description_length=20, max_cancellation_reason_length=10)
+
+    def test_iso8601_matches_strptime(self):
+        # Mismo resultado que strptime para fechas con el formato fijo
+        for value in ["2025-02-14T12:00:00Z", "2024-02-29T00:00:00Z", "2025-02-29T00:00:00Z",
+                      "2025-04-31T10:00:00Z", "2025-12-31T23:59:59Z", "2025-13-01T00:00:00Z",
+                      "2025-01-01T24:00:00Z", "2025-01-01T00:60:00Z", "1900-02-29T00:00:00Z",
+                      "2000-02-29T00:00:00Z", "0000-01-01T00:00:00Z"]:
+            self.assertEqual(validation.is_valid_iso8601(value), strptime_valid(value), value)
+
+    def test_iso8601_rejects_other_layouts(self):
+        for value in ["2025-02-14", "2025-02-14T12:00:00", "2025-02-14 12:00:00Z", "2025/02/14T12:00:00Z",
+                      "2025-0a-14T12:00:00Z", "2025-02-1４T12:00:00Z", None, 20250214]:
+            self.assertFalse(validation.is_valid_iso8601(value), value)
+
+    def test_valid_body(self):
+        self.assertIsNone(self.validate(VALID_BODY))
+
+    def test_errors_are_aggregated(self):
+        error = self.validate({"status": "unknown", "deliveryDate": "tomorrow"})
+        # El mensaje principal sigue siendo el primer error
+        self.assertEqual(error["message"], "Missing required fields.")
+        self.assertEqual(error["missingFields"], ["description"])
+        self.assertIn("validStatuses", error)
+        self.assertEqual([item["field"] for item in error["errors"]], [None, "status", "deliveryDate"])
+
+    def test_canceled_requires_reason(self):
+        error = self.validate({**VALID_BODY, "status": "canceled"})
+        self.assertEqual(error["message"], "Cancellation reason is required when status is 'canceled'.")
+
+    def test_length_and_type_limits(self):
+        error = self.validate({**VALID_BODY, "description": "x" * 21, "status": "canceled", "cancellationReason": 5})
+        self.assertEqual([item["field"] for item in error["errors"]], ["description", "cancellationReason"])
+        self.assertIn("at most 20 characters", error["message"])
+
+    def test_customer_id_is_optional(self):
+        self.assertIsNone(self.validate({**VALID_BODY, "customerId": "customer-1"}))
+        error = self.validate({**VALID_BODY, "customerId": 42})
+        self.assertEqual(error["errors"][0]["field"], "customerId")
+
+    def test_unhashable_status(self):
+        error = self.validate({**VALID_BODY, "status": ["received"]})
+        self.assertEqual(error["errors"][0]["field"], "status")
+
+    def test_body_must_be_an_object(self):
+        self.assertEqual(self.validate(["received"])["message"], "The work order must be a JSON object.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@ import json
 import os
 import sys
 import unittest
+from decimal import Decimal
 from unittest.mock import patch, MagicMock
 
 # Configuramos las variables de entorno necesarias para los tests
@@ -12,8 +13,9 @@ os.environ["SQS_COMPLETED"] = "https://sqs.us-east-1.amazonaws.com/123456789012/
 os.environ["SQS_CANCELED"] = "https://sqs.us-east-1.amazonaws.com/123456789012/work-orders-canceled.fifo"
 os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
 
-# Agregamos al sys.path la carpeta 'src' para poder importar el módulo handler
+# Agregamos al sys.path la carpeta 'src' y la capa compartida 'common' para poder importar el módulo handler
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'common', 'python'))
 
 # Importamos el módulo completo
 import handler
@@ -53,7 +55,10 @@ class TestLambdaHandler(unittest.TestCase):
         self.assertIn("data", body)
         # Verificamos que se haya llamado a DynamoDB y SQS
         mock_table.put_item.assert_called_once()
+        self.assertIn("statusShard", mock_table.put_item.call_args.kwargs["Item"])
         mock_sqs.send_message.assert_called_once()
+        # Cada orden va en su propio grupo FIFO
+        self.assertEqual(mock_sqs.send_message.call_args.kwargs["MessageGroupId"], body["data"]["id"])
 
     @patch("handler.dynamodb")
     @patch("handler.sqs")
@@ -134,5 +139,188 @@ class TestLambdaHandler(unittest.TestCase):
         self.assertEqual(body["data"]["total"], 1)
         self.assertEqual(body["data"]["items"][0]["id"], "1")
 
+    @patch("handler.dynamodb")
+    def test_list_work_orders_next_token(self, mock_dynamodb):
+        # Simulamos una página con más resultados pendientes
+        mock_table = MagicMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_table.scan.return_value = {"Items": [{"id": "1"}], "LastEvaluatedKey": {"id": "1"}}
+
+        event = {"httpMethod": "GET", "queryStringParameters": {"limit": "1"}}
+        response = handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 200)
+        body = json.loads(response["body"])
+        token = body["data"]["nextToken"]
+        self.assertIsNotNone(token)
+
+        # La siguiente página continúa desde el token
+        mock_table.scan.return_value = {"Items": [{"id": "2"}]}
+        event = {"httpMethod": "GET", "queryStringParameters": {"limit": "1", "nextToken": token}}
+        response = handler.lambda_handler(event, {})
+        body = json.loads(response["body"])
+        self.assertIsNone(body["data"]["nextToken"])
+        self.assertEqual(mock_table.scan.call_args.kwargs["ExclusiveStartKey"], {"id": "1"})
+
+    def test_list_work_orders_invalid_limit(self):
+        event = {"httpMethod": "GET", "queryStringParameters": {"limit": "abc"}}
+        response = handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 400)
+
+    @patch("handler.dynamodb")
+    def test_list_work_orders_by_status(self, mock_dynamodb):
+        # El filtro por estado usa Query sobre el índice en lugar de Scan
+        mock_table = MagicMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_table.query.return_value = {"Items": [{"id": "1", "status": "received", "createdAt": "2025-02-14T12:00:00"}]}
+
+        event = {"httpMethod": "GET", "queryStringParameters": {"status": "received"}}
+        response = handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 200)
+        mock_table.scan.assert_not_called()
+        self.assertEqual(mock_table.query.call_args.kwargs["IndexName"], "StatusCreatedAtIndex")
+
+    def test_list_work_orders_invalid_status_filter(self):
+        event = {"httpMethod": "GET", "queryStringParameters": {"status": "unknown"}}
+        response = handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 400)
+
+    @patch("handler.dynamodb")
+    @patch("handler.sqs")
+    def test_create_work_orders_batch(self, mock_sqs, mock_dynamodb):
+        # Un lote con una orden válida y otra inválida
+        mock_dynamodb.batch_write_item.return_value = {"UnprocessedItems": {}}
+        mock_sqs.send_message_batch.return_value = {}
+
+        event = {
+            "httpMethod": "POST",
+            "resource": "/work-orders/batch",
+            "body": json.dumps({"workOrders": [
+                {"description": "Test work order", "deliveryDate": "2025-02-14T12:00:00Z", "status": "received"},
+                {"description": "Sin fecha", "status": "received"}
+            ]})
+        }
+        response = handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 207)
+        body = json.loads(response["body"])
+        self.assertEqual([result["statusCode"] for result in body["data"]["results"]], [201, 400])
+        mock_dynamodb.batch_write_item.assert_called_once()
+        mock_sqs.send_message_batch.assert_called_once()
+        self.assertTrue(body["data"]["results"][0]["published"])
+
+    def test_create_work_orders_batch_empty(self):
+        event = {
+            "httpMethod": "POST",
+            "resource": "/work-orders/batch",
+            "body": json.dumps({"workOrders": []})
+        }
+        response = handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 400)
+
+    @patch("work_orders.dispatch.OUTBOX_TABLE", "WorkOrdersOutboxTable")
+    @patch("work_orders.dispatch.PUBLISH_MODE", "concurrent")
+    @patch("handler.dynamodb")
+    @patch("handler.sqs")
+    def test_create_work_order_concurrent_publish_failure(self, mock_sqs, mock_dynamodb):
+        # La orden se guarda pero el evento no se publica: pasa al outbox para reenviarlo
+        mock_table = MagicMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_sqs.send_message.side_effect = Exception("Service unavailable")
+
+        event = {
+            "httpMethod": "POST",
+            "body": json.dumps({
+                "description": "Test work order",
+                "deliveryDate": "2025-02-14T12:00:00Z",
+                "status": "received"
+            })
+        }
+        response = handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 201)
+        mock_table.put_item.assert_called_once()
+        actions = mock_dynamodb.meta.client.transact_write_items.call_args.kwargs["TransactItems"]
+        self.assertEqual(actions[1]["Put"]["TableName"], "WorkOrdersOutboxTable")
+
+    @patch("work_orders.dispatch.PUBLISH_MODE", "concurrent")
+    @patch("handler.dynamodb")
+    @patch("handler.sqs")
+    def test_create_work_order_concurrent_store_failure(self, mock_sqs, mock_dynamodb):
+        # El evento se publica pero DynamoDB falla: se publica la compensación
+        mock_table = MagicMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_table.put_item.side_effect = Exception("Table unavailable")
+
+        event = {
+            "httpMethod": "POST",
+            "body": json.dumps({
+                "description": "Test work order",
+                "deliveryDate": "2025-02-14T12:00:00Z",
+                "status": "received"
+            })
+        }
+        response = handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 500)
+        self.assertEqual(mock_sqs.send_message.call_count, 2)
+
+    @patch("work_orders.dispatch.PUBLISH_MODE", "outbox")
+    @patch("handler.dynamodb")
+    @patch("handler.sqs")
+    def test_create_work_order_outbox(self, mock_sqs, mock_dynamodb):
+        # La orden y su evento pendiente se guardan en una sola transacción, sin publicar
+        event = {
+            "httpMethod": "POST",
+            "body": json.dumps({
+                "description": "Test work order",
+                "deliveryDate": "2025-02-14T12:00:00Z",
+                "status": "received"
+            })
+        }
+        response = handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 201)
+        mock_dynamodb.meta.client.transact_write_items.assert_called_once()
+        mock_sqs.send_message.assert_not_called()
+
+    @patch("handler.sqs")
+    def test_relay_outbox(self, mock_sqs):
+        # El relay publica en lote los eventos pendientes del stream del outbox
+        mock_sqs.send_message_batch.return_value = {"Successful": [], "Failed": []}
+        image = {"id": {"S": "1234"}, "workOrder": {"M": {
+            "id": {"S": "1234"},
+            "status": {"S": "received"},
+            "description": {"S": "Test work order"}
+        }}}
+        event = {"Records": [{"eventName": "INSERT", "dynamodb": {"SequenceNumber": "1", "NewImage": image}}]}
+        result = handler.relay_outbox(event, {})
+        self.assertEqual(result, {"batchItemFailures": []})
+        mock_sqs.send_message_batch.assert_called_once()
+
+    @patch("handler.dynamodb")
+    def test_list_work_orders_with_numbers(self, mock_dynamodb):
+        # DynamoDB devuelve los números como Decimal; la respuesta debe serializarlos
+        mock_table = MagicMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_table.scan.return_value = {"Items": [{"id": "1", "priority": Decimal("2"), "cost": Decimal("10.5")}]}
+
+        response = handler.lambda_handler({"httpMethod": "GET"}, {})
+        self.assertEqual(response["statusCode"], 200)
+        item = json.loads(response["body"])["data"]["items"][0]
+        self.assertEqual((item["priority"], item["cost"]), (2, 10.5))
+
+    @patch("handler.dynamodb")
+    @patch("handler.sqs")
+    def test_create_work_order_serializes_once(self, mock_sqs, mock_dynamodb):
+        # El cuerpo del mensaje y el 'data' de la respuesta son el mismo JSON
+        event = {
+            "httpMethod": "POST",
+            "body": json.dumps({
+                "description": "Test work order",
+                "deliveryDate": "2025-02-14T12:00:00Z",
+                "status": "received"
+            })
+        }
+        response = handler.lambda_handler(event, {})
+        message_body = mock_sqs.send_message.call_args.kwargs["MessageBody"]
+        self.assertIn(message_body, response["body"])
+        self.assertEqual(json.loads(response["body"])["data"], json.loads(message_body))
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,35 @@
+from work_orders.datamart import compact_all, export_records, make_store
+from work_orders.metrics import count, instrument, phase
+
+# Built on first use and reused across warm invocations
+_store = None
+
+def datamart_store():
+    global _store
+    if _store is None:
+        _store = make_store()
+    return _store
+
+@instrument("datamart")
+def lambda_handler(event, context):
+    """
+    Writes the work order changes of a DynamoDB Stream batch to the datamart.
+    The event source mapping does the micro-batching (batchSize and
+    maximumBatchingWindow); files are named after their records, so when a
+    failed batch is retried its files are overwritten, not duplicated.
+    """
+    with phase("export"):
+        keys = export_records(event["Records"], datamart_store())
+    count("records", len(event["Records"]))
+    count("files", len(keys))
+    print(f"Wrote {len(keys)} datamart files from {len(event['Records'])} records")
+    return {"files": len(keys)}
+
+@instrument("datamart_compact")
+def compact(event, context):
+    """
+    Scheduled: merges the small files of every datamart partition.
+    """
+    merged = compact_all(datamart_store())
+    print(f"Compacted {len(merged)} datamart partitions")
+    return {"partitions": len(merged)}
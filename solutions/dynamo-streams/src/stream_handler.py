@@ -1,9 +1,20 @@
-import json
-import boto3
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-# AWS Clients
-sqs = boto3.client("sqs")
+from work_orders.batch import send_message_batch
+from work_orders.clients import lazy_client, lazy_resource
+from work_orders.conditional import touch_watermark
+from work_orders.grouping import message_group_id
+from work_orders.lookup import INTERNAL_ATTRIBUTES
+from work_orders.metrics import count, instrument, phase
+from work_orders.serialization import dumps
+from work_orders.stats import apply_deltas, batch_token, count_deltas
+from work_orders.status_index import repair_status_shard
+from work_orders.stream_image import LazyImage, deserialize_value
+
+# AWS Clients (created on first use and reused across warm invocations)
+sqs = lazy_client("sqs")
+dynamodb = lazy_resource("dynamodb")
 
 # Environment Variables
 SQS_QUEUES = {
@@ -13,44 +24,211 @@ SQS_QUEUES = {
     "canceled": os.getenv("SQS_CANCELED"),
 }
 
+# Work orders table: statusShard is re-derived here when a status changes without it
+TABLE_NAME = os.getenv("DYNAMODB_TABLE")
+
+# Table holding the per-status counters and the list watermark; without it
+# no counters are kept and the watermark only moves on API writes
+META_TABLE = os.getenv("META_TABLE")
+
+# Which stream records are forwarded:
+#   transitions - INSERTs and MODIFYs that change the status (needs NEW_AND_OLD_IMAGES)
+#   all         - every INSERT and MODIFY
+EMIT_TRANSITIONS = "transitions"
+EMIT_ALL = "all"
+STREAM_EMIT_MODE = os.getenv("STREAM_EMIT_MODE", EMIT_TRANSITIONS)
+
+# Queues are sent to concurrently, reusing the same pool across warm invocations
+FANOUT_WORKERS = int(os.getenv("STREAM_FANOUT_WORKERS", "4"))
+fanout_executor = ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix="sqs-fanout")
+
+@instrument("stream")
 def lambda_handler(event, context):
     """
     Processes DynamoDB Stream events and sends work orders to the correct SQS queue.
+    Records are grouped by queue and sent with SendMessageBatch. Only the records
+    that could not be sent are reported back, so Lambda retries just those.
+    The status index partition of the changed orders is re-derived, the
+    per-status counters are updated for the records that will not be retried,
+    and the list watermark is moved so cached pages see every change.
     """
-    try:
-        for record in event["Records"]:
-            if record["eventName"] in ["INSERT", "MODIFY"]:
-                new_image = record["dynamodb"]["NewImage"]
-                work_order = convert_dynamodb_item(new_image)
+    count("records", len(event["Records"]))
 
-                # Send to SQS based on status
-                send_to_sqs(work_order)
+    with phase("decode"):
+        entries_by_queue, sequence_numbers = route_records(event["Records"])
 
-        return {"statusCode": 200, "body": "Processed successfully"}
+    with phase("publish"):
+        failed = send_to_sqs(entries_by_queue)
+    failures = [sequence_numbers[entry_id] for entry_id in failed]
 
+    try:
+        with phase("dynamodb"):
+            repair_status_shards(event["Records"])
+            update_counters(event["Records"], failures)
     except Exception as e:
-        return {"statusCode": 500, "body": str(e)}
+        # Nothing was counted: the whole batch is retried (repairs are idempotent)
+        print(f"Error updating indexes or counters: {e}")
+        failures = [record["dynamodb"].get("SequenceNumber", "0") for record in event["Records"][:1]]
+
+    with phase("watermark"):
+        bump_watermark(event["Records"])
+
+    return {
+        "batchItemFailures": [{"itemIdentifier": sequence_number} for sequence_number in failures]
+    }
 
-def send_to_sqs(work_order):
+def route_records(records):
     """
-    Sends a work order message to the correct SQS FIFO queue.
+    Decodes the routable stream records into SendMessageBatch entries grouped by queue.
+    Returns (entries_by_queue, sequence_numbers), the latter mapping entry ids
+    to the sequence number of their record.
+    """
+    entries_by_queue = {}
+    sequence_numbers = {}
+
+    for index, record in enumerate(records):
+        if record["eventName"] not in ["INSERT", "MODIFY"]:
+            continue
+        if STREAM_EMIT_MODE == EMIT_TRANSITIONS and not is_status_transition(record):
+            continue
+        if not changes_work_order(record):
+            continue
+
+        try:
+            # Only the status is decoded until the record is known to be routable
+            image = LazyImage(record["dynamodb"]["NewImage"])
+            queue_url = SQS_QUEUES.get(image["status"])
+            if not queue_url:
+                raise ValueError(f"No queue configured for status: {image['status']}")
+            # Internal attributes (index keys) are not part of the message
+            work_order = image.to_dict([name for name in image if name not in INTERNAL_ATTRIBUTES])
+            previous_status = get_previous_status(record)
+            if previous_status:
+                work_order["previousStatus"] = previous_status
+            # Serializing fails too, e.g. on numbers outside the 64-bit range
+            entry_id = str(index)
+            entry = build_sqs_entry(entry_id, record, work_order)
+        except Exception as e:
+            # A malformed record would fail on every retry, so it is skipped
+            print(f"Skipping stream record {record.get('eventID')}: {e}")
+            continue
+
+        sequence_numbers[entry_id] = record["dynamodb"].get("SequenceNumber", entry_id)
+        entries_by_queue.setdefault(queue_url, []).append(entry)
+
+    return entries_by_queue, sequence_numbers
+
+def repair_status_shards(records):
+    """
+    Re-derives the statusShard of the orders whose status was changed
+    without it (e.g. by an UpdateItem that only sets 'status'), so the
+    status index lists them under their current status.
+    """
+    if not TABLE_NAME:
+        return
+    table = dynamodb.Table(TABLE_NAME)
+    repaired = 0
+    for record in records:
+        if record["eventName"] in ("INSERT", "MODIFY") and record["dynamodb"].get("NewImage"):
+            repaired += repair_status_shard(table, record["dynamodb"]["NewImage"])
+    if repaired:
+        count("statusShardRepairs", repaired)
+
+def update_counters(records, failures):
     """
+    Applies the counter changes of the records that Lambda will not deliver
+    again. Lambda retries from the lowest failed sequence number, so the
+    records from there on are counted on the retry instead.
+    """
+    if not META_TABLE:
+        return
+    if failures:
+        first_failure = min(int(sequence_number) for sequence_number in failures)
+        records = [record for record in records if int(record["dynamodb"].get("SequenceNumber", 0)) < first_failure]
+    deltas = count_deltas(records)
+    if deltas:
+        apply_deltas(dynamodb, META_TABLE, deltas, token=batch_token(records))
+
+def bump_watermark(records):
+    """
+    Moves the list watermark once per batch of changes. API writes already
+    move it, but status transitions and other writes made outside the API
+    only reach the list cache this way. A failure is only counted: watermark
+    ETags expire after WATERMARK_MAX_AGE_SECONDS anyway.
+    """
+    if not META_TABLE or not any(record["eventName"] in ("INSERT", "MODIFY", "REMOVE") for record in records):
+        return
     try:
-        queue_url = SQS_QUEUES.get(work_order["status"])
-        if not queue_url:
-            raise ValueError(f"No queue configured for status: {work_order['status']}")
-
-        sqs.send_message(
-            QueueUrl=queue_url,
-            MessageBody=json.dumps(work_order),
-            MessageGroupId=work_order["status"],
-            MessageDeduplicationId=work_order["id"]
-        )
+        touch_watermark(dynamodb, META_TABLE)
     except Exception as e:
-        print(f"Error sending to SQS: {e}")
+        count("watermarkErrors")
+        print(f"Error updating the watermark: {e}")
 
-def convert_dynamodb_item(item):
+def is_status_transition(record):
+    """
+    Tells whether a stream record changes the status of a work order.
+    INSERTs always do; MODIFYs only when the old and new status differ.
+    The raw attributes are compared, so nothing is decoded for no-op updates.
     """
-    Converts DynamoDB format to a normal Python dictionary.
+    if record["eventName"] != "MODIFY":
+        return True
+    old_image = record["dynamodb"].get("OldImage")
+    if old_image is None:
+        # Without the old image (NEW_IMAGE streams) every update is forwarded
+        return True
+    return old_image.get("status") != record["dynamodb"]["NewImage"].get("status")
+
+def changes_work_order(record):
+    """
+    Tells whether a stream record changes an attribute of the work order
+    itself. MODIFYs that only touch internal attributes (such as the
+    statusShard repairs made here) are not forwarded.
+    """
+    old_image = record["dynamodb"].get("OldImage")
+    if record["eventName"] != "MODIFY" or old_image is None:
+        return True
+    new_image = record["dynamodb"]["NewImage"]
+    return any(old_image.get(name) != new_image.get(name)
+               for name in old_image.keys() | new_image.keys() if name not in INTERNAL_ATTRIBUTES)
+
+def get_previous_status(record):
     """
-    return {key: list(value.values())[0] for key, value in item.items()}
+    Returns the status a work order is transitioning from, or None.
+    """
+    if record["eventName"] != "MODIFY" or not is_status_transition(record):
+        return None
+    old_status = record["dynamodb"].get("OldImage", {}).get("status")
+    return deserialize_value(old_status) if old_status else None
+
+def build_sqs_entry(entry_id, record, work_order):
+    """
+    Builds the SendMessageBatch entry for a stream record.
+    The stream event id is used as deduplication id, so a retried record is
+    dropped by SQS while later changes to the same order are still delivered.
+    """
+    return {
+        "Id": entry_id,
+        "MessageBody": dumps(work_order),
+        "MessageGroupId": message_group_id(work_order),
+        "MessageDeduplicationId": record.get("eventID", work_order["id"])
+    }
+
+def send_to_sqs(entries_by_queue):
+    """
+    Sends the entries for each SQS FIFO queue with SendMessageBatch, in chunks of 10.
+    Queues are independent, so they are sent to concurrently with the shared client;
+    the entries of each queue are still sent sequentially to keep FIFO order.
+    Returns a dict mapping the ids of the entries that could not be sent to an error message.
+    """
+    futures = [
+        fanout_executor.submit(send_message_batch, sqs, queue_url, entries, ordered=True)
+        for queue_url, entries in entries_by_queue.items()
+    ]
+
+    failed = {}
+    for future in futures:
+        queue_failures = future.result()
+        for message in queue_failures.values():
+            print(f"Error sending to SQS: {message}")
+        failed.update(queue_failures)
+    return failed
@@ -8,10 +8,12 @@ from unittest.mock import patch, MagicMock
 os.environ["DYNAMODB_TABLE"] = "TestTable"
 os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
 
-# Agregamos la carpeta 'src' al PYTHONPATH para poder importar el módulo
+# Agregamos la carpeta 'src' y la capa compartida 'common' al PYTHONPATH para poder importar el módulo
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'common', 'python'))
 
 import api_handler  # asumiendo que el archivo se llama api_handler.py
+from work_orders.lookup import work_order_cache
 
 # Actualizamos las variables globales del módulo según las variables de entorno
 api_handler.TABLE_NAME = os.environ["DYNAMODB_TABLE"]
@@ -38,6 +40,7 @@ class TestAPIHandler(unittest.TestCase):
         body = json.loads(response["body"])
         self.assertIn("data", body)
         mock_table.put_item.assert_called_once()
+        self.assertIn("statusShard", mock_table.put_item.call_args.kwargs["Item"])
 
     @patch("api_handler.dynamodb")
     def test_create_work_order_missing_fields(self, mock_dynamodb):
@@ -114,5 +117,131 @@ class TestAPIHandler(unittest.TestCase):
         self.assertEqual(body["data"]["total"], 1)
         self.assertEqual(body["data"]["items"][0]["id"], "1")
 
+    @patch("api_handler.dynamodb")
+    def test_list_work_orders_next_token(self, mock_dynamodb):
+        # Simulamos una página con más resultados pendientes
+        mock_table = MagicMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_table.scan.return_value = {"Items": [{"id": "1"}], "LastEvaluatedKey": {"id": "1"}}
+
+        event = {"httpMethod": "GET", "queryStringParameters": {"limit": "1"}}
+        response = api_handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 200)
+        body = json.loads(response["body"])
+        token = body["data"]["nextToken"]
+        self.assertIsNotNone(token)
+
+        # La siguiente página continúa desde el token
+        mock_table.scan.return_value = {"Items": [{"id": "2"}]}
+        event = {"httpMethod": "GET", "queryStringParameters": {"limit": "1", "nextToken": token}}
+        response = api_handler.lambda_handler(event, {})
+        body = json.loads(response["body"])
+        self.assertIsNone(body["data"]["nextToken"])
+        self.assertEqual(mock_table.scan.call_args.kwargs["ExclusiveStartKey"], {"id": "1"})
+
+    def test_list_work_orders_invalid_limit(self):
+        event = {"httpMethod": "GET", "queryStringParameters": {"limit": "abc"}}
+        response = api_handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 400)
+
+    @patch("api_handler.dynamodb")
+    def test_list_work_orders_by_status(self, mock_dynamodb):
+        # El filtro por estado usa Query sobre el índice en lugar de Scan
+        mock_table = MagicMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_table.query.return_value = {"Items": [{"id": "1", "status": "received", "createdAt": "2025-02-14T12:00:00"}]}
+
+        event = {"httpMethod": "GET", "queryStringParameters": {"status": "received"}}
+        response = api_handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 200)
+        mock_table.scan.assert_not_called()
+        self.assertEqual(mock_table.query.call_args.kwargs["IndexName"], "StatusCreatedAtIndex")
+
+    def test_list_work_orders_invalid_status_filter(self):
+        event = {"httpMethod": "GET", "queryStringParameters": {"status": "unknown"}}
+        response = api_handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 400)
+
+    @patch("api_handler.dynamodb")
+    def test_create_work_orders_batch(self, mock_dynamodb):
+        # Un lote con una orden válida y otra inválida
+        mock_dynamodb.batch_write_item.return_value = {"UnprocessedItems": {}}
+
+        event = {
+            "httpMethod": "POST",
+            "resource": "/work-orders/batch",
+            "body": json.dumps({"workOrders": [
+                {"description": "Test work order", "deliveryDate": "2025-02-14T12:00:00Z", "status": "received"},
+                {"description": "Sin fecha", "status": "received"}
+            ]})
+        }
+        response = api_handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 207)
+        body = json.loads(response["body"])
+        self.assertEqual([result["statusCode"] for result in body["data"]["results"]], [201, 400])
+        mock_dynamodb.batch_write_item.assert_called_once()
+
+    def test_create_work_orders_batch_empty(self):
+        event = {
+            "httpMethod": "POST",
+            "resource": "/work-orders/batch",
+            "body": json.dumps({"workOrders": []})
+        }
+        response = api_handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 400)
+
+    @patch("api_handler.dynamodb")
+    def test_get_work_order_by_id_is_cached(self, mock_dynamodb):
+        work_order_cache.clear()
+        mock_table = MagicMock()
+        mock_table.name = "TestTable"
+        mock_table.get_item.return_value = {"Item": {"id": "1234", "status": "received"}}
+        mock_dynamodb.Table.return_value = mock_table
+
+        event = {"httpMethod": "GET", "resource": "/work-orders/{id}", "pathParameters": {"id": "1234"}}
+        first = api_handler.lambda_handler(event, {})
+        second = api_handler.lambda_handler(event, {})
+        self.assertEqual(first["statusCode"], 200)
+        self.assertEqual(json.loads(first["body"])["data"]["id"], "1234")
+        # La segunda petición se sirve desde la caché de la invocación caliente
+        self.assertEqual((first["headers"]["X-Cache"], second["headers"]["X-Cache"]), ("Miss", "Hit"))
+        mock_table.get_item.assert_called_once()
+
+    @patch("api_handler.dynamodb")
+    def test_get_work_order_not_found(self, mock_dynamodb):
+        work_order_cache.clear()
+        mock_dynamodb.Table.return_value.get_item.return_value = {}
+        event = {"httpMethod": "GET", "resource": "/work-orders/{id}", "pathParameters": {"id": "missing"}}
+        response = api_handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 404)
+
+    @patch("api_handler.dynamodb")
+    def test_get_work_orders_by_ids(self, mock_dynamodb):
+        work_order_cache.clear()
+        mock_dynamodb.batch_get_item.return_value = {
+            "Responses": {"TestTable": [{"id": "b"}, {"id": "a"}]}, "UnprocessedKeys": {}
+        }
+        event = {"httpMethod": "GET", "queryStringParameters": {"ids": "a,b,c"}}
+        response = api_handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 200)
+        data = json.loads(response["body"])["data"]
+        # Se respeta el orden pedido y se informan los ids inexistentes
+        self.assertEqual([item["id"] for item in data["items"]], ["a", "b"])
+        self.assertEqual(data["missingIds"], ["c"])
+
+    @patch("api_handler.dynamodb")
+    def test_get_stats_is_a_single_get_item(self, mock_dynamodb):
+        mock_table = MagicMock()
+        mock_table.get_item.return_value = {"Item": {"id": "stats", "total": 5, "received": 2, "completed": 3}}
+        mock_dynamodb.Table.return_value = mock_table
+        event = {"httpMethod": "GET", "resource": "/work-orders/stats"}
+        with patch("work_orders.core.META_TABLE", "Meta"):
+            response = api_handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 200)
+        data = json.loads(response["body"])["data"]
+        self.assertEqual((data["total"], data["byStatus"]["completed"]), (5, 3))
+        mock_table.get_item.assert_called_once()
+        mock_table.scan.assert_not_called()
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,54 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Agregamos la carpeta 'src' y la capa compartida 'common' al PYTHONPATH para poder importar el módulo
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'common', 'python'))
+
+import datamart_handler
+from work_orders import datamart
+from work_orders.datamart import LocalStore
+
+
+def insert_record(sequence, status="received"):
+    return {
+        "eventID": f"event-{sequence}",
+        "eventName": "INSERT",
+        "dynamodb": {
+            "SequenceNumber": sequence,
+            "ApproximateCreationDateTime": 1739534400,
+            "NewImage": {
+                "id": {"S": f"order-{sequence}"},
+                "createdAt": {"S": "2025-02-14T12:00:00"},
+                "description": {"S": "Test work order"},
+                "deliveryDate": {"S": "2025-02-20T12:00:00Z"},
+                "status": {"S": status},
+            },
+        },
+    }
+
+
+@unittest.skipUnless(datamart.pyarrow, "pyarrow is not installed")
+class TestDatamartHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        datamart_handler._store = LocalStore(self.root.name)
+
+    def tearDown(self):
+        datamart_handler._store = None
+        self.root.cleanup()
+
+    def test_stream_batch_is_written_by_partition(self):
+        event = {"Records": [insert_record("1"), insert_record("2", "completed"), {"eventName": "REMOVE", "dynamodb": {}}]}
+        self.assertEqual(datamart_handler.lambda_handler(event, {}), {"files": 2})
+        self.assertEqual(
+            [key.rsplit("/", 1)[0] for key in datamart_handler._store.list()],
+            ["status=completed/date=2025-02-14", "status=received/date=2025-02-14"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,343 @@
+import os
+import sys
+import json
+import threading
+import unittest
+from unittest.mock import patch
+
+# Configuramos las variables de entorno necesarias para SQS
+os.environ["SQS_RECEIVED"] = "https://sqs.us-east-1.amazonaws.com/123456789012/work-orders-received"
+os.environ["SQS_IN_PROGRESS"] = "https://sqs.us-east-1.amazonaws.com/123456789012/work-orders-in-progress"
+os.environ["SQS_COMPLETED"] = "https://sqs.us-east-1.amazonaws.com/123456789012/work-orders-completed"
+os.environ["SQS_CANCELED"] = "https://sqs.us-east-1.amazonaws.com/123456789012/work-orders-canceled"
+os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+
+# Agregamos la carpeta 'src' y la capa compartida 'common' al PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'common', 'python'))
+
+import stream_handler  # asumiendo que el archivo se llama stream_handler.py
+
+class TestStreamHandler(unittest.TestCase):
+
+    def setUp(self):
+        # Sin tabla configurada no se reparan índices; los tests que lo necesitan la activan
+        patcher = patch("stream_handler.TABLE_NAME", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("stream_handler.sqs")
+    def test_process_dynamodb_stream_insert(self, mock_sqs):
+        # Preparamos un registro de evento DynamoDB con evento INSERT
+        fake_record = {
+            "eventName": "INSERT",
+            "dynamodb": {
+                "NewImage": {
+                    "id": {"S": "1234"},
+                    "description": {"S": "Test work order"},
+                    "deliveryDate": {"S": "2025-02-14T12:00:00Z"},
+                    "status": {"S": "received"}
+                }
+            }
+        }
+        mock_sqs.send_message_batch.return_value = {"Successful": [{"Id": "0"}], "Failed": []}
+        event = {"Records": [fake_record]}
+        context = {}
+        response = stream_handler.lambda_handler(event, context)
+        self.assertEqual(response["batchItemFailures"], [])
+        # Verificamos que se haya llamado a sqs.send_message_batch
+        mock_sqs.send_message_batch.assert_called_once()
+
+    @patch("stream_handler.sqs")
+    def test_process_dynamodb_stream_no_insert(self, mock_sqs):
+        # Evento sin registros INSERT o MODIFY
+        event = {"Records": [
+            {"eventName": "REMOVE", "dynamodb": {"NewImage": {}}}
+        ]}
+        context = {}
+        response = stream_handler.lambda_handler(event, context)
+        self.assertEqual(response["batchItemFailures"], [])
+        # No se debería llamar a sqs.send_message_batch
+        mock_sqs.send_message_batch.assert_not_called()
+
+    @patch("stream_handler.sqs")
+    def test_process_dynamodb_stream_partial_failure(self, mock_sqs):
+        # Dos registros del mismo estado; SQS rechaza el segundo
+        records = [
+            {
+                "eventID": f"event-{i}",
+                "eventName": "INSERT",
+                "dynamodb": {
+                    "SequenceNumber": f"10{i}",
+                    "NewImage": {
+                        "id": {"S": f"order-{i}"},
+                        "status": {"S": "received"}
+                    }
+                }
+            }
+            for i in range(2)
+        ]
+        mock_sqs.send_message_batch.return_value = {
+            "Successful": [{"Id": "0"}],
+            "Failed": [{"Id": "1", "Code": "InvalidParameterValue", "Message": "bad", "SenderFault": True}]
+        }
+        response = stream_handler.lambda_handler({"Records": records}, {})
+        self.assertEqual(response["batchItemFailures"], [{"itemIdentifier": "101"}])
+
+        # Se envían en una sola llamada, deduplicando por eventID
+        entries = mock_sqs.send_message_batch.call_args.kwargs["Entries"]
+        self.assertEqual([entry["MessageDeduplicationId"] for entry in entries], ["event-0", "event-1"])
+
+    @patch("stream_handler.sqs")
+    def test_process_dynamodb_stream_chunks_of_ten(self, mock_sqs):
+        records = [
+            {
+                "eventName": "INSERT",
+                "dynamodb": {"NewImage": {"id": {"S": f"order-{i}"}, "status": {"S": "completed"}}}
+            }
+            for i in range(25)
+        ]
+        mock_sqs.send_message_batch.return_value = {"Failed": []}
+        response = stream_handler.lambda_handler({"Records": records}, {})
+        self.assertEqual(response["batchItemFailures"], [])
+        self.assertEqual(mock_sqs.send_message_batch.call_count, 3)
+
+    @patch("stream_handler.sqs")
+    def test_process_dynamodb_stream_fans_out_concurrently(self, mock_sqs):
+        # Un registro por cada estado: cuatro colas distintas
+        statuses = ["received", "in_progress", "completed", "canceled"]
+        records = [
+            {
+                "eventName": "INSERT",
+                "dynamodb": {"NewImage": {"id": {"S": f"order-{i}"}, "status": {"S": status}}}
+            }
+            for i, status in enumerate(statuses)
+        ]
+        # La barrera sólo se libera si los cuatro envíos ocurren a la vez
+        barrier = threading.Barrier(len(statuses), timeout=5)
+
+        def send_message_batch(**kwargs):
+            barrier.wait()
+            return {"Failed": []}
+
+        mock_sqs.send_message_batch.side_effect = send_message_batch
+        response = stream_handler.lambda_handler({"Records": records}, {})
+        self.assertEqual(response["batchItemFailures"], [])
+        queue_urls = {call.kwargs["QueueUrl"] for call in mock_sqs.send_message_batch.call_args_list}
+        self.assertEqual(queue_urls, set(stream_handler.SQS_QUEUES.values()))
+
+    @patch("stream_handler.sqs")
+    def test_process_dynamodb_stream_decodes_types(self, mock_sqs):
+        # Un registro cancelado sin motivo (NULL) y con atributos numéricos
+        record = {
+            "eventName": "MODIFY",
+            "dynamodb": {
+                "NewImage": {
+                    "id": {"S": "1234"},
+                    "status": {"S": "canceled"},
+                    "priority": {"N": "2"},
+                    "cancellationReason": {"NULL": True}
+                }
+            }
+        }
+        mock_sqs.send_message_batch.return_value = {"Failed": []}
+        stream_handler.lambda_handler({"Records": [record]}, {})
+        entry = mock_sqs.send_message_batch.call_args.kwargs["Entries"][0]
+        body = json.loads(entry["MessageBody"])
+        self.assertIsNone(body["cancellationReason"])
+        self.assertEqual(body["priority"], 2)
+
+    @patch("stream_handler.sqs")
+    def test_process_dynamodb_stream_skips_noop_modify(self, mock_sqs):
+        # Se edita la descripción pero el estado no cambia
+        record = {
+            "eventName": "MODIFY",
+            "dynamodb": {
+                "OldImage": {"id": {"S": "1234"}, "status": {"S": "received"}, "description": {"S": "Antes"}},
+                "NewImage": {"id": {"S": "1234"}, "status": {"S": "received"}, "description": {"S": "Después"}}
+            }
+        }
+        response = stream_handler.lambda_handler({"Records": [record]}, {})
+        self.assertEqual(response["batchItemFailures"], [])
+        mock_sqs.send_message_batch.assert_not_called()
+
+    @patch("stream_handler.dynamodb")
+    @patch("stream_handler.sqs")
+    def test_status_change_repairs_the_status_shard(self, mock_sqs, mock_dynamodb):
+        # Un UpdateItem externo cambió el estado sin tocar statusShard
+        record = {
+            "eventName": "MODIFY",
+            "dynamodb": {
+                "SequenceNumber": "100",
+                "OldImage": {"id": {"S": "1234"}, "status": {"S": "received"}, "statusShard": {"S": "received#3"}},
+                "NewImage": {"id": {"S": "1234"}, "status": {"S": "completed"}, "statusShard": {"S": "received#3"}}
+            }
+        }
+        mock_sqs.send_message_batch.return_value = {"Failed": []}
+        with patch("stream_handler.TABLE_NAME", "WorkOrdersTable"):
+            response = stream_handler.lambda_handler({"Records": [record]}, {})
+        self.assertEqual(response["batchItemFailures"], [])
+
+        mock_dynamodb.Table.assert_called_once_with("WorkOrdersTable")
+        kwargs = mock_dynamodb.Table.return_value.update_item.call_args.kwargs
+        self.assertEqual(kwargs["ExpressionAttributeValues"], {":status": "completed", ":shard": "completed#3"})
+        self.assertEqual(kwargs["ConditionExpression"], "#status = :status")
+
+    @patch("stream_handler.sqs")
+    def test_message_leaves_out_the_index_attributes(self, mock_sqs):
+        record = {
+            "eventName": "INSERT",
+            "dynamodb": {"NewImage": {
+                "id": {"S": "1234"}, "status": {"S": "received"},
+                "statusShard": {"S": "received#3"}, "deliveryBucket": {"S": "2025-02-14#1"}
+            }}
+        }
+        mock_sqs.send_message_batch.return_value = {"Failed": []}
+        stream_handler.lambda_handler({"Records": [record]}, {})
+        body = json.loads(mock_sqs.send_message_batch.call_args.kwargs["Entries"][0]["MessageBody"])
+        self.assertEqual(body, {"id": "1234", "status": "received"})
+
+    @patch("stream_handler.sqs")
+    def test_internal_only_modify_is_not_forwarded(self, mock_sqs):
+        # La reparación de statusShard genera su propio MODIFY, que no se reenvía ni en modo 'all'
+        record = {
+            "eventName": "MODIFY",
+            "dynamodb": {
+                "OldImage": {"id": {"S": "1234"}, "status": {"S": "completed"}, "statusShard": {"S": "received#3"}},
+                "NewImage": {"id": {"S": "1234"}, "status": {"S": "completed"}, "statusShard": {"S": "completed#3"}}
+            }
+        }
+        with patch("stream_handler.STREAM_EMIT_MODE", stream_handler.EMIT_ALL):
+            stream_handler.lambda_handler({"Records": [record]}, {})
+        mock_sqs.send_message_batch.assert_not_called()
+
+    @patch("stream_handler.sqs")
+    def test_unserializable_record_is_skipped(self, mock_sqs):
+        # Un número fuera del rango de 64 bits no se puede serializar: se descarta el registro, no el lote
+        records = [
+            {
+                "eventName": "INSERT",
+                "dynamodb": {
+                    "SequenceNumber": "100",
+                    "NewImage": {"id": {"S": "1"}, "status": {"S": "received"}, "quantity": {"N": "1" + "0" * 30}}
+                }
+            },
+            {
+                "eventName": "INSERT",
+                "dynamodb": {"SequenceNumber": "101", "NewImage": {"id": {"S": "2"}, "status": {"S": "received"}}}
+            },
+        ]
+        mock_sqs.send_message_batch.return_value = {"Failed": []}
+        response = stream_handler.lambda_handler({"Records": records}, {})
+        self.assertEqual(response["batchItemFailures"], [])
+        entries = mock_sqs.send_message_batch.call_args.kwargs["Entries"]
+        self.assertEqual([json.loads(entry["MessageBody"])["id"] for entry in entries], ["2"])
+
+    @patch("stream_handler.sqs")
+    def test_process_dynamodb_stream_status_transition(self, mock_sqs):
+        record = {
+            "eventName": "MODIFY",
+            "dynamodb": {
+                "OldImage": {"id": {"S": "1234"}, "status": {"S": "received"}},
+                "NewImage": {"id": {"S": "1234"}, "status": {"S": "in_progress"}}
+            }
+        }
+        mock_sqs.send_message_batch.return_value = {"Failed": []}
+        stream_handler.lambda_handler({"Records": [record]}, {})
+        kwargs = mock_sqs.send_message_batch.call_args.kwargs
+        # La transición se envía a la cola del nuevo estado
+        self.assertEqual(kwargs["QueueUrl"], stream_handler.SQS_QUEUES["in_progress"])
+        body = json.loads(kwargs["Entries"][0]["MessageBody"])
+        self.assertEqual(body["previousStatus"], "received")
+
+    @patch("stream_handler.STREAM_EMIT_MODE", "all")
+    @patch("stream_handler.sqs")
+    def test_process_dynamodb_stream_emit_all(self, mock_sqs):
+        # En modo 'all' también se reenvía un cambio que no toca el estado
+        record = {
+            "eventName": "MODIFY",
+            "dynamodb": {
+                "OldImage": {"id": {"S": "1234"}, "status": {"S": "received"}, "description": {"S": "Antes"}},
+                "NewImage": {"id": {"S": "1234"}, "status": {"S": "received"}, "description": {"S": "Después"}}
+            }
+        }
+        mock_sqs.send_message_batch.return_value = {"Failed": []}
+        stream_handler.lambda_handler({"Records": [record]}, {})
+        mock_sqs.send_message_batch.assert_called_once()
+
+    @patch("stream_handler.META_TABLE", "Meta")
+    @patch("stream_handler.dynamodb")
+    @patch("stream_handler.sqs")
+    def test_counters_skip_records_that_will_be_retried(self, mock_sqs, mock_dynamodb):
+        records = [
+            {
+                "eventID": f"event-{i}",
+                "eventName": "INSERT",
+                "dynamodb": {
+                    "SequenceNumber": f"10{i}",
+                    "NewImage": {"id": {"S": f"order-{i}"}, "status": {"S": "received"}}
+                }
+            }
+            for i in range(3)
+        ]
+        mock_sqs.send_message_batch.return_value = {
+            "Failed": [{"Id": "1", "Code": "InternalError", "Message": "boom", "SenderFault": True}]
+        }
+        response = stream_handler.lambda_handler({"Records": records}, {})
+        self.assertEqual(response["batchItemFailures"], [{"itemIdentifier": "101"}])
+
+        # Solo se cuenta la orden anterior al primer fallo: el resto llegará de nuevo en el reintento
+        kwargs = mock_dynamodb.meta.client.transact_write_items.call_args.kwargs
+        marker, update = kwargs["TransactItems"][0]["Put"], kwargs["TransactItems"][1]["Update"]
+        self.assertTrue(marker["Item"]["id"]["S"].startswith("stats-applied#"))
+        self.assertEqual(update["Key"], {"id": {"S": "stats"}})
+        self.assertEqual(sorted(value["N"] for value in update["ExpressionAttributeValues"].values()), ["1", "1"])
+        self.assertIn("ClientRequestToken", kwargs)
+
+    @patch("stream_handler.META_TABLE", "Meta")
+    @patch("stream_handler.dynamodb")
+    @patch("stream_handler.sqs")
+    def test_counter_failure_retries_the_batch(self, mock_sqs, mock_dynamodb):
+        record = {
+            "eventName": "INSERT",
+            "dynamodb": {"SequenceNumber": "100", "NewImage": {"id": {"S": "1"}, "status": {"S": "received"}}}
+        }
+        mock_sqs.send_message_batch.return_value = {"Failed": []}
+        mock_dynamodb.meta.client.transact_write_items.side_effect = RuntimeError("throttled")
+        response = stream_handler.lambda_handler({"Records": [record]}, {})
+        self.assertEqual(response["batchItemFailures"], [{"itemIdentifier": "100"}])
+
+    @patch("stream_handler.META_TABLE", "Meta")
+    @patch("stream_handler.dynamodb")
+    @patch("stream_handler.sqs")
+    def test_changes_move_the_watermark(self, mock_sqs, mock_dynamodb):
+        # Un cambio de estado hecho fuera de la API también invalida las páginas cacheadas
+        record = {
+            "eventName": "MODIFY",
+            "dynamodb": {
+                "SequenceNumber": "100",
+                "OldImage": {"id": {"S": "1"}, "status": {"S": "received"}},
+                "NewImage": {"id": {"S": "1"}, "status": {"S": "completed"}}
+            }
+        }
+        mock_sqs.send_message_batch.return_value = {"Failed": []}
+        stream_handler.lambda_handler({"Records": [record]}, {})
+        mock_dynamodb.Table.assert_called_with("Meta")
+        update = mock_dynamodb.Table.return_value.update_item.call_args.kwargs
+        self.assertEqual(update["Key"], {"id": "work-orders"})
+        self.assertIn("ADD version :one", update["UpdateExpression"])
+
+    @patch("stream_handler.META_TABLE", "Meta")
+    @patch("stream_handler.dynamodb")
+    @patch("stream_handler.sqs")
+    def test_watermark_failure_does_not_retry_the_batch(self, mock_sqs, mock_dynamodb):
+        record = {
+            "eventName": "REMOVE",
+            "dynamodb": {"SequenceNumber": "100", "OldImage": {"id": {"S": "1"}, "status": {"S": "received"}}}
+        }
+        mock_dynamodb.Table.return_value.update_item.side_effect = RuntimeError("throttled")
+        response = stream_handler.lambda_handler({"Records": [record]}, {})
+        self.assertEqual(response["batchItemFailures"], [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,142 +1,40 @@
-import json
-import uuid
-import boto3
-import datetime
 import os
 
-# AWS Clients
-eventbridge = boto3.client("events")
-dynamodb = boto3.resource("dynamodb")
+from work_orders.clients import lazy_client, lazy_resource
+from work_orders.core import WorkOrderService
+from work_orders.metrics import instrument
+from work_orders.publishers import make_publisher
+
+# AWS Clients (created on first use and reused across warm invocations)
+eventbridge = lazy_client("events")
+dynamodb = lazy_resource("dynamodb")
 
 # Environment Variables
 TABLE_NAME = os.getenv("DYNAMODB_TABLE")
 EVENT_BUS_NAME = os.getenv("EVENT_BUS_NAME")
-VALID_STATUSES = {"received", "in_progress", "completed", "canceled"}
 
+# Routing backend (sqs, sns, eventbridge or none); the rest of the API is shared
+PUBLISHER = os.getenv("PUBLISHER", "eventbridge")
+
+@instrument("api")
 def lambda_handler(event, context):
     """
     Lambda entry point. Routes requests based on HTTP method.
     """
-    method = event["httpMethod"]
-
-    if method == "POST":
-        return create_work_order(event)
-    elif method == "GET":
-        return list_work_orders()
-    else:
-        return response(405, {"message": "Method Not Allowed"})
-
-def create_work_order(event):
-    """
-    Handles POST requests to create a new work order.
-    Validates input, stores data in DynamoDB, and sends an event to EventBridge.
-    """
-    try:
-        body = json.loads(event["body"])
-        
-        # Validate required fields
-        required_fields = ["description", "deliveryDate", "status"]
-        if not all(field in body for field in required_fields):
-            return response(400, {"message": "Missing required fields."})
-        
-        # Validate status
-        if body["status"] not in VALID_STATUSES:
-            return response(400, {
-                "message": f"Invalid status '{body['status']}'.",
-                "validStatuses": list(VALID_STATUSES)
-            })
-
-        # Validate deliveryDate format (ISO 8601)
-        if not is_valid_iso8601(body["deliveryDate"]):
-            return response(400, {
-                "message": "Invalid date format. The 'deliveryDate' must be in ISO 8601 format (YYYY-MM-DDTHH:MM:SSZ)."
-            })
-
-        if body["status"] == "canceled" and "cancellationReason" not in body:
-            return response(400, {"message": "Cancellation reason is required when status is 'canceled'."})
-
-        # Generate unique ID
-        work_order_id = str(uuid.uuid4())
-        created_at = datetime.datetime.utcnow().isoformat()
-
-        # Create work order item
-        work_order = {
-            "id": work_order_id,
-            "createdAt": created_at,
-            "description": body["description"],
-            "deliveryDate": body["deliveryDate"],
-            "status": body["status"],
-            "cancellationReason": body.get("cancellationReason")
-        }
-
-        # Store in DynamoDB
-        table = dynamodb.Table(TABLE_NAME)
-        table.put_item(Item=work_order)
-
-        # Send event to EventBridge
-        send_to_eventbridge(work_order)
-
-        return response(201, {
-            "message": "Resource created successfully",
-            "data": work_order
-        })
-
-    except Exception as e:
-        return response(500, {"message": str(e)})
-    
-def list_work_orders():
-    """
-    Handles GET requests to list all work orders from DynamoDB.
-    """
-    try:
-        table = dynamodb.Table(TABLE_NAME)
-        result = table.scan()
-        
-        return response(200, {
-            "data": {
-                "items": result.get("Items", []),
-                "total": result.get("Count", 0)
-            }
-        })
-
-    except Exception as e:
-        return response(500, {"message": str(e)})
-
-def is_valid_iso8601(date_str):
-    """
-    Validates if a string is in ISO 8601 format (YYYY-MM-DDTHH:MM:SSZ).
-    """
-    try:
-        datetime.datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%SZ")
-        return True
-    except ValueError:
-        return False
+    return work_order_service().handle(event)
 
-def send_to_eventbridge(work_order):
+@instrument("relay_outbox")
+def relay_outbox(event, context):
     """
-    Sends a work order event to EventBridge.
+    Outbox relay entry point, triggered by the outbox table stream.
+    Publishes the pending events to EventBridge in batches and reports
+    the ones that failed so Lambda retries them.
     """
-    try:
-        response = eventbridge.put_events(
-            Entries=[
-                {
-                    "Source": "work-orders",
-                    "DetailType": "WorkOrderCreated",
-                    "Detail": json.dumps(work_order),
-                    "EventBusName": EVENT_BUS_NAME
-                }
-            ]
-        )
-        return response
-    except Exception as e:
-        print(f"Error sending to EventBridge: {e}")
+    return work_order_service().relay_outbox(event)
 
-def response(status_code, body):
+def work_order_service():
     """
-    Returns an API Gateway-compatible response.
+    Builds the shared work-order API on top of the EventBridge publisher.
     """
-    return {
-        "statusCode": status_code,
-        "headers": {"Content-Type": "application/json"},
-        "body": json.dumps(body)
-    }
+    publisher = make_publisher(PUBLISHER, eventbridge=eventbridge, event_bus_name=EVENT_BUS_NAME)
+    return WorkOrderService(dynamodb, TABLE_NAME, publisher)
@@ -1,6 +1,8 @@
 import os
 import sys
 import json
+import base64
+import gzip
 import unittest
 from unittest.mock import patch, MagicMock
 
@@ -9,8 +11,9 @@ os.environ["DYNAMODB_TABLE"] = "TestTable"
 os.environ["EVENT_BUS_NAME"] = "TestEventBus"
 os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
 
-# Agregamos la carpeta 'src' al PYTHONPATH para poder importar el módulo
+# Agregamos la carpeta 'src' y la capa compartida 'common' al PYTHONPATH para poder importar el módulo
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'common', 'python'))
 
 import api_handler  # Asegúrate de que este sea el nombre del módulo que contiene el código
 
@@ -47,6 +50,7 @@ class TestEventBridgeHandler(unittest.TestCase):
 
         # Verificamos que se haya llamado a DynamoDB y a EventBridge
         mock_table.put_item.assert_called_once()
+        self.assertIn("statusShard", mock_table.put_item.call_args.kwargs["Item"])
         mock_eventbridge.put_events.assert_called_once()
 
     @patch("api_handler.eventbridge")
@@ -124,5 +128,194 @@ class TestEventBridgeHandler(unittest.TestCase):
         self.assertEqual(body["data"]["total"], 1)
         self.assertEqual(body["data"]["items"][0]["id"], "1")
 
+    @patch("api_handler.dynamodb")
+    def test_list_work_orders_next_token(self, mock_dynamodb):
+        # Simulamos una página con más resultados pendientes
+        mock_table = MagicMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_table.scan.return_value = {"Items": [{"id": "1"}], "LastEvaluatedKey": {"id": "1"}}
+
+        event = {"httpMethod": "GET", "queryStringParameters": {"limit": "1"}}
+        response = api_handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 200)
+        body = json.loads(response["body"])
+        token = body["data"]["nextToken"]
+        self.assertIsNotNone(token)
+
+        # La siguiente página continúa desde el token
+        mock_table.scan.return_value = {"Items": [{"id": "2"}]}
+        event = {"httpMethod": "GET", "queryStringParameters": {"limit": "1", "nextToken": token}}
+        response = api_handler.lambda_handler(event, {})
+        body = json.loads(response["body"])
+        self.assertIsNone(body["data"]["nextToken"])
+        self.assertEqual(mock_table.scan.call_args.kwargs["ExclusiveStartKey"], {"id": "1"})
+
+    def test_list_work_orders_invalid_limit(self):
+        event = {"httpMethod": "GET", "queryStringParameters": {"limit": "abc"}}
+        response = api_handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 400)
+
+    @patch("api_handler.dynamodb")
+    def test_list_work_orders_by_status(self, mock_dynamodb):
+        # El filtro por estado usa Query sobre el índice en lugar de Scan
+        mock_table = MagicMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_table.query.return_value = {"Items": [{"id": "1", "status": "received", "createdAt": "2025-02-14T12:00:00"}]}
+
+        event = {"httpMethod": "GET", "queryStringParameters": {"status": "received"}}
+        response = api_handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 200)
+        mock_table.scan.assert_not_called()
+        self.assertEqual(mock_table.query.call_args.kwargs["IndexName"], "StatusCreatedAtIndex")
+
+    def test_list_work_orders_invalid_status_filter(self):
+        event = {"httpMethod": "GET", "queryStringParameters": {"status": "unknown"}}
+        response = api_handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 400)
+
+    @patch("api_handler.dynamodb")
+    @patch("api_handler.eventbridge")
+    def test_create_work_orders_batch(self, mock_eventbridge, mock_dynamodb):
+        # Un lote con una orden válida y otra inválida
+        mock_dynamodb.batch_write_item.return_value = {"UnprocessedItems": {}}
+        mock_eventbridge.put_events.return_value = {'FailedEntryCount': 0, 'Entries': [{'EventId': '1'}]}
+
+        event = {
+            "httpMethod": "POST",
+            "resource": "/work-orders/batch",
+            "body": json.dumps({"workOrders": [
+                {"description": "Test work order", "deliveryDate": "2025-02-14T12:00:00Z", "status": "received"},
+                {"description": "Sin fecha", "status": "received"}
+            ]})
+        }
+        response = api_handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 207)
+        body = json.loads(response["body"])
+        self.assertEqual([result["statusCode"] for result in body["data"]["results"]], [201, 400])
+        mock_dynamodb.batch_write_item.assert_called_once()
+        mock_eventbridge.put_events.assert_called_once()
+        self.assertTrue(body["data"]["results"][0]["published"])
+
+    def test_create_work_orders_batch_empty(self):
+        event = {
+            "httpMethod": "POST",
+            "resource": "/work-orders/batch",
+            "body": json.dumps({"workOrders": []})
+        }
+        response = api_handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 400)
+
+    @patch("work_orders.dispatch.OUTBOX_TABLE", "WorkOrdersOutboxTable")
+    @patch("work_orders.dispatch.PUBLISH_MODE", "concurrent")
+    @patch("api_handler.dynamodb")
+    @patch("api_handler.eventbridge")
+    def test_create_work_order_concurrent_publish_failure(self, mock_eventbridge, mock_dynamodb):
+        # La orden se guarda pero el evento no se publica: pasa al outbox para reenviarlo
+        mock_table = MagicMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_eventbridge.put_events.side_effect = Exception("Service unavailable")
+
+        event = {
+            "httpMethod": "POST",
+            "body": json.dumps({
+                "description": "Test work order",
+                "deliveryDate": "2025-02-14T12:00:00Z",
+                "status": "received"
+            })
+        }
+        response = api_handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 201)
+        mock_table.put_item.assert_called_once()
+        actions = mock_dynamodb.meta.client.transact_write_items.call_args.kwargs["TransactItems"]
+        self.assertEqual(actions[1]["Put"]["TableName"], "WorkOrdersOutboxTable")
+
+    @patch("work_orders.dispatch.PUBLISH_MODE", "concurrent")
+    @patch("api_handler.dynamodb")
+    @patch("api_handler.eventbridge")
+    def test_create_work_order_concurrent_store_failure(self, mock_eventbridge, mock_dynamodb):
+        # El evento se publica pero DynamoDB falla: se publica la compensación
+        mock_table = MagicMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_table.put_item.side_effect = Exception("Table unavailable")
+        mock_eventbridge.put_events.return_value = {"FailedEntryCount": 0, "Entries": [{"EventId": "12345"}]}
+
+        event = {
+            "httpMethod": "POST",
+            "body": json.dumps({
+                "description": "Test work order",
+                "deliveryDate": "2025-02-14T12:00:00Z",
+                "status": "received"
+            })
+        }
+        response = api_handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 500)
+        self.assertEqual(mock_eventbridge.put_events.call_count, 2)
+
+    @patch("work_orders.dispatch.PUBLISH_MODE", "outbox")
+    @patch("api_handler.dynamodb")
+    @patch("api_handler.eventbridge")
+    def test_create_work_order_outbox(self, mock_eventbridge, mock_dynamodb):
+        # La orden y su evento pendiente se guardan en una sola transacción, sin publicar
+        event = {
+            "httpMethod": "POST",
+            "body": json.dumps({
+                "description": "Test work order",
+                "deliveryDate": "2025-02-14T12:00:00Z",
+                "status": "received"
+            })
+        }
+        response = api_handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 201)
+        mock_dynamodb.meta.client.transact_write_items.assert_called_once()
+        mock_eventbridge.put_events.assert_not_called()
+
+    @patch("api_handler.eventbridge")
+    def test_relay_outbox(self, mock_eventbridge):
+        # El relay publica en lote los eventos pendientes del stream del outbox
+        mock_eventbridge.put_events.return_value = {"FailedEntryCount": 0, "Entries": [{"EventId": "1"}]}
+        image = {"id": {"S": "1234"}, "workOrder": {"M": {
+            "id": {"S": "1234"},
+            "status": {"S": "received"},
+            "description": {"S": "Test work order"}
+        }}}
+        event = {"Records": [{"eventName": "INSERT", "dynamodb": {"SequenceNumber": "1", "NewImage": image}}]}
+        result = api_handler.relay_outbox(event, {})
+        self.assertEqual(result, {"batchItemFailures": []})
+        mock_eventbridge.put_events.assert_called_once()
+
+    @patch("api_handler.dynamodb")
+    def test_list_work_orders_gzip(self, mock_dynamodb):
+        # Una página grande se comprime si el cliente acepta gzip
+        mock_table = MagicMock()
+        mock_dynamodb.Table.return_value = mock_table
+        items = [{"id": str(i), "description": "Test work order", "status": "received"} for i in range(50)]
+        mock_table.scan.return_value = {"Items": items}
+
+        event = {"httpMethod": "GET", "headers": {"Accept-Encoding": "gzip, deflate"}}
+        response = api_handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 200)
+        self.assertTrue(response["isBase64Encoded"])
+        self.assertEqual(response["headers"]["Content-Encoding"], "gzip")
+        body = json.loads(gzip.decompress(base64.b64decode(response["body"])))
+        self.assertEqual(body["data"]["total"], 50)
+
+    @patch("api_handler.dynamodb")
+    @patch("api_handler.eventbridge")
+    def test_create_work_order_base64_body(self, mock_eventbridge, mock_dynamodb):
+        # Con binaryMediaTypes, API Gateway entrega el cuerpo en base64
+        mock_eventbridge.put_events.return_value = {"FailedEntryCount": 0, "Entries": [{"EventId": "1"}]}
+        body = json.dumps({
+            "description": "Test work order",
+            "deliveryDate": "2025-02-14T12:00:00Z",
+            "status": "received"
+        })
+        event = {
+            "httpMethod": "POST",
+            "isBase64Encoded": True,
+            "body": base64.b64encode(body.encode("utf-8")).decode("ascii")
+        }
+        response = api_handler.lambda_handler(event, {})
+        self.assertEqual(response["statusCode"], 201)
+
 if __name__ == "__main__":
     unittest.main()